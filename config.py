@@ -1,10 +1,5 @@
+from python_kanban.settings import settings  # noqa: F401
 
-from dynaconf import Dynaconf
-
-settings = Dynaconf(
-    envvar_prefix="DYNACONF",
-    settings_files=['settings.toml', '.secrets.toml'],
-)
-
-# `envvar_prefix` = export envvars with `export DYNACONF_FOO=bar`.
-# `settings_files` = Load this files in the order.
+# Settings are read from `settings.toml` and `.secrets.toml`, then from
+# environment variables, e.g. `export DYNACONF_FOO=bar`.
+# See python_kanban/settings.py.
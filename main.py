@@ -1,4 +1,4 @@
 if __name__ == "__main__":
-    from python_kanban.app import run_app
+    from python_kanban.cli import main
 
-    run_app()
+    main()
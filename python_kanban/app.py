@@ -1,70 +1,211 @@
 """Main app with the Kanban functionality"""
-from typing import Optional
+import asyncio
+from typing import Any, Dict, Optional
 
 from prompt_toolkit.application import Application
+from prompt_toolkit.eventloop import run_in_executor_with_context
+from prompt_toolkit.key_binding import KeyBindingsBase
 
-from python_kanban.models import Category, Todo
+from python_kanban.columns import validate_column_weights
+from python_kanban.models import Recurrence, Todo, create_tables
+from python_kanban.settings import settings
+from python_kanban.snapshot import SnapshotWriter
+from python_kanban.sorting import validate_sort_mode
+from python_kanban.storage import get_repository
+from python_kanban.views.loading_view import LoadingView
 from python_kanban.views.no_tasks_view import NoTasksView
 from python_kanban.views.add_task_view import AddTaskView
 from python_kanban.views.edit_tasks_view import EditTaskView
 from python_kanban.views.delete_task_view import DeleteTaskView
 from python_kanban.views.list_tasks_view import ListTasksView
+from python_kanban.views.category_manager_view import CategoryManagerView
+from python_kanban.views.cumulative_flow_view import CumulativeFlowView
 
 
 class KanbanApplication(Application):
     """
     The main idea of the app is to change layouts depending on the functions
     called by internal views.
+
+    Views are created once and kept, with their key bindings. Showing a view
+    again calls its `show` method with the new data, e.g. another todo to
+    edit, instead of building its whole layout again. This also keeps the
+    selection and focus of the board when coming back to it.
+
+    With `SNAPSHOT_FILE` set, the snapshot of `python_kanban.snapshot` is
+    written again after each key press that changed the board.
+
+    Unless `storage_ready` is true, the storage is prepared in a background
+    thread once the app runs, while a loading screen is drawn, and the board
+    is shown right after.
+
+    Recurring todos due today are created when the storage is prepared, then
+    checked every `RECURRENCE_CHECK_MINUTES` (10 by default, 0 to disable)
+    while the app runs.
     """
 
-    def __init__(self):
-        view = (
-            ListTasksView(app=self)
-            if Todo.select().count()
-            else NoTasksView(app=self)
+    def __init__(self, storage_ready: bool = True):
+        self.sort_mode = validate_sort_mode(settings.get("SORT_MODE"))
+        self.tag_filter = ""
+        self.column_weights = validate_column_weights(
+            settings.get("COLUMN_WEIGHTS")
         )
-        super().__init__(
-            layout=view.load_view(),
-            key_bindings=view.load_key_bindings(),
-            full_screen=True,
+        self.compact = bool(settings.get("COMPACT", False))
+        self._views: Dict[type, Any] = {}
+        self._key_bindings: Dict[type, KeyBindingsBase] = {}
+        self.snapshot: Optional[SnapshotWriter] = None
+        # Whether the board changed while another view was shown
+        self._board_changed = False
+        super().__init__(full_screen=True)
+        if storage_ready:
+            self._load_board()
+        else:
+            self._show(LoadingView)
+            self.pre_run_callables.append(self._start_preparing_storage)
+        if settings.get("RECURRENCE_CHECK_MINUTES", 10):
+            self.pre_run_callables.append(self._start_recurrences)
+
+    def _start_preparing_storage(self):
+        self.create_background_task(self._prepare_storage())
+
+    async def _prepare_storage(self):
+        """A failure ends the app with its error, instead of leaving the
+        loading screen
+        """
+        try:
+            await run_in_executor_with_context(prepare_storage)
+        except Exception as error:
+            self.exit(exception=error)
+            return
+        self._load_board()
+        self.invalidate()
+
+    def _load_board(self):
+        self.load_list_tasks_view()
+        if settings.get("SNAPSHOT_FILE"):
+            self.snapshot = SnapshotWriter(settings.get("SNAPSHOT_FILE"))
+            self.snapshot.update()
+            self.key_processor.after_key_press += self._update_snapshot
+
+    def _start_recurrences(self):
+        self.create_background_task(
+            self._check_recurrences(
+                settings.get("RECURRENCE_CHECK_MINUTES", 10) * 60
+            )
         )
 
-    def load_add_task_view(self):
-        view = AddTaskView(app=self)
+    async def _check_recurrences(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            self.materialize_recurrences()
+
+    def materialize_recurrences(self):
+        """Create the recurring todos due today. The board is shown again
+        right away if it is on screen, or when going back to it otherwise
+        """
+        if not Recurrence.materialize_due():
+            return
+        if self._showing(ListTasksView, NoTasksView):
+            self.load_list_tasks_view()
+            self.invalidate()
+        else:
+            self._board_changed = True
+
+    def _showing(self, *view_classes: type) -> bool:
+        return any(
+            view_class in self._views
+            and self.layout is self._views[view_class].layout
+            for view_class in view_classes
+        )
+
+    def _update_snapshot(self, _):
+        if self.snapshot:
+            self.snapshot.update()
+
+    def _show(self, view_class: type, refresh: bool = True, **options):
+        """Display the view of this class, created with `options` on first
+        use, and given them again otherwise unless `refresh` is false
+        """
+        view = self._views.get(view_class)
+        if view is None:
+            view = self._views[view_class] = view_class(app=self, **options)
+            self._key_bindings[view_class] = view.load_key_bindings()
+        elif refresh:
+            view.show(**options)
         self.layout = view.layout
-        self.key_bindings = view.load_key_bindings()
+        self.key_bindings = self._key_bindings[view_class]
+
+    def load_add_task_view(self):
+        self._show(AddTaskView)
 
     def load_edit_task_view(self, todo: Todo):
-        view = EditTaskView(app=self, todo=todo)
-        self.layout = view.layout
-        self.key_bindings = view.load_key_bindings()
+        self._show(EditTaskView, todo=todo)
 
     def load_list_tasks_view(
-        self, initial_container_focus: Optional[int] = None
+        self,
+        initial_container_focus: Optional[int] = None,
+        refresh: bool = True,
     ):
-        view = (
-            ListTasksView(
-                app=self, initial_container_focus=initial_container_focus
-            )
-            if Todo.select().count()
-            else NoTasksView(app=self)
+        """Go back to the board. `refresh` is false when nothing changed,
+        so the board is shown as it was left
+        """
+        refresh = refresh or self._board_changed
+        self._board_changed = False
+        if refresh or ListTasksView not in self._views:
+            if not get_repository().count_todos():
+                # Nothing is worth keeping in an empty board
+                self._views.pop(ListTasksView, None)
+                self._show(NoTasksView)
+                return
+        self._show(
+            ListTasksView,
+            refresh=refresh,
+            initial_container_focus=initial_container_focus,
+            sort_mode=self.sort_mode,
+            tag_filter=self.tag_filter,
+            column_weights=self.column_weights,
+            compact=self.compact,
         )
 
-        # FIXME: Mypy went nuts here and said `view` has not `layout` nor
-        # `load_key_bindings`, which is clearly wrong. I looked everywhere but
-        # found no solution, so I'll simply ask it to ignore it for now
-        self.layout = view.layout  # type: ignore
-        self.key_bindings = view.load_key_bindings()  # type: ignore
-
     def load_delete_task_view(self, todo=Todo):
-        view = DeleteTaskView(app=self, todo=todo)
+        self._show(DeleteTaskView, todo=todo)
+
+    def load_category_manager_view(self):
+        view = CategoryManagerView(app=self)
         self.layout = view.layout
         self.key_bindings = view.load_key_bindings()
 
+    def load_cumulative_flow_view(self):
+        view = CumulativeFlowView(app=self)
+        self.layout = view.layout
+        self.key_bindings = view.load_key_bindings()
+
+
+def prepare_storage():
+    """Check the schema, upgrading it if needed, set the repository up and
+    create the recurring todos due today.
+    SQLite connections belong to the thread that opened them, so the one of
+    this thread is closed when it runs in the background.
+    """
+    # Reports and statistics always need the SQLite tables
+    create_tables()
+    get_repository().setup()
+    Recurrence.materialize_due()
+    Todo._meta.database.close()
+
 
 def run_app():
-    from python_kanban.models import db
+    from python_kanban.backup import AutoBackup
+
+    auto_backup = None
+    interval = settings.get("AUTO_BACKUP_MINUTES", 0)
+    if interval:
+        auto_backup = AutoBackup(interval=interval * 60)
+        auto_backup.start()
 
-    db.create_tables([Category, Todo])
-    application = KanbanApplication()
-    application.run()
+    application = KanbanApplication(storage_ready=False)
+    try:
+        application.run()
+    finally:
+        if auto_backup:
+            auto_backup.stop()
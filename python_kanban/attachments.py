@@ -0,0 +1,109 @@
+"""
+Files attached to todos, stored by content outside of the database.
+
+Each file is saved once under the SHA-256 digest of its content, in
+`ATTACHMENTS_DIR` ("attachments" by default), so the same log or screenshot
+attached to several cards takes the space of one. The database only keeps
+the name, digest and size of each attachment, which leaves the board queries
+untouched.
+
+Files are copied in chunks, never loaded whole in memory. Files no todo uses
+anymore are removed by `prune_blobs`.
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+from typing import BinaryIO, Iterable, Optional, Tuple
+
+from python_kanban.settings import settings
+
+
+CHUNK_SIZE = 64 * 1024
+TEMPORARY_PREFIX = ".part-"
+
+
+def attachments_dir(directory: Optional[str] = None) -> str:
+    return directory or settings.get("ATTACHMENTS_DIR", "attachments")
+
+
+def blob_path(digest: str, directory: Optional[str] = None) -> str:
+    """Files are spread in subfolders named after the first two characters
+    of their digest
+    """
+    return os.path.join(attachments_dir(directory), digest[:2], digest[2:])
+
+
+def store_blob(
+    source: BinaryIO, directory: Optional[str] = None
+) -> Tuple[str, int]:
+    """Save the content of `source` unless a file with the same content is
+    already there. Return its digest and size.
+    """
+    directory = attachments_dir(directory)
+    os.makedirs(directory, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    handle, temporary_path = tempfile.mkstemp(
+        dir=directory, prefix=TEMPORARY_PREFIX
+    )
+    try:
+        with os.fdopen(handle, "wb") as blob:
+            for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+                blob.write(chunk)
+                size += len(chunk)
+        path = blob_path(digest.hexdigest(), directory)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(temporary_path, path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+    return digest.hexdigest(), size
+
+
+def store_file(path: str, directory: Optional[str] = None) -> Tuple[str, int]:
+    with open(path, "rb") as source:
+        return store_blob(source, directory)
+
+
+def export_blob(
+    digest: str, destination: BinaryIO, directory: Optional[str] = None
+):
+    """Copy a stored file to `destination`, chunk by chunk"""
+    with open(blob_path(digest, directory), "rb") as blob:
+        shutil.copyfileobj(blob, destination, CHUNK_SIZE)
+
+
+def prune_blobs(
+    used_digests: Iterable[str], directory: Optional[str] = None
+) -> int:
+    """Remove the stored files whose digest is not in `used_digests`.
+    Return the number of removed files.
+    """
+    directory = attachments_dir(directory)
+    if not os.path.isdir(directory):
+        return 0
+    used_digests = set(used_digests)
+    removed = 0
+    for entry in os.scandir(directory):
+        # Files being copied are left alone
+        if entry.is_dir() and len(entry.name) == 2:
+            for blob in os.scandir(entry.path):
+                if entry.name + blob.name not in used_digests:
+                    os.remove(blob.path)
+                    removed += 1
+    return removed
+
+
+def format_size(size: int) -> str:
+    """Size in bytes, KB, MB or GB"""
+    if size < 1024:
+        return f"{size} bytes"
+    scaled = size / 1024
+    for unit in ("KB", "MB"):
+        if scaled < 1024:
+            return f"{scaled:.1f} {unit}"
+        scaled /= 1024
+    return f"{scaled:.1f} GB"
@@ -0,0 +1,158 @@
+"""
+Compressed snapshots of the database and their restoration.
+
+Snapshots are taken with SQLite's online backup API, a few pages at a time,
+so they are consistent even while the board is being changed and do not hold
+the database for long. They are written as gzip files named after the time
+they were taken, and only the most recent ones are kept.
+"""
+import gzip
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import zlib
+from datetime import datetime
+from typing import List, Optional
+
+from python_kanban.models import SCHEMA_VERSION, Todo, database_file
+from python_kanban.settings import settings
+
+
+SNAPSHOT_PREFIX = "kanban-"
+SNAPSHOT_SUFFIX = ".db.gz"
+PAGES_PER_STEP = 64
+SLEEP_BETWEEN_STEPS = 0.005
+
+
+class RestoreError(Exception):
+    pass
+
+
+def list_snapshots(directory: str) -> List[str]:
+    """Snapshot paths, oldest first"""
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.startswith(SNAPSHOT_PREFIX) and name.endswith(SNAPSHOT_SUFFIX)
+    )
+
+
+def backup(
+    directory: Optional[str] = None,
+    keep: Optional[int] = None,
+    database_path: Optional[str] = None,
+) -> str:
+    """Take a snapshot and remove the oldest ones beyond `keep`.
+    Return the path of the new snapshot.
+    """
+    directory = directory or settings.get("BACKUP_DIR", "backups")
+    keep = max(
+        keep if keep is not None else settings.get("BACKUP_KEEP", 10), 1
+    )
+    database_path = database_path or database_file()
+    os.makedirs(directory, exist_ok=True)
+
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    snapshot_path = os.path.join(
+        directory, f"{SNAPSHOT_PREFIX}{timestamp}{SNAPSHOT_SUFFIX}"
+    )
+
+    with tempfile.TemporaryDirectory(dir=directory) as temporary_directory:
+        copy_path = os.path.join(temporary_directory, "kanban.db")
+        source = sqlite3.connect(database_path)
+        target = sqlite3.connect(copy_path)
+        try:
+            source.backup(
+                target, pages=PAGES_PER_STEP, sleep=SLEEP_BETWEEN_STEPS
+            )
+        finally:
+            target.close()
+            source.close()
+
+        with open(copy_path, "rb") as copy, gzip.open(
+            f"{snapshot_path}.part", "wb"
+        ) as snapshot:
+            shutil.copyfileobj(copy, snapshot)
+        os.replace(f"{snapshot_path}.part", snapshot_path)
+
+    for old_snapshot in list_snapshots(directory)[:-keep]:
+        os.remove(old_snapshot)
+
+    return snapshot_path
+
+
+def check_snapshot(path: str):
+    """Raise `RestoreError` if the database in `path` cannot be used by this
+    version of the app
+    """
+    connection = sqlite3.connect(path)
+    try:
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        tables = {
+            name for name, in connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'"
+            )
+        }
+        integrity = connection.execute("PRAGMA quick_check").fetchone()[0]
+    except sqlite3.DatabaseError as error:
+        raise RestoreError(f"Not a valid database: {error}")
+    finally:
+        connection.close()
+
+    if version > SCHEMA_VERSION:
+        raise RestoreError(
+            f"Snapshot schema version {version} is newer than the supported "
+            f"one ({SCHEMA_VERSION})"
+        )
+    if Todo._meta.table_name not in tables:
+        raise RestoreError("Snapshot has no tasks table")
+    if integrity != "ok":
+        raise RestoreError(f"Snapshot is corrupted: {integrity}")
+
+
+def restore(snapshot_path: str, database_path: Optional[str] = None):
+    """Replace the database with a snapshot, once it has been validated.
+    Older schema versions are upgraded the next time the app starts.
+    """
+    database_path = database_path or database_file()
+    directory = os.path.dirname(os.path.abspath(database_path))
+
+    handle, temporary_path = tempfile.mkstemp(dir=directory, suffix=".db")
+    try:
+        with os.fdopen(handle, "wb") as copy, gzip.open(
+            snapshot_path, "rb"
+        ) as snapshot:
+            shutil.copyfileobj(snapshot, copy)
+        check_snapshot(temporary_path)
+        os.replace(temporary_path, database_path)
+    except (OSError, EOFError, zlib.error) as error:
+        raise RestoreError(f"Cannot read snapshot: {error}")
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+
+class AutoBackup(threading.Thread):
+    """Take a snapshot every `interval` seconds in the background"""
+
+    def __init__(self, interval: float, **backup_options):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.backup_options = backup_options
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                backup(**self.backup_options)
+            except (OSError, sqlite3.Error):
+                # A failed snapshot must never take the board down. The next
+                # one is tried after another interval.
+                pass
+
+    def stop(self):
+        self._stopped.set()
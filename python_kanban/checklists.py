@@ -0,0 +1,40 @@
+"""
+Checklists are edited as plain text, one item per line, done items starting
+with "[x]":
+
+    [x] Write the tests
+    [ ] Update the documentation
+"""
+from typing import Iterable, List, Optional, Tuple
+
+
+DONE_PREFIX = "[x]"
+PENDING_PREFIX = "[ ]"
+
+
+def parse_checklist(text: str) -> List[Tuple[str, bool]]:
+    """(text, done) pairs, skipping empty lines"""
+    items = []
+    for line in text.splitlines():
+        line = line.strip()
+        done = line.lower().startswith(DONE_PREFIX)
+        if done or line.startswith(PENDING_PREFIX):
+            line = line[len(DONE_PREFIX):].strip()
+        if line:
+            items.append((line, done))
+    return items
+
+
+def format_checklist(items: Iterable[Tuple[str, bool]]) -> str:
+    return "\n".join(
+        f"{DONE_PREFIX if done else PENDING_PREFIX} {text}"
+        for text, done in items
+    )
+
+
+def progress_badge(progress: Optional[Tuple[int, int]]) -> str:
+    """"3/7" for a checklist with three of seven items done"""
+    if not progress:
+        return ""
+    done, total = progress
+    return f"{done}/{total}"
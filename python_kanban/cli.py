@@ -0,0 +1,416 @@
+"""
+Command line entry point. Without any command the Kanban board is opened,
+otherwise the given command is run against the same database.
+"""
+import argparse
+from datetime import date
+from typing import List, Optional
+
+
+# Same as `Todo.PRIORITIES`, which is only imported by the commands using it
+PRIORITIES = ((0, "High"), (1, "Normal"), (2, "Low"))
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        prog="python_kanban",
+        description="Text-based interface for a Kanban board",
+    )
+    parser.add_argument(
+        "--db",
+        dest="db_file",
+        help="database file (default: DB_FILE or \"kanban.db\")",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    report_parser = subparsers.add_parser(
+        "report",
+        help="show cumulative flow, throughput and cycle time metrics",
+    )
+    report_parser.add_argument(
+        "--days",
+        type=int,
+        default=14,
+        help="number of days in the cumulative flow (default: %(default)s)",
+    )
+
+    benchmark_parser = subparsers.add_parser(
+        "benchmark", help="compare the speed of the storage backends"
+    )
+    benchmark_parser.add_argument(
+        "--cards",
+        type=int,
+        default=1000,
+        help="number of tasks in the workload (default: %(default)s)",
+    )
+
+    serve_parser = subparsers.add_parser(
+        "serve", help="serve the board as an HTTP/JSON API"
+    )
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8000)
+
+    backup_parser = subparsers.add_parser(
+        "backup", help="save a compressed snapshot of the database"
+    )
+    backup_parser.add_argument(
+        "--dir", help="snapshots folder (default: BACKUP_DIR or \"backups\")"
+    )
+    backup_parser.add_argument(
+        "--keep",
+        type=int,
+        help="number of snapshots to keep (default: BACKUP_KEEP or 10)",
+    )
+
+    restore_parser = subparsers.add_parser(
+        "restore", help="replace the database with a snapshot"
+    )
+    restore_parser.add_argument("snapshot", help="path of the snapshot")
+
+    next_parser = subparsers.add_parser(
+        "next", help="list the unfinished tasks by priority and due date"
+    )
+    next_parser.add_argument(
+        "-n",
+        "--limit",
+        type=int,
+        default=10,
+        help="number of tasks (default: %(default)s)",
+    )
+
+    sync_parser = subparsers.add_parser(
+        "sync", help="merge the changes with another copy of the board"
+    )
+    sync_parser.add_argument("database", help="path of the other database")
+
+    attachments_parser = subparsers.add_parser(
+        "attachments", help="attach files to tasks and get them back"
+    )
+    attachments_subparsers = attachments_parser.add_subparsers(
+        dest="action", required=True
+    )
+    attach_parser = attachments_subparsers.add_parser(
+        "add", help="attach a file to a task"
+    )
+    attach_parser.add_argument("task", type=int, help="id of the task")
+    attach_parser.add_argument("file", help="path of the file")
+    list_parser = attachments_subparsers.add_parser(
+        "list", help="list the files attached to a task"
+    )
+    list_parser.add_argument("task", type=int, help="id of the task")
+    export_parser = attachments_subparsers.add_parser(
+        "export", help="copy an attached file"
+    )
+    export_parser.add_argument(
+        "attachment", type=int, help="id of the attachment"
+    )
+    export_parser.add_argument("destination", help="path of the copy")
+    attachments_subparsers.add_parser(
+        "prune", help="remove the stored files no task uses anymore"
+    )
+
+    recur_parser = subparsers.add_parser(
+        "recur", help="manage the tasks created again on a schedule"
+    )
+    recur_subparsers = recur_parser.add_subparsers(
+        dest="action", required=True
+    )
+    recur_add_parser = recur_subparsers.add_parser(
+        "add", help="add a recurring task"
+    )
+    recur_add_parser.add_argument("title")
+    recur_add_parser.add_argument(
+        "rule",
+        help="e.g. \"daily\", \"weekly on mon,thu\", \"every 2 weeks\" "
+        "or \"monthly on 15\"",
+    )
+    recur_add_parser.add_argument("--category", default="")
+    recur_add_parser.add_argument(
+        "--priority",
+        choices=[name.lower() for _, name in PRIORITIES],
+        default="normal",
+    )
+    recur_add_parser.add_argument(
+        "--start",
+        type=date.fromisoformat,
+        help="first possible date, as YYYY-MM-DD (default: today)",
+    )
+    recur_subparsers.add_parser("list", help="list the recurring tasks")
+    recur_remove_parser = recur_subparsers.add_parser(
+        "remove", help="stop a recurring task"
+    )
+    recur_remove_parser.add_argument(
+        "recurrence", type=int, help="id of the recurring task"
+    )
+    recur_subparsers.add_parser(
+        "run", help="create the recurring tasks due today"
+    )
+
+    dependencies_parser = subparsers.add_parser(
+        "dependencies", help="manage the tasks blocking others"
+    )
+    dependencies_subparsers = dependencies_parser.add_subparsers(
+        dest="action", required=True
+    )
+    for action, help_text in (
+        ("add", "block a task until another one is done"),
+        ("remove", "stop blocking a task by another one"),
+    ):
+        link_parser = dependencies_subparsers.add_parser(
+            action, help=help_text
+        )
+        link_parser.add_argument("task", type=int, help="id of the task")
+        link_parser.add_argument(
+            "blocker", type=int, help="id of the blocking task"
+        )
+    blockers_parser = dependencies_subparsers.add_parser(
+        "list", help="list the tasks blocking a task"
+    )
+    blockers_parser.add_argument("task", type=int, help="id of the task")
+
+    snapshot_parser = subparsers.add_parser(
+        "snapshot",
+        help="write the compact read-only copy of the board",
+    )
+    snapshot_parser.add_argument(
+        "--output",
+        help="path of the copy (default: SNAPSHOT_FILE or "
+        "\"kanban.snapshot\")",
+    )
+
+    status_parser = subparsers.add_parser(
+        "status",
+        help="print the number of tasks per status, for prompts and bars",
+    )
+    status_parser.add_argument(
+        "--format",
+        default="plain",
+        help="plain, short, tmux, polybar or a template such as "
+        "\"{todo}/{in_progress}/{done}\" (default: %(default)s)",
+    )
+    status_parser.add_argument(
+        "--db", help="database to read (default: DB_FILE)"
+    )
+    status_parser.add_argument(
+        "--snapshot",
+        help="snapshot to read instead of the database "
+        "(default: SNAPSHOT_FILE, if set)",
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.db_file and args.command != "status":
+        from python_kanban.models import db
+
+        db.init(args.db_file)
+
+    if args.command == "status":
+        # Nothing else is imported: this runs every few seconds
+        from python_kanban.status import (
+            StatusError, count_todos, format_status
+        )
+
+        try:
+            print(
+                format_status(
+                    count_todos(args.db or args.db_file, args.snapshot),
+                    args.format,
+                )
+            )
+        except StatusError as error:
+            parser.exit(1, f"{error}\n")
+    elif args.command == "report":
+        from python_kanban.models import create_tables
+        from python_kanban.reports import print_report
+
+        create_tables()
+        print_report(days=args.days)
+    elif args.command == "serve":
+        from python_kanban.models import create_tables
+        from python_kanban.server import run_server
+
+        create_tables()
+        run_server(host=args.host, port=args.port)
+    elif args.command == "backup":
+        from python_kanban.backup import backup
+
+        print(backup(directory=args.dir, keep=args.keep))
+    elif args.command == "restore":
+        from python_kanban.backup import RestoreError, restore
+
+        try:
+            restore(args.snapshot)
+        except RestoreError as error:
+            parser.exit(1, f"Cannot restore {args.snapshot}: {error}\n")
+    elif args.command == "next":
+        from python_kanban.models import create_tables
+        from python_kanban.next_up import print_next_up
+
+        create_tables()
+        print_next_up(limit=args.limit)
+    elif args.command == "sync":
+        from python_kanban.models import create_tables
+        from python_kanban.sync import sync
+
+        create_tables()
+        try:
+            result = sync(args.database)
+        except ValueError as error:
+            parser.exit(1, f"Cannot synchronize {args.database}: {error}\n")
+        print(f"{result.sent} changes sent, {result.received} received")
+    elif args.command == "attachments":
+        from python_kanban.models import create_tables
+
+        create_tables()
+        run_attachments_command(parser, args)
+    elif args.command == "recur":
+        from python_kanban.models import create_tables
+
+        create_tables()
+        run_recur_command(parser, args)
+    elif args.command == "dependencies":
+        from python_kanban.models import create_tables
+
+        create_tables()
+        run_dependencies_command(parser, args)
+    elif args.command == "snapshot":
+        from python_kanban.models import create_tables
+        from python_kanban.snapshot import SnapshotWriter
+
+        create_tables()
+        writer = SnapshotWriter(args.output)
+        writer.update()
+        print(writer.path)
+    elif args.command == "benchmark":
+        from python_kanban.storage.benchmark import print_benchmark
+
+        print_benchmark(cards=args.cards)
+    else:
+        from python_kanban.app import run_app
+
+        run_app()
+
+
+def run_attachments_command(
+    parser: argparse.ArgumentParser, args: argparse.Namespace
+):
+    import os
+
+    from python_kanban.attachments import (
+        export_blob, format_size, prune_blobs, store_file
+    )
+    from python_kanban.models import Attachment, Todo
+
+    if args.action == "prune":
+        print(f"{prune_blobs(Attachment.digests())} files removed")
+        return
+
+    if args.action == "export":
+        attachment = Attachment.get_or_none(Attachment.id == args.attachment)
+        if attachment is None:
+            parser.exit(1, f"No attachment with id {args.attachment}\n")
+        with open(args.destination, "wb") as destination:
+            export_blob(attachment.digest, destination)
+        return
+
+    todo = Todo.get_or_none(Todo.id == args.task)
+    if todo is None:
+        parser.exit(1, f"No task with id {args.task}\n")
+    if args.action == "add":
+        try:
+            digest, size = store_file(args.file)
+        except OSError as error:
+            parser.exit(1, f"Cannot attach {args.file}: {error}\n")
+        attachment = Attachment.create(
+            todo=todo, name=os.path.basename(args.file), digest=digest,
+            size=size,
+        )
+        print(f"{attachment.id}: {attachment.name} ({format_size(size)})")
+    else:
+        for attachment in Attachment.files_of(todo):
+            print(
+                f"{attachment.id}: {attachment.name} "
+                f"({format_size(attachment.size)})"
+            )
+
+
+def run_recur_command(
+    parser: argparse.ArgumentParser, args: argparse.Namespace
+):
+    from python_kanban.models import Category, Recurrence
+    from python_kanban.recurrence import (
+        RecurrenceError, anchor_rule, first_date, format_rule, parse_rule
+    )
+
+    if args.action == "run":
+        print(f"{Recurrence.materialize_due()} tasks created")
+    elif args.action == "remove":
+        if not Recurrence.delete_by_id(args.recurrence):
+            parser.exit(1, f"No recurring task with id {args.recurrence}\n")
+    elif args.action == "list":
+        for recurrence in Recurrence.select().order_by(Recurrence.next_run):
+            print(
+                f"{recurrence.id}: {recurrence.title} ({recurrence.rule}), "
+                f"next on {recurrence.next_run}"
+            )
+    else:
+        start = args.start or date.today()
+        try:
+            rule = anchor_rule(parse_rule(args.rule), start)
+        except RecurrenceError as error:
+            parser.exit(1, f"{error}\n")
+        priorities = {name.lower(): value for value, name in PRIORITIES}
+        recurrence = Recurrence.create(
+            title=args.title,
+            rule=format_rule(rule),
+            category=(
+                Category.get_or_create(name=args.category)[0]
+                if args.category
+                else None
+            ),
+            priority=priorities[args.priority],
+            next_run=first_date(rule, start),
+        )
+        print(
+            f"{recurrence.id}: {recurrence.title}, first on "
+            f"{recurrence.next_run}"
+        )
+
+
+def run_dependencies_command(
+    parser: argparse.ArgumentParser, args: argparse.Namespace
+):
+    from python_kanban.dependencies import DependencyCycleError
+    from python_kanban.models import Todo, TodoDependency
+
+    def get_todo(todo_id: int) -> Todo:
+        todo = Todo.get_or_none(Todo.id == todo_id)
+        if todo is None:
+            parser.exit(1, f"No task with id {todo_id}\n")
+        return todo
+
+    todo = get_todo(args.task)
+    if args.action == "list":
+        done = Todo.CHOICES[-1][0]
+        for blocker in (
+            Todo.select()
+            .join(TodoDependency, on=(TodoDependency.blocker == Todo.id))
+            .where(TodoDependency.todo == todo.id)
+            .order_by(Todo.id)
+        ):
+            state = "done" if blocker.status == done else "blocking"
+            print(f"{blocker.id}: {blocker.title} ({state})")
+        return
+
+    blocker = get_todo(args.blocker)
+    if args.action == "add":
+        try:
+            TodoDependency.link(todo, blocker)
+        except DependencyCycleError:
+            parser.exit(
+                1, f"Task {blocker.id} already waits for task {todo.id}\n"
+            )
+    elif not TodoDependency.unlink(todo, blocker):
+        parser.exit(
+            1, f"Task {todo.id} is not blocked by task {blocker.id}\n"
+        )
@@ -0,0 +1,44 @@
+"""
+Width of the board columns and of the titles inside them.
+
+Columns share the width of the terminal according to their weights, set with
+`COLUMN_WEIGHTS`, e.g. `[1, 2, 1]` for a wider "In progress" column. Titles
+longer than their column are cut with an ellipsis instead of being clipped.
+"""
+from typing import Any, List, Optional
+
+from prompt_toolkit.utils import get_cwidth
+
+from python_kanban.models import Todo
+
+
+ELLIPSIS = "…"
+
+
+def validate_column_weights(weights: Optional[Any]) -> List[int]:
+    """One positive weight per status, or equal weights if they are invalid"""
+    try:
+        weights = [int(weight) for weight in weights or []]
+    except (TypeError, ValueError):
+        weights = []
+    if len(weights) != len(Todo.CHOICES) or min(weights) < 1:
+        return [1] * len(Todo.CHOICES)
+    return weights
+
+
+def truncate(text: str, width: int) -> str:
+    """Cut `text` to fit in `width` terminal cells, ending it with an
+    ellipsis. Wide characters take two cells.
+    """
+    if get_cwidth(text) <= width:
+        return text
+    if width < 1:
+        return ""
+    characters = []
+    used = 0
+    for character in text:
+        used += get_cwidth(character)
+        if used > width - 1:
+            break
+        characters.append(character)
+    return "".join(characters) + ELLIPSIS
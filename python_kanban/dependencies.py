@@ -0,0 +1,133 @@
+"""
+"Blocked by" links between todos, and the set of blocked todos.
+
+A todo is blocked while one of its blockers is not done. `DependencyGraph`
+keeps the links in memory in both directions, with the number of unfinished
+blockers of each todo. A change of status only updates the todos blocked by
+the one that changed, and `blocked` is kept up to date in place, so the board
+reads it as is on every render instead of walking the links.
+
+Links that would close a cycle are refused when added, as the todos of a
+cycle could never be done.
+
+The links are stored in `python_kanban.models.TodoDependency`.
+"""
+from typing import Dict, Iterable, Set, Tuple
+
+
+class DependencyCycleError(ValueError):
+    pass
+
+
+class DependencyGraph:
+    """Links given as (todo id, blocker id, whether the blocker is done).
+    Those already stored are trusted to hold no cycle.
+    """
+
+    def __init__(self, links: Iterable[Tuple[int, int, bool]] = ()):
+        # Todo id: ids of its blockers
+        self._blockers: Dict[int, Set[int]] = {}
+        # Blocker id: ids of the todos it blocks
+        self._dependents: Dict[int, Set[int]] = {}
+        # Todo id: number of its blockers not done
+        self._open_blockers: Dict[int, int] = {}
+        # Ids of the blockers that are done
+        self._done: Set[int] = set()
+        self.blocked: Set[int] = set()
+        for todo_id, blocker_id, done in links:
+            self._link(todo_id, blocker_id, done)
+
+    def __len__(self) -> int:
+        """Number of links"""
+        return sum(len(blockers) for blockers in self._blockers.values())
+
+    def _link(self, todo_id: int, blocker_id: int, done: bool):
+        blockers = self._blockers.setdefault(todo_id, set())
+        if blocker_id in blockers:
+            return
+        # Other todos it blocks follow its current status too
+        self.set_done(blocker_id, done)
+        blockers.add(blocker_id)
+        self._dependents.setdefault(blocker_id, set()).add(todo_id)
+        if done:
+            self._done.add(blocker_id)
+        else:
+            self._open_blockers[todo_id] = (
+                self._open_blockers.get(todo_id, 0) + 1
+            )
+            self.blocked.add(todo_id)
+
+    def _waits_for(self, todo_id: int, other_id: int) -> bool:
+        """Whether `other_id` blocks `todo_id`, directly or not"""
+        seen = {todo_id}
+        stack = [todo_id]
+        while stack:
+            for blocker_id in self._blockers.get(stack.pop(), ()):
+                if blocker_id == other_id:
+                    return True
+                if blocker_id not in seen:
+                    seen.add(blocker_id)
+                    stack.append(blocker_id)
+        return False
+
+    def add(self, todo_id: int, blocker_id: int, done: bool = False):
+        """Block a todo by another one, done or not"""
+        if todo_id == blocker_id or self._waits_for(blocker_id, todo_id):
+            raise DependencyCycleError(
+                f"{blocker_id} already waits for {todo_id}"
+            )
+        self._link(todo_id, blocker_id, done)
+
+    def remove(self, todo_id: int, blocker_id: int):
+        blockers = self._blockers.get(todo_id, set())
+        if blocker_id not in blockers:
+            return
+        blockers.discard(blocker_id)
+        self._dependents[blocker_id].discard(todo_id)
+        if blocker_id not in self._done:
+            self._close_blocker(todo_id)
+        if not blockers:
+            del self._blockers[todo_id]
+        if not self._dependents[blocker_id]:
+            del self._dependents[blocker_id]
+            self._done.discard(blocker_id)
+
+    def discard(self, todo_id: int):
+        """Forget a deleted todo and its links"""
+        for blocker_id in list(self._blockers.get(todo_id, ())):
+            self.remove(todo_id, blocker_id)
+        for dependent_id in list(self._dependents.get(todo_id, ())):
+            self.remove(dependent_id, todo_id)
+
+    def _close_blocker(self, todo_id: int):
+        self._open_blockers[todo_id] -= 1
+        if not self._open_blockers[todo_id]:
+            del self._open_blockers[todo_id]
+            self.blocked.discard(todo_id)
+
+    def set_done(self, todo_id: int, done: bool):
+        """Record a change of status. Only the todos it blocks are updated"""
+        dependents = self._dependents.get(todo_id)
+        if not dependents or done == (todo_id in self._done):
+            return
+        if done:
+            self._done.add(todo_id)
+            for dependent_id in dependents:
+                self._close_blocker(dependent_id)
+        else:
+            self._done.discard(todo_id)
+            for dependent_id in dependents:
+                self._open_blockers[dependent_id] = (
+                    self._open_blockers.get(dependent_id, 0) + 1
+                )
+                self.blocked.add(dependent_id)
+
+    def blockers_of(self, todo_id: int) -> Set[int]:
+        return set(self._blockers.get(todo_id, ()))
+
+    def open_blockers_of(self, todo_id: int) -> Set[int]:
+        """Blockers not done yet"""
+        return self.blockers_of(todo_id) - self._done
+
+    def is_blocked(self, todo_id: int) -> bool:
+        return todo_id in self.blocked
@@ -0,0 +1,78 @@
+"""
+Index of the titles of a column, to jump to a todo by typing the start of its
+title.
+
+Titles are kept sorted, case-insensitively, with their line in the column, so
+the todos whose title starts with a prefix are a range found by binary search.
+A merge sort tree over the lines of that order then gives the first of them
+from a line in O(log² n), without looking at each matching title: a single
+letter matches most of a long column.
+"""
+from bisect import bisect_left
+from typing import Any, List, Optional, Sequence, Tuple
+
+
+# Above any character of a title, to find the end of the titles starting
+# with a prefix
+_LAST_CHARACTER = "\U0010ffff"
+
+
+def _title_key(title: str) -> str:
+    return title.casefold()
+
+
+def _first_from(
+    lines: List[int], start: int, best: Optional[int]
+) -> Optional[int]:
+    """Smallest of `best` and the first of the sorted `lines` from `start`"""
+    position = bisect_left(lines, start)
+    if position < len(lines) and (best is None or lines[position] < best):
+        return lines[position]
+    return best
+
+
+class TitleIndex:
+    def __init__(self, entries: Sequence[Any]):
+        self._titles: List[Tuple[str, int]] = sorted(
+            (_title_key(todo.title), line) for line, todo in enumerate(entries)
+        )
+        # Node i holds the sorted lines of its children 2i and 2i + 1, the
+        # leaves being the lines in title order
+        size = len(self._titles)
+        self._tree: List[List[int]] = [[] for _ in range(size)] + [
+            [line] for _, line in self._titles
+        ]
+        for node in range(size - 1, 0, -1):
+            # Merging two sorted runs is linear
+            self._tree[node] = sorted(
+                self._tree[2 * node] + self._tree[2 * node + 1]
+            )
+
+    def _first_line(self, low: int, high: int, start: int) -> Optional[int]:
+        """First line from `start` among titles `low` to `high` (excluded)"""
+        best = None
+        low += len(self._titles)
+        high += len(self._titles)
+        while low < high:
+            if low & 1:
+                best = _first_from(self._tree[low], start, best)
+                low += 1
+            if high & 1:
+                high -= 1
+                best = _first_from(self._tree[high], start, best)
+            low //= 2
+            high //= 2
+        return best
+
+    def find(self, prefix: str, start: int = 0) -> Optional[int]:
+        """Line of a todo whose title starts with `prefix`: the first one
+        from `start` in the column, or the first one of the column if none
+        is below. `None` if no title matches.
+        """
+        key = _title_key(prefix)
+        low = bisect_left(self._titles, (key,))
+        high = bisect_left(self._titles, (key + _LAST_CHARACTER,))
+        line = self._first_line(low, high, start)
+        if line is None:
+            line = self._first_line(low, high, 0)
+        return line
@@ -0,0 +1,157 @@
+"""
+Keys of the board, read once from the settings.
+
+`KEYMAP` picks a preset, "vim" (default) or "emacs", and `KEYS` overrides
+some of its actions, e.g. in settings.toml:
+
+    KEYMAP = "vim"
+    KEYS = {promote = "P", quit = ["q", "c-c"]}
+
+Each action takes one or several keys. A key sequence is written with spaces
+between keys, such as "g g" or "escape <". Movements in a column accept a
+count typed before them, e.g. "5 j".
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from prompt_toolkit.filters import FilterOrBool
+from prompt_toolkit.key_binding import KeyBindings
+# What `KeyBindings.add` uses to read the name of each key
+from prompt_toolkit.key_binding.key_bindings import _parse_key
+
+from python_kanban.settings import settings
+
+
+KeySequence = Tuple[str, ...]
+Keymap = Dict[str, List[KeySequence]]
+
+_VIM = {
+    # Inside a column
+    "up": ["k", "up"],
+    "down": ["j", "down"],
+    "first": ["g g", "home"],
+    "last": ["G", "end"],
+    "page_up": ["pageup", "c-b"],
+    "page_down": ["pagedown", "c-f"],
+    "move_up": ["K"],
+    "move_down": ["J"],
+    "move_to_top": ["T"],
+    "move_to_bottom": ["B"],
+    "promote": ["p"],
+    "regress": ["r"],
+    "delete": ["d"],
+    "edit": ["e"],
+    # On the whole board
+    "add": ["a"],
+    "categories": ["c"],
+    "cumulative_flow": ["f"],
+    "order": ["o"],
+    "filter": ["t"],
+    "jump_to_title": ["/"],
+    "jump_to_line": [":"],
+    "preview": ["v"],
+    "compact": ["z"],
+    "stats": ["s"],
+    "next_column": ["l", "right"],
+    "previous_column": ["h", "left"],
+    "quit": ["q"],
+}
+PRESETS: Dict[str, Dict[str, List[str]]] = {
+    "vim": _VIM,
+    "emacs": {
+        **_VIM,
+        "up": ["c-p", "up"],
+        "down": ["c-n", "down"],
+        "first": ["escape <", "home"],
+        "last": ["escape >", "end"],
+        "page_up": ["pageup", "escape v"],
+        "page_down": ["pagedown", "c-v"],
+        "jump_to_title": ["c-s", "/"],
+        "jump_to_line": ["escape g", ":"],
+        "move_up": ["escape p"],
+        "move_down": ["escape n"],
+        "move_to_top": ["escape P"],
+        "move_to_bottom": ["escape N"],
+        "next_column": ["c-f", "right"],
+        "previous_column": ["c-b", "left"],
+        "quit": ["q", "c-x c-c"],
+    },
+}
+DEFAULT_PRESET = "vim"
+
+
+class KeymapError(ValueError):
+    pass
+
+
+def parse_keys(keys: Union[str, List[str]]) -> List[KeySequence]:
+    """Sequences of an action: one string or a list of them"""
+    if isinstance(keys, str):
+        keys = [keys]
+    sequences = [tuple(sequence.split()) for sequence in keys]
+    if not all(sequences):
+        raise KeymapError(f"Empty key sequence in {keys!r}")
+    return sequences
+
+
+def build_keymap(
+    preset: Optional[str] = None, overrides: Optional[Dict[str, Any]] = None
+) -> Keymap:
+    """Keys per action. Unknown presets fall back to the default one"""
+    actions = PRESETS.get(preset or DEFAULT_PRESET, PRESETS[DEFAULT_PRESET])
+    keymap = {action: parse_keys(keys) for action, keys in actions.items()}
+    for action, keys in (overrides or {}).items():
+        action = action.lower()
+        if action not in keymap:
+            raise KeymapError(f"Unknown action in the keymap: {action}")
+        keymap[action] = parse_keys(keys)
+        for sequence in keymap[action]:
+            for key in sequence:
+                try:
+                    _parse_key(key)
+                except ValueError:
+                    raise KeymapError(
+                        f"Unknown key for {action} in the keymap: {key}"
+                    ) from None
+    return keymap
+
+
+_keymap: Optional[Keymap] = None
+
+
+def get_keymap() -> Keymap:
+    """The keymap of the settings, built on the first call"""
+    global _keymap
+    if _keymap is None:
+        _keymap = build_keymap(
+            settings.get("KEYMAP"), dict(settings.get("KEYS") or {})
+        )
+    return _keymap
+
+
+def set_keymap(keymap: Optional[Keymap]):
+    """Replace the current keymap. `None` goes back to the settings"""
+    global _keymap
+    _keymap = keymap
+
+
+def add_action(
+    kb: KeyBindings,
+    action: str,
+    handler: Callable,
+    filter: FilterOrBool = True,
+):
+    """Bind `handler` to every key sequence of `action`"""
+    for sequence in get_keymap()[action]:
+        kb.add(*sequence, filter=filter)(handler)
+
+
+def add_count_keys(kb: KeyBindings, filter: FilterOrBool = True):
+    """Digits typed before a key repeat it, available as `event.arg`"""
+
+    def append_digit(event):
+        # A leading zero means nothing
+        if event.data != "0" or event.arg_present:
+            event.append_to_arg_count(event.data)
+
+    for digit in "0123456789":
+        kb.add(digit, filter=filter)(append_digit)
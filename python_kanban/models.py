@@ -1,17 +1,81 @@
-from datetime import datetime
-from typing import Dict, List
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 import peewee as pw
-from dynaconf import settings
 
+from python_kanban.dependencies import DependencyGraph
+from python_kanban.ranks import rank_between, ranks_after, ranks_before
+from python_kanban.recurrence import next_date_after, parse_rule
+from python_kanban.settings import DEFAULT_DB_FILE, settings
+from python_kanban.sorting import DEFAULT_SORT_MODE, SORT_KEYS
 
-db = pw.SqliteDatabase(
-    settings.DB_FILE if "DB_FILE" in settings else "kanban.db"
-)
+
+class LazySqliteDatabase(pw.SqliteDatabase):
+    """SQLite database whose file is chosen on the first connection: the
+    one given to `init` before, or `DB_FILE` from the settings.
+    Importing the models neither reads the settings nor opens a file.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(None, **kwargs)
+
+    def choose_file(self):
+        if self.deferred:
+            self.init(settings.get("DB_FILE") or DEFAULT_DB_FILE)
+
+    def connect(self, reuse_if_open=False):
+        self.choose_file()
+        return super().connect(reuse_if_open)
+
+
+db = LazySqliteDatabase()
+
+
+def database_file() -> str:
+    """File of the database of the models, chosen now if it was not yet"""
+    database = Todo._meta.database
+    if isinstance(database, LazySqliteDatabase):
+        database.choose_file()
+    return database.database
+
+
+def new_uuid() -> str:
+    return uuid.uuid4().hex
+
+
+class DeferredAccessor(pw.FieldAccessor):
+    """Read the value from the database on first access when the row was
+    selected without it
+    """
+
+    def __get__(self, instance, instance_type=None):
+        if (
+            instance is not None
+            and self.name not in instance.__data__
+            and instance.id is not None
+        ):
+            model = type(instance)
+            instance.__data__[self.name] = (
+                model.select(self.field)
+                .where(model.id == instance.id)
+                .scalar()
+            )
+        return super().__get__(instance, instance_type)
+
+
+class DeferredTextField(pw.TextField):
+    """Text left out of the list queries, see `Todo.group_todos_per_status`"""
+
+    accessor_class = DeferredAccessor
 
 
 class Category(pw.Model):
     name = pw.CharField(max_length=30)
+    # Identity shared across copies of the board and board revision of the
+    # last change, both used to synchronize databases
+    uuid = pw.CharField(max_length=32, unique=True, default=new_uuid)
+    revision = pw.IntegerField(default=0, index=True)
 
     class Meta:
         database = db
@@ -19,30 +83,147 @@ class Category(pw.Model):
     def __str__(self):
         return self.name
 
+    @classmethod
+    def create_table(cls, safe=True, **options):
+        super().create_table(safe=safe, **options)
+        BoardRevision.create_triggers(cls)
+
+    @classmethod
+    def with_todo_counts(cls) -> List["Category"]:
+        """Return all categories ordered by name, each one with an extra
+        `todo_count` attribute. The counts come from a single `GROUP BY`.
+        """
+        return list(
+            cls.select(cls, pw.fn.COUNT(Todo.id).alias("todo_count"))
+            .join(Todo, pw.JOIN.LEFT_OUTER, on=(Todo.category == cls.id))
+            .group_by(cls.id)
+            .order_by(cls.name, cls.id)
+        )
+
+    @classmethod
+    def merge(
+        cls, categories: Iterable["Category"], target: "Category"
+    ) -> int:
+        """Move all todos of `categories` to `target` and delete the former.
+        Return the number of moved todos.
+        """
+        source_ids = [
+            category.id for category in categories
+            if category.id != target.id
+        ]
+        if not source_ids:
+            return 0
+
+        with cls._meta.database.atomic():
+            moved = Todo.update(category=target).where(
+                Todo.category.in_(source_ids)
+            ).execute()
+            Recurrence.update(category=target).where(
+                Recurrence.category.in_(source_ids)
+            ).execute()
+            cls.delete().where(cls.id.in_(source_ids)).execute()
+        return moved
+
+    def rename(self, name: str) -> "Category":
+        """Rename this category.
+        If another category already has this name, both are merged into the
+        existing one instead, which is then returned.
+        """
+        existing = (
+            Category.select()
+            .where((Category.name == name) & (Category.id != self.id))
+            .first()
+        )
+        if existing:
+            Category.merge([self], target=existing)
+            return existing
+
+        self.name = name
+        self.save()
+        return self
+
+    @classmethod
+    def delete_unused(
+        cls, categories: Optional[Iterable["Category"]] = None
+    ) -> int:
+        """Delete categories without todos or recurring todos in a single
+        query. If `categories` is given, only those are candidates for
+        deletion. Return the number of deleted categories.
+        """
+        used_ids = Todo.select(Todo.category).where(
+            Todo.category.is_null(False)
+        ) | Recurrence.select(Recurrence.category).where(
+            Recurrence.category.is_null(False)
+        )
+        query = cls.delete().where(cls.id.not_in(used_ids))
+        if categories is not None:
+            query = query.where(
+                cls.id.in_([category.id for category in categories])
+            )
+        return query.execute()
+
 
 class Todo(pw.Model):
 
     CHOICES = ((0, "To do"), (1, "In progress"), (2, "Done"))
+    # Lower values come first
+    PRIORITIES = ((0, "High"), (1, "Normal"), (2, "Low"))
 
     title = pw.CharField(max_length=100)
-    body = pw.TextField(null=True)
-    status = pw.IntegerField(choices=CHOICES, default=CHOICES[0][0])
+    body = DeferredTextField(null=True)
+    status = pw.IntegerField(
+        choices=CHOICES, default=CHOICES[0][0], index=True
+    )
     category = pw.ForeignKeyField(Category, backref="todos", null=True)
     created = pw.DateTimeField(default=datetime.now)
     updated = pw.DateTimeField(default=datetime.now)
+    uuid = pw.CharField(max_length=32, unique=True, default=new_uuid)
+    revision = pw.IntegerField(default=0, index=True)
+    # Manual order inside a status and category, see `python_kanban.ranks`
+    rank = pw.CharField(max_length=64, default="")
+    due = pw.DateField(null=True)
+    priority = pw.IntegerField(choices=PRIORITIES, default=PRIORITIES[1][0])
 
     class Meta:
         database = db
+        # One index per sort mode of `python_kanban.sorting`
+        indexes = (
+            (("status", "category", "rank"), False),
+            (("status", "updated"), False),
+            (("status", "created"), False),
+            (("status", "title"), False),
+            # Used by `python_kanban.next_up`
+            (("status", "priority", "due"), False),
+        )
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        """New todos are put on top of their status and category"""
+        if not self.rank:
+            self.rank = Todo.top_rank(self.status, self.category_id)
+        return super().save(*args, **kwargs)
+
+    @classmethod
+    def create_table(cls, safe=True, **options):
+        """Besides the table, create the triggers keeping `TodoStats`,
+        `TodoTransition` and `BoardRevision` up to date
+        """
+        super().create_table(safe=safe, **options)
+        TodoStats.create_triggers()
+        TodoTransition.create_triggers()
+        BoardRevision.create_triggers(cls)
+
     def promote(self):
-        """Move the status forward. A 'done' status cannot be moved further"""
+        """Move the status forward. A 'done' status cannot be moved further,
+        nor can a todo blocked by others not done yet
+        """
         last_status = self.CHOICES[-1][0]
-        if self.status < last_status:
+        if self.status < last_status and not self.is_blocked():
             self.status += 1
             self.updated = datetime.now()
+            self.rank = Todo.top_rank(self.status, self.category_id)
             self.save()
 
     def regress(self):
@@ -51,20 +232,107 @@ class Todo(pw.Model):
         if self.status > first_status:
             self.status -= 1
             self.updated = datetime.now()
+            self.rank = Todo.top_rank(self.status, self.category_id)
             self.save()
 
+    def is_blocked(self) -> bool:
+        """Whether a blocker of the todo is not done yet"""
+        blocker = Todo.alias()
+        return (
+            TodoDependency.select()
+            .join(blocker, on=(TodoDependency.blocker == blocker.id))
+            .where(
+                TodoDependency.todo == self.id,
+                blocker.status != self.CHOICES[-1][0],
+            )
+            .exists()
+        )
+
+    def move_between(
+        self, above: Optional["Todo"] = None, below: Optional["Todo"] = None
+    ):
+        """Place the todo between two others of the same status and category.
+        `None` stands for the top or the bottom. Only this todo is updated.
+        """
+        self.rank = rank_between(
+            above.rank if above else None, below.rank if below else None
+        )
+        Todo.update(rank=self.rank).where(Todo.id == self.id).execute()
+
+    def tag_names(self) -> List[str]:
+        return [
+            name for name, in Tag.select(Tag.name)
+            .join(TodoTag)
+            .where(TodoTag.todo == self.id)
+            .order_by(Tag.name)
+            .tuples()
+        ]
+
+    def set_tags(self, names: Iterable[str]):
+        """Replace the tags of the todo. Tags are created when needed and
+        removed when no todo uses them anymore.
+        """
+        with Todo._meta.database.atomic():
+            TodoTag.delete().where(TodoTag.todo == self.id).execute()
+            tags = [Tag.get_or_create(name=name)[0] for name in set(names)]
+            if tags:
+                TodoTag.insert_many(
+                    [{"todo": self.id, "tag": tag.id} for tag in tags]
+                ).execute()
+            Tag.delete_unused()
+
     @classmethod
-    def group_todos_per_status(cls) -> Dict[int, List["Todo"]]:
-        todos = Todo.select().order_by(Todo.category, Todo.updated.desc())
+    def top_rank(cls, status: int, category_id: Optional[int]) -> str:
+        """A rank above every todo with this status and category"""
+        query = cls.select(pw.fn.MIN(cls.rank)).where(cls.status == status)
+        query = query.where(
+            cls.category == category_id
+            if category_id is not None
+            else cls.category.is_null()
+        )
+        return rank_between(None, query.scalar())
+
+    @classmethod
+    def group_todos_per_status(
+        cls, sort_mode: str = DEFAULT_SORT_MODE
+    ) -> Dict[int, List["Todo"]]:
+        """Todos per status, in the order of `sort_mode`.
+        Rows are read in the order of an index, so no sorting is needed.
+        Statuses are read backwards when todos are sorted in descending
+        order, which does not matter as each gets its own list.
+        The body is only read when a todo is opened.
+        """
+        orders = {
+            "rank": (cls.status, cls.category, cls.rank),
+            "category": (cls.status, cls.category, cls.rank),
+            "updated": (cls.status.desc(), cls.updated.desc(), cls.id.desc()),
+            "created": (cls.status.desc(), cls.created.desc(), cls.id.desc()),
+            "title": (cls.status, cls.title, cls.id),
+        }
+        fields = [
+            field for field in cls._meta.sorted_fields
+            if not isinstance(field, DeferredTextField)
+        ]
+        todos = (
+            cls.select(*fields, Category)
+            .join(Category, pw.JOIN.LEFT_OUTER)
+            .order_by(*orders[sort_mode])
+        )
         todos_dict: Dict[int, List["Todo"]] = {
             status: [] for status, _ in cls.CHOICES
         }
         for todo in todos:
             todos_dict[todo.status].append(todo)
+        if sort_mode == "category":
+            # Only the category groups, already contiguous, change places
+            for entries in todos_dict.values():
+                entries.sort(key=SORT_KEYS[sort_mode])
         return todos_dict
 
     @classmethod
-    def create_todo_with_category(cls, category_name: str = "", **kwargs):
+    def create_todo_with_category(
+        cls, category_name: str = "", **kwargs
+    ) -> "Todo":
         """Receive a category and create a new todo with it.
         If no such category exists, create it first. If empty, do not create
         anything.
@@ -74,7 +342,7 @@ class Todo(pw.Model):
             if category_name
             else None
         )
-        Todo.create(category=category, **kwargs)
+        return Todo.create(category=category, **kwargs)
 
     @classmethod
     def update_todo_with_category(
@@ -93,3 +361,761 @@ class Todo(pw.Model):
         Todo.update(category=category, **kwargs).where(
             cls.id == todo.id
         ).execute()
+
+
+class Tag(pw.Model):
+    name = pw.CharField(max_length=30, unique=True)
+
+    class Meta:
+        database = db
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def postings(cls) -> Dict[str, Set[int]]:
+        """Ids of the todos with each tag, read in a single pass over the
+        (tag, todo) primary key of `TodoTag`
+        """
+        query = (
+            TodoTag.select(cls.name, TodoTag.todo)
+            .join(cls)
+            .order_by(TodoTag.tag)
+            .tuples()
+        )
+        postings: Dict[str, Set[int]] = {}
+        for name, todo_id in query:
+            postings.setdefault(name, set()).add(todo_id)
+        return postings
+
+    @classmethod
+    def delete_unused(cls):
+        cls.delete().where(
+            ~pw.fn.EXISTS(TodoTag.select().where(TodoTag.tag == cls.id))
+        ).execute()
+
+
+class TodoTag(pw.Model):
+    """Tags of each todo"""
+
+    todo = pw.ForeignKeyField(Todo, backref="todo_tags", on_delete="CASCADE")
+    tag = pw.ForeignKeyField(Tag, backref="todo_tags", on_delete="CASCADE")
+
+    class Meta:
+        database = db
+        primary_key = pw.CompositeKey("tag", "todo")
+
+    @classmethod
+    def create_table(cls, safe=True, **options):
+        """Foreign keys are not enforced by SQLite unless asked for, so a
+        trigger removes the tags of deleted todos, and the tags left unused
+        """
+        super().create_table(safe=safe, **options)
+        table = cls._meta.table_name
+        tag_table = Tag._meta.table_name
+        cls._meta.database.execute_sql(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_todo_delete "
+            f"AFTER DELETE ON {Todo._meta.table_name} BEGIN "
+            f"DELETE FROM {table} WHERE todo_id = OLD.id; "
+            f"DELETE FROM {tag_table} WHERE NOT EXISTS ("
+            f"SELECT 1 FROM {table} WHERE tag_id = {tag_table}.id); END"
+        )
+        BoardRevision.create_link_triggers(cls)
+
+
+class ChecklistItem(pw.Model):
+    """A step of a todo"""
+
+    todo = pw.ForeignKeyField(
+        Todo, backref="checklist_items", on_delete="CASCADE", index=False
+    )
+    text = pw.CharField(max_length=200)
+    done = pw.BooleanField(default=False)
+    position = pw.IntegerField(default=0)
+
+    class Meta:
+        database = db
+        indexes = ((("todo", "position"), False),)
+
+    @classmethod
+    def create_table(cls, safe=True, **options):
+        """Same as for `TodoTag`, a trigger removes the items of deleted
+        todos
+        """
+        super().create_table(safe=safe, **options)
+        table = cls._meta.table_name
+        cls._meta.database.execute_sql(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_todo_delete "
+            f"AFTER DELETE ON {Todo._meta.table_name} BEGIN "
+            f"DELETE FROM {table} WHERE todo_id = OLD.id; END"
+        )
+
+    @classmethod
+    def items_of(cls, todo: Todo) -> List["ChecklistItem"]:
+        return list(
+            cls.select().where(cls.todo == todo.id).order_by(cls.position)
+        )
+
+    @classmethod
+    def replace_items(cls, todo: Todo, items: Iterable[Tuple[str, bool]]):
+        """Replace the checklist of a todo by (text, done) pairs"""
+        with cls._meta.database.atomic():
+            cls.delete().where(cls.todo == todo.id).execute()
+            rows = [
+                {"todo": todo.id, "text": text, "done": done,
+                 "position": position}
+                for position, (text, done) in enumerate(items)
+            ]
+            if rows:
+                cls.insert_many(rows).execute()
+
+    @classmethod
+    def progress(cls) -> Dict[int, Tuple[int, int]]:
+        """(done, total) items per todo with a checklist, in a single
+        grouped query
+        """
+        query = (
+            cls.select(
+                cls.todo,
+                pw.fn.SUM(cls.done.cast("INTEGER")),
+                pw.fn.COUNT(cls.id),
+            )
+            .group_by(cls.todo)
+            .tuples()
+        )
+        return {todo_id: (done, total) for todo_id, done, total in query}
+
+
+class Attachment(pw.Model):
+    """A file attached to a todo. The content is stored once per digest
+    outside of the database, see `python_kanban.attachments`
+    """
+
+    todo = pw.ForeignKeyField(
+        Todo, backref="attachments", on_delete="CASCADE", index=False
+    )
+    name = pw.CharField(max_length=255)
+    digest = pw.CharField(max_length=64, index=True)
+    size = pw.IntegerField()
+    added = pw.DateTimeField(default=datetime.now)
+
+    class Meta:
+        database = db
+        indexes = ((("todo", "name"), False),)
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def create_table(cls, safe=True, **options):
+        """Same as for `TodoTag`. The files themselves are removed by
+        `python_kanban.attachments.prune_blobs`
+        """
+        super().create_table(safe=safe, **options)
+        table = cls._meta.table_name
+        cls._meta.database.execute_sql(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_todo_delete "
+            f"AFTER DELETE ON {Todo._meta.table_name} BEGIN "
+            f"DELETE FROM {table} WHERE todo_id = OLD.id; END"
+        )
+
+    @classmethod
+    def files_of(cls, todo: Todo) -> List["Attachment"]:
+        return list(
+            cls.select().where(cls.todo == todo.id).order_by(cls.name)
+        )
+
+    @classmethod
+    def digests(cls) -> Set[str]:
+        """Digests of the files still attached to a todo"""
+        return {
+            digest for digest, in cls.select(cls.digest).distinct().tuples()
+        }
+
+
+class Recurrence(pw.Model):
+    """A todo created again in "To do" on a schedule, see
+    `python_kanban.recurrence`. `next_run` is the date of the next one.
+    """
+
+    title = pw.CharField(max_length=100)
+    body = pw.TextField(null=True)
+    category = pw.ForeignKeyField(Category, backref="recurrences", null=True)
+    priority = pw.IntegerField(
+        choices=Todo.PRIORITIES, default=Todo.PRIORITIES[1][0]
+    )
+    rule = pw.CharField(max_length=64)
+    # Indexed, so finding the due recurrences is a range scan
+    next_run = pw.DateField(index=True)
+    created = pw.DateTimeField(default=datetime.now)
+
+    class Meta:
+        database = db
+
+    def __str__(self):
+        return self.title
+
+    @classmethod
+    def create_table(cls, safe=True, **options):
+        """Besides the table, a trigger removing the category of recurrences
+        when it is deleted, e.g. by a synchronization
+        """
+        super().create_table(safe=safe, **options)
+        table = cls._meta.table_name
+        cls._meta.database.execute_sql(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_category_delete "
+            f"AFTER DELETE ON {Category._meta.table_name} BEGIN "
+            f"UPDATE {table} SET category_id = NULL "
+            "WHERE category_id = OLD.id; END"
+        )
+
+    @classmethod
+    def due(cls, today: date) -> List["Recurrence"]:
+        return list(cls.select().where(cls.next_run <= today))
+
+    @classmethod
+    def materialize_due(cls, today: Optional[date] = None) -> int:
+        """Create one todo per due recurrence, on top of "To do", and move
+        their next runs after `today`. Return the number of created todos.
+        Todos are created with a few batched inserts, and next runs updated
+        with one query per new date.
+        """
+        today = today or date.today()
+        recurrences = cls.due(today)
+        if not recurrences:
+            return 0
+
+        status = Todo.CHOICES[0][0]
+        top_ranks = dict(
+            Todo.select(Todo.category, pw.fn.MIN(Todo.rank))
+            .where(Todo.status == status)
+            .group_by(Todo.category)
+            .tuples()
+        )
+        per_category: Dict[Optional[int], List["Recurrence"]] = {}
+        for recurrence in recurrences:
+            per_category.setdefault(recurrence.category_id, []).append(
+                recurrence
+            )
+
+        rows = []
+        next_runs: Dict[date, List[int]] = {}
+        for category_id, members in per_category.items():
+            ranks = ranks_before(top_ranks.get(category_id), len(members))
+            for recurrence, rank in zip(members, ranks):
+                rows.append({
+                    Todo.title: recurrence.title,
+                    Todo.body: recurrence.body,
+                    Todo.category: category_id,
+                    Todo.priority: recurrence.priority,
+                    Todo.status: status,
+                    Todo.rank: rank,
+                    Todo.due: recurrence.next_run,
+                })
+                next_run = next_date_after(
+                    parse_rule(recurrence.rule), recurrence.next_run, today
+                )
+                next_runs.setdefault(next_run, []).append(recurrence.id)
+
+        with cls._meta.database.atomic():
+            for batch in pw.chunked(rows, 100):
+                Todo.insert_many(batch).execute()
+            for next_run, ids in next_runs.items():
+                cls.update(next_run=next_run).where(
+                    cls.id.in_(ids)
+                ).execute()
+        return len(rows)
+
+
+class TodoDependency(pw.Model):
+    """"Blocked by" links: `todo` cannot be promoted before `blocker` is
+    done, see `python_kanban.dependencies`
+    """
+
+    todo = pw.ForeignKeyField(
+        Todo, backref="blocker_links", on_delete="CASCADE", index=False
+    )
+    blocker = pw.ForeignKeyField(
+        Todo, backref="dependent_links", on_delete="CASCADE"
+    )
+
+    class Meta:
+        database = db
+        primary_key = pw.CompositeKey("todo", "blocker")
+
+    @classmethod
+    def create_table(cls, safe=True, **options):
+        """Same as for `TodoTag`, a trigger removes the links of deleted
+        todos, on both sides
+        """
+        super().create_table(safe=safe, **options)
+        table = cls._meta.table_name
+        cls._meta.database.execute_sql(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_todo_delete "
+            f"AFTER DELETE ON {Todo._meta.table_name} BEGIN "
+            f"DELETE FROM {table} "
+            f"WHERE todo_id = OLD.id OR blocker_id = OLD.id; END"
+        )
+        BoardRevision.create_link_triggers(cls)
+
+    @classmethod
+    def graph(cls) -> DependencyGraph:
+        """Every link with the status of its blocker, in a single query"""
+        blocker = Todo.alias()
+        done = Todo.CHOICES[-1][0]
+        query = (
+            cls.select(cls.todo, cls.blocker, blocker.status == done)
+            .join(blocker, on=(cls.blocker == blocker.id))
+            .tuples()
+        )
+        return DependencyGraph(
+            (todo_id, blocker_id, bool(is_done))
+            for todo_id, blocker_id, is_done in query
+        )
+
+    @classmethod
+    def link(
+        cls, todo: Todo, blocker: Todo,
+        graph: Optional[DependencyGraph] = None,
+    ):
+        """Block a todo by another one. `graph`, read from the database when
+        not given, is updated too. Raise `DependencyCycleError` if the
+        blocker already waits for the todo.
+        """
+        if graph is None:
+            graph = cls.graph()
+        graph.add(todo.id, blocker.id, blocker.status == Todo.CHOICES[-1][0])
+        cls.insert(
+            todo=todo.id, blocker=blocker.id
+        ).on_conflict_ignore().execute()
+
+    @classmethod
+    def unlink(
+        cls, todo: Todo, blocker: Todo,
+        graph: Optional[DependencyGraph] = None,
+    ) -> bool:
+        """Remove a link. Return whether there was one"""
+        if graph is not None:
+            graph.remove(todo.id, blocker.id)
+        return bool(
+            cls.delete()
+            .where(cls.todo == todo.id, cls.blocker == blocker.id)
+            .execute()
+        )
+
+
+class TodoStats(pw.Model):
+    """Number of todos and sum of their creation times per status and
+    category.
+    This is a summary table maintained by SQLite triggers on every insert,
+    update and delete of a todo, so aggregates are read from a handful of rows
+    instead of scanning the whole `todo` table.
+    """
+
+    status = pw.IntegerField()
+    # 0 stands for "no category", since NULL would break the primary key
+    category_id = pw.IntegerField(default=0)
+    count = pw.IntegerField(default=0)
+    # Sum of `julianday(created)`, used to compute average ages
+    created_sum = pw.FloatField(default=0)
+
+    class Meta:
+        database = db
+        primary_key = pw.CompositeKey("status", "category_id")
+
+    @classmethod
+    def create_table(cls, safe=True, **options):
+        """Create the table and fill it from existing todos, if any"""
+        if cls.table_exists():
+            return
+
+        super().create_table(safe=safe, **options)
+        if Todo.table_exists():
+            cls.insert_from(
+                Todo.select(
+                    Todo.status,
+                    pw.fn.IFNULL(Todo.category, 0),
+                    pw.fn.COUNT(Todo.id),
+                    pw.fn.SUM(pw.fn.julianday(Todo.created)),
+                ).group_by(Todo.status, Todo.category),
+                fields=[
+                    cls.status, cls.category_id, cls.count, cls.created_sum
+                ],
+            ).execute()
+
+    @classmethod
+    def create_triggers(cls):
+        todo_table = Todo._meta.table_name
+        stats_table = cls._meta.table_name
+        add_row = (
+            f"INSERT OR IGNORE INTO {stats_table} "
+            "(status, category_id, count, created_sum) "
+            "VALUES (NEW.status, IFNULL(NEW.category_id, 0), 0, 0); "
+            f"UPDATE {stats_table} SET count = count + 1, "
+            "created_sum = created_sum + julianday(NEW.created) "
+            "WHERE status = NEW.status "
+            "AND category_id = IFNULL(NEW.category_id, 0);"
+        )
+        remove_row = (
+            f"UPDATE {stats_table} SET count = count - 1, "
+            "created_sum = created_sum - julianday(OLD.created) "
+            "WHERE status = OLD.status "
+            "AND category_id = IFNULL(OLD.category_id, 0); "
+            f"DELETE FROM {stats_table} WHERE count <= 0;"
+        )
+        database = cls._meta.database
+        database.execute_sql(
+            f"CREATE TRIGGER IF NOT EXISTS {stats_table}_insert "
+            f"AFTER INSERT ON {todo_table} BEGIN {add_row} END"
+        )
+        database.execute_sql(
+            f"CREATE TRIGGER IF NOT EXISTS {stats_table}_delete "
+            f"AFTER DELETE ON {todo_table} BEGIN {remove_row} END"
+        )
+        database.execute_sql(
+            f"CREATE TRIGGER IF NOT EXISTS {stats_table}_update "
+            f"AFTER UPDATE OF status, category_id, created ON {todo_table} "
+            f"BEGIN {remove_row} {add_row} END"
+        )
+
+    @classmethod
+    def total(cls) -> int:
+        return cls.select(pw.fn.SUM(cls.count)).scalar() or 0
+
+    @classmethod
+    def count_per_status(cls) -> Dict[int, int]:
+        counts = {status: 0 for status, _ in Todo.CHOICES}
+        query = cls.select(
+            cls.status, pw.fn.SUM(cls.count)
+        ).group_by(cls.status)
+        for status, count in query.tuples():
+            counts[status] = count
+        return counts
+
+    @classmethod
+    def count_per_category(cls) -> Dict[str, int]:
+        """Number of todos per category name. Todos without a category are
+        counted under an empty name.
+        """
+        query = (
+            cls.select(Category.name, pw.fn.SUM(cls.count))
+            .join(
+                Category,
+                pw.JOIN.LEFT_OUTER,
+                on=(cls.category_id == Category.id),
+            )
+            .group_by(cls.category_id)
+            .order_by(Category.name)
+        )
+        return {name or "": count for name, count in query.tuples()}
+
+    @classmethod
+    def average_age_per_status(
+        cls, now: Optional[datetime] = None
+    ) -> Dict[int, timedelta]:
+        """Average time since creation of the todos in each status"""
+        now_julian_day = _julian_day(now or datetime.now())
+        query = cls.select(
+            cls.status, pw.fn.SUM(cls.count), pw.fn.SUM(cls.created_sum)
+        ).group_by(cls.status)
+        return {
+            status: timedelta(days=now_julian_day - created_sum / count)
+            for status, count, created_sum in query.tuples()
+            if count
+        }
+
+
+class TodoTransition(pw.Model):
+    """Append-only history of status changes.
+    Rows are written by SQLite triggers when a todo is created (with an empty
+    `from_status`) and whenever its status changes. The timestamp of a change
+    is the new `updated` time of the todo, as set by `promote` and `regress`.
+    """
+
+    todo = pw.ForeignKeyField(
+        Todo, backref="transitions", on_delete="CASCADE"
+    )
+    from_status = pw.IntegerField(null=True)
+    to_status = pw.IntegerField()
+    timestamp = pw.DateTimeField(default=datetime.now, index=True)
+
+    class Meta:
+        database = db
+        indexes = ((("todo", "timestamp"), False),)
+
+    @classmethod
+    def create_table(cls, safe=True, **options):
+        """Create the table and fill it from existing todos, if any.
+        Since their history is unknown, each one gets a creation transition
+        and, if not in the first status anymore, a single jump to its current
+        status at its last update.
+        """
+        if cls.table_exists():
+            return
+
+        super().create_table(safe=safe, **options)
+        if Todo.table_exists():
+            first_status = Todo.CHOICES[0][0]
+            fields = [cls.todo, cls.from_status, cls.to_status, cls.timestamp]
+            cls.insert_from(
+                Todo.select(
+                    Todo.id, pw.Value(None), pw.Value(first_status),
+                    Todo.created,
+                ),
+                fields=fields,
+            ).execute()
+            cls.insert_from(
+                Todo.select(
+                    Todo.id, pw.Value(first_status), Todo.status,
+                    Todo.updated,
+                ).where(Todo.status != first_status),
+                fields=fields,
+            ).execute()
+
+    @classmethod
+    def create_triggers(cls):
+        todo_table = Todo._meta.table_name
+        transition_table = cls._meta.table_name
+        database = cls._meta.database
+        database.execute_sql(
+            f"CREATE TRIGGER IF NOT EXISTS {transition_table}_insert "
+            f"AFTER INSERT ON {todo_table} BEGIN "
+            f"INSERT INTO {transition_table} "
+            "(todo_id, from_status, to_status, timestamp) "
+            "VALUES (NEW.id, NULL, NEW.status, NEW.created); END"
+        )
+        database.execute_sql(
+            f"CREATE TRIGGER IF NOT EXISTS {transition_table}_update "
+            f"AFTER UPDATE OF status ON {todo_table} "
+            "WHEN NEW.status IS NOT OLD.status BEGIN "
+            f"INSERT INTO {transition_table} "
+            "(todo_id, from_status, to_status, timestamp) "
+            "VALUES (NEW.id, OLD.status, NEW.status, NEW.updated); END"
+        )
+        # Ids of deleted todos are reused, so their history goes with them
+        database.execute_sql(
+            f"CREATE TRIGGER IF NOT EXISTS {transition_table}_delete "
+            f"AFTER DELETE ON {todo_table} BEGIN "
+            f"DELETE FROM {transition_table} WHERE todo_id = OLD.id; END"
+        )
+
+
+class BoardRevision(pw.Model):
+    """A single row with a number increased by SQLite triggers on every change
+    of todos and categories, whatever process makes it. Comparing it is a
+    cheap way to know whether the board changed.
+    The changed row gets the new number in its `revision` column and deleted
+    rows leave a `Tombstone`, so changes since any revision are a range scan.
+    The row also holds the identity of this copy of the board.
+    """
+
+    value = pw.IntegerField(default=0)
+    uuid = pw.CharField(max_length=32, default=new_uuid)
+
+    class Meta:
+        database = db
+
+    @classmethod
+    def create_table(cls, safe=True, **options):
+        super().create_table(safe=safe, **options)
+        cls.insert(id=1, value=0, uuid=new_uuid()).on_conflict_ignore(
+        ).execute()
+
+    @classmethod
+    def create_triggers(cls, model):
+        table = model._meta.table_name
+        revision_table = cls._meta.table_name
+        bump = f"UPDATE {revision_table} SET value = value + 1;"
+        set_row_revision = (
+            f"UPDATE {table} SET revision = "
+            f"(SELECT value FROM {revision_table}) WHERE id = NEW.id;"
+        )
+        bodies = {
+            "INSERT": f"{bump} {set_row_revision}",
+            # Updating `revision` here does not fire this trigger again, as
+            # SQLite's recursive triggers are disabled by default
+            "UPDATE": f"{bump} {set_row_revision}",
+            "DELETE": (
+                f"{bump} INSERT OR REPLACE INTO "
+                f"{Tombstone._meta.table_name} "
+                "(uuid, table_name, revision, deleted) VALUES "
+                f"(OLD.uuid, '{table}', (SELECT value FROM {revision_table}), "
+                "strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime'));"
+            ),
+        }
+        for event, body in bodies.items():
+            cls._meta.database.execute_sql(
+                f"CREATE TRIGGER IF NOT EXISTS "
+                f"{revision_table}_{table}_{event.lower()} "
+                f"AFTER {event} ON {table} BEGIN {body} END"
+            )
+
+    @classmethod
+    def create_link_triggers(cls, model):
+        """Only increase the number on every change of `model`, a table of
+        links between rows, with neither revision nor identity of its own.
+        Caches of the links can then compare the revision.
+        """
+        table = model._meta.table_name
+        revision_table = cls._meta.table_name
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            cls._meta.database.execute_sql(
+                f"CREATE TRIGGER IF NOT EXISTS "
+                f"{revision_table}_{table}_{event.lower()} "
+                f"AFTER {event} ON {table} BEGIN "
+                f"UPDATE {revision_table} SET value = value + 1; END"
+            )
+
+    @classmethod
+    def current(cls) -> int:
+        return cls.select(cls.value).scalar() or 0
+
+    @classmethod
+    def board_uuid(cls) -> str:
+        return cls.select(cls.uuid).scalar()
+
+
+class Tombstone(pw.Model):
+    """Trace of a deleted todo or category, kept to synchronize deletions"""
+
+    uuid = pw.CharField(max_length=32, unique=True)
+    table_name = pw.CharField()
+    revision = pw.IntegerField(index=True)
+    deleted = pw.DateTimeField(default=datetime.now)
+
+    class Meta:
+        database = db
+
+
+class SyncState(pw.Model):
+    """Revisions of this board and of another copy when they were last
+    synchronized. Only changes after them need to be compared next time.
+    """
+
+    peer_uuid = pw.CharField(max_length=32, unique=True)
+    local_revision = pw.IntegerField(default=0)
+    peer_revision = pw.IntegerField(default=0)
+    synced = pw.DateTimeField(default=datetime.now)
+
+    class Meta:
+        database = db
+
+
+MODELS = (
+    Category, Todo, Tag, TodoTag, ChecklistItem, Attachment, Recurrence,
+    TodoDependency, TodoStats, TodoTransition, BoardRevision, Tombstone,
+    SyncState,
+)
+
+# Stored in `PRAGMA user_version`. Increase it whenever the schema changes and
+# add the matching function to `MIGRATIONS`, unless it only adds tables.
+SCHEMA_VERSION = 11
+
+
+def _add_column(database: pw.Database, table: str, definition: str):
+    """Add a column, unless an earlier run already did it"""
+    name = definition.split()[0]
+    if name not in {column.name for column in database.get_columns(table)}:
+        database.execute_sql(f"ALTER TABLE {table} ADD COLUMN {definition}")
+
+
+def _migrate_to_2(database: pw.Database):
+    """Add the identity and revision columns used to synchronize boards"""
+    for model in (Category, Todo):
+        table = model._meta.table_name
+        _add_column(database, table, "uuid VARCHAR(32)")
+        _add_column(database, table, "revision INTEGER NOT NULL DEFAULT 0")
+        database.execute_sql(
+            f"UPDATE {table} SET uuid = lower(hex(randomblob(16))) "
+            "WHERE uuid IS NULL"
+        )
+        # Triggers of version 1 only increased the board revision
+        for event in ("insert", "update", "delete"):
+            database.execute_sql(
+                "DROP TRIGGER IF EXISTS "
+                f"{BoardRevision._meta.table_name}_{table}_{event}"
+            )
+
+    revision_table = BoardRevision._meta.table_name
+    if database.table_exists(revision_table):
+        _add_column(database, revision_table, "uuid VARCHAR(32)")
+        database.execute_sql(
+            f"UPDATE {revision_table} SET uuid = lower(hex(randomblob(16))) "
+            "WHERE uuid IS NULL"
+        )
+
+
+def _migrate_to_3(database: pw.Database):
+    """Add the manual order of todos, following the order used before it:
+    most recently updated first
+    """
+    table = Todo._meta.table_name
+    _add_column(database, table, "rank VARCHAR(64) NOT NULL DEFAULT ''")
+    cursor = database.execute_sql(
+        f"SELECT id, status, category_id FROM {table} "
+        "ORDER BY status, category_id, updated DESC"
+    )
+    groups: Dict[tuple, List[int]] = {}
+    for todo_id, status, category_id in cursor.fetchall():
+        groups.setdefault((status, category_id), []).append(todo_id)
+    for todo_ids in groups.values():
+        ranks = ranks_after(None, len(todo_ids))
+        database.cursor().executemany(
+            f"UPDATE {table} SET rank = ? WHERE id = ?",
+            list(zip(ranks, todo_ids)),
+        )
+
+
+def _migrate_to_4(database: pw.Database):
+    """Add due dates and priorities"""
+    table = Todo._meta.table_name
+    _add_column(database, table, "due DATE")
+    _add_column(
+        database,
+        table,
+        f"priority INTEGER NOT NULL DEFAULT {Todo.PRIORITIES[1][0]}",
+    )
+
+
+def _migrate_to_10(database: pw.Database):
+    """Remove the history of deleted todos, left behind before their
+    transitions were deleted with them
+    """
+    table = TodoTransition._meta.table_name
+    if database.table_exists(table):
+        database.execute_sql(
+            f"DELETE FROM {table} WHERE todo_id NOT IN "
+            f"(SELECT id FROM {Todo._meta.table_name})"
+        )
+
+
+# Versions 5 to 9 only added the tag, checklist, attachment, recurrence and
+# dependency tables
+MIGRATIONS = {
+    2: _migrate_to_2, 3: _migrate_to_3, 4: _migrate_to_4, 10: _migrate_to_10,
+}
+
+
+def create_tables():
+    """Create all tables (and triggers) not yet in the database, after
+    upgrading the existing ones to the current schema version.
+    A database already at this version is left alone, after a single query
+    instead of one per table, index and trigger.
+    """
+    database = Todo._meta.database
+    if database.pragma("user_version") == SCHEMA_VERSION:
+        return
+    with database.atomic():
+        if database.table_exists(Todo._meta.table_name):
+            # Databases older than the version number count as version 1
+            version = max(database.pragma("user_version"), 1)
+            for target_version in range(version + 1, SCHEMA_VERSION + 1):
+                if target_version in MIGRATIONS:
+                    MIGRATIONS[target_version](database)
+        database.create_tables(MODELS)
+        database.pragma("user_version", SCHEMA_VERSION)
+
+
+def _julian_day(moment: datetime) -> float:
+    """Same as SQLite's `julianday` for a naive datetime"""
+    return (moment - datetime(1970, 1, 1)).total_seconds() / 86400 + 2440587.5
@@ -0,0 +1,84 @@
+"""
+"Next up": the most important unfinished todos, by priority and then by due
+date, todos without due date coming last within their priority.
+
+Each status is read through the (status, priority, due) index, in two
+streams since SQLite sorts missing dates first: one with a due date and one
+without. Every stream is already sorted and read lazily, so merging them with
+a heap only reads about `limit` rows per stream, whatever the board size.
+"""
+import heapq
+from datetime import date
+from itertools import islice
+from typing import Any, Iterable, List, Optional, Tuple
+
+import peewee as pw
+
+from python_kanban.models import Category, Todo
+
+
+UNFINISHED_STATUSES = [status for status, _ in Todo.CHOICES[:-1]]
+PRIORITY_NAMES = dict(Todo.PRIORITIES)
+
+
+def is_overdue(todo: Any, today: Optional[date] = None) -> bool:
+    """Due before today and not done yet"""
+    return (
+        todo.due is not None
+        and todo.status != Todo.CHOICES[-1][0]
+        and todo.due < (today or date.today())
+    )
+
+
+def _sort_key(todo: Todo) -> Tuple[int, bool, date]:
+    return (todo.priority, todo.due is None, todo.due or date.min)
+
+
+def _stream(status: int, with_due: bool, limit: int) -> Iterable[Todo]:
+    query = (
+        Todo.select(Todo, Category)
+        .join(Category, pw.JOIN.LEFT_OUTER)
+        .where(Todo.status == status)
+    )
+    if with_due:
+        query = query.where(Todo.due.is_null(False)).order_by(
+            Todo.priority, Todo.due
+        )
+    else:
+        query = query.where(Todo.due.is_null()).order_by(Todo.priority)
+    return query.limit(limit).iterator()
+
+
+def next_up(
+    limit: int = 10, statuses: Optional[Iterable[int]] = None
+) -> List[Todo]:
+    """The first `limit` todos by priority and due date"""
+    streams = [
+        _stream(status, with_due, limit)
+        for status in (
+            statuses if statuses is not None else UNFINISHED_STATUSES
+        )
+        for with_due in (True, False)
+    ]
+    return list(islice(heapq.merge(*streams, key=_sort_key), limit))
+
+
+def format_next_up(todos: List[Todo], today: Optional[date] = None) -> str:
+    if not todos:
+        return "Nothing to do."
+    status_names = dict(Todo.CHOICES)
+    lines = []
+    for todo in todos:
+        due = todo.due.isoformat() if todo.due else "-"
+        overdue = " (overdue)" if is_overdue(todo, today) else ""
+        category = f"[{todo.category.name}] " if todo.category else ""
+        lines.append(
+            f"{PRIORITY_NAMES[todo.priority]:<6}  {due:<10}  "
+            f"{status_names[todo.status]:<11}  {category}{todo.title}"
+            f"{overdue}"
+        )
+    return "\n".join(lines)
+
+
+def print_next_up(limit: int = 10):
+    print(format_next_up(next_up(limit=limit)))
@@ -0,0 +1,120 @@
+"""
+Rendering of task descriptions written in Markdown, for the read-only preview
+of the board.
+
+Only the common subset is supported: headings, emphasis, inline code, links,
+lists, quotes, fenced code blocks and rules. Anything else is shown as
+written.
+"""
+import re
+from collections import OrderedDict
+from typing import Any, List, Tuple
+
+
+Fragments = List[Tuple[str, str]]
+
+INLINE = re.compile(
+    r"(?P<code>`[^`]+`)"
+    r"|(?P<bold>\*\*[^*]+\*\*|__[^_]+__)"
+    r"|(?P<italic>\*[^*\s][^*]*\*|_[^_\s][^_]*_)"
+    r"|(?P<link>\[[^\]]+\]\([^)]+\))"
+)
+HEADING = re.compile(r"(#{1,6})\s+(.*)")
+BULLET = re.compile(r"(\s*)[-*+]\s+(.*)")
+NUMBERED = re.compile(r"(\s*)(\d+[.)])\s+(.*)")
+RULE = re.compile(r"(\*\s*){3,}|(-\s*){3,}|(_\s*){3,}")
+
+STYLES = {
+    "code": "fg:ansicyan",
+    "bold": "bold",
+    "italic": "italic",
+    "link": "underline",
+    "quote": "italic fg:ansigray",
+}
+
+
+def _inline(text: str, style: str = "") -> Fragments:
+    fragments = []
+    position = 0
+    for match in INLINE.finditer(text):
+        if match.start() > position:
+            fragments.append((style, text[position:match.start()]))
+        kind = match.lastgroup or ""
+        token = match.group()
+        if kind == "code":
+            content = token[1:-1]
+        elif kind == "bold":
+            content = token[2:-2]
+        elif kind == "italic":
+            content = token[1:-1]
+        else:
+            content = token[1:token.index("]")]
+        fragments.append((f"{style} {STYLES[kind]}".strip(), content))
+        position = match.end()
+    if position < len(text):
+        fragments.append((style, text[position:]))
+    return fragments
+
+
+def render_markdown(text: str) -> Fragments:
+    """Formatted text fragments for prompt_toolkit"""
+    fragments: Fragments = []
+    in_code = False
+    for line in (text or "").splitlines():
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            in_code = not in_code
+            continue
+        if in_code:
+            fragments.append((STYLES["code"], f"  {line}\n"))
+            continue
+
+        heading = HEADING.match(stripped)
+        bullet = BULLET.match(line)
+        numbered = NUMBERED.match(line)
+        if heading:
+            style = "bold underline" if len(heading.group(1)) == 1 else "bold"
+            fragments.extend(_inline(heading.group(2), style))
+        elif RULE.fullmatch(stripped):
+            fragments.append(("fg:ansigray", "─" * 20))
+        elif bullet:
+            fragments.append(("", f"{bullet.group(1)}• "))
+            fragments.extend(_inline(bullet.group(2)))
+        elif numbered:
+            fragments.append(
+                ("", f"{numbered.group(1)}{numbered.group(2)} ")
+            )
+            fragments.extend(_inline(numbered.group(3)))
+        elif stripped.startswith(">"):
+            fragments.extend(
+                _inline(stripped.lstrip("> "), STYLES["quote"])
+            )
+        else:
+            fragments.extend(_inline(line))
+        fragments.append(("", "\n"))
+    return fragments
+
+
+class PreviewCache:
+    """Rendered descriptions keyed by todo id and "updated" time, keeping the
+    most recently used ones. Moving the cursor back to a todo neither reads
+    its body again nor renders it. Editing a todo keeps its "updated" time,
+    so the cache must be cleared when the board is read again.
+    """
+
+    def __init__(self, size: int = 128):
+        self.size = size
+        self._previews: "OrderedDict[tuple, Fragments]" = OrderedDict()
+
+    def get(self, todo: Any) -> Fragments:
+        key = (todo.id, todo.updated)
+        if key in self._previews:
+            self._previews.move_to_end(key)
+        else:
+            self._previews[key] = render_markdown(todo.body)
+            if len(self._previews) > self.size:
+                self._previews.popitem(last=False)
+        return self._previews[key]
+
+    def clear(self):
+        self._previews.clear()
@@ -0,0 +1,160 @@
+"""
+Lexicographic ranks to order cards manually.
+
+A rank is a string, and cards are sorted by comparing their ranks as plain
+strings. A rank can always be generated between any two others, so moving a
+card only rewrites that card.
+
+Ranks are made of an integer part, whose first character tells its length,
+and an optional fraction. Adding cards at either end of a column only
+increases or decreases the integer part, so ranks stay a few characters long.
+Only cards repeatedly inserted between the same two neighbours make the
+fraction grow.
+
+Digits are sorted as in ASCII, which is how SQLite compares text by default.
+"""
+from typing import List, Optional
+
+
+DIGITS = (
+    "0123456789"
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    "abcdefghijklmnopqrstuvwxyz"
+)
+ZERO = DIGITS[0]
+# Integer parts start with "a" to "z" (2 to 27 characters, increasing) or with
+# "Z" to "A" (2 to 27 characters, decreasing)
+SMALLEST_INTEGER = "A" + ZERO * 26
+FIRST_RANK = "a" + ZERO
+
+
+class RankError(ValueError):
+    pass
+
+
+def _integer_length(head: str) -> int:
+    if "a" <= head <= "z":
+        return ord(head) - ord("a") + 2
+    if "A" <= head <= "Z":
+        return ord("Z") - ord(head) + 2
+    raise RankError(f"Invalid rank head: {head!r}")
+
+
+def _split(rank: str):
+    """Integer part and fraction of a rank"""
+    length = _integer_length(rank[0])
+    if len(rank) < length or rank[length:].endswith(ZERO):
+        raise RankError(f"Invalid rank: {rank!r}")
+    return rank[:length], rank[length:]
+
+
+def _midpoint(lower: str, upper: Optional[str]) -> str:
+    """Fraction between `lower` and `upper`, `None` being the largest one"""
+    if upper is not None:
+        common = 0
+        while (
+            lower[common] if common < len(lower) else ZERO
+        ) == upper[common]:
+            common += 1
+        if common:
+            return upper[:common] + _midpoint(
+                lower[common:], upper[common:]
+            )
+
+    lower_digit = DIGITS.index(lower[0]) if lower else 0
+    upper_digit = DIGITS.index(upper[0]) if upper else len(DIGITS)
+    if upper_digit - lower_digit > 1:
+        return DIGITS[(lower_digit + upper_digit + 1) // 2]
+    if upper is not None and len(upper) > 1:
+        return upper[0]
+    return DIGITS[lower_digit] + _midpoint(lower[1:], None)
+
+
+def _step(integer: str, increment: bool) -> Optional[str]:
+    """Next or previous integer part, `None` when out of range"""
+    head, digits = integer[0], list(integer[1:])
+    last_digit = DIGITS[-1] if increment else ZERO
+    for position in range(len(digits) - 1, -1, -1):
+        if digits[position] != last_digit:
+            digits[position] = DIGITS[
+                DIGITS.index(digits[position]) + (1 if increment else -1)
+            ]
+            return head + "".join(digits)
+        digits[position] = ZERO if increment else DIGITS[-1]
+
+    # Every digit overflowed: the integer part changes length
+    if increment:
+        if head == "z":
+            return None
+        if head == "Z":
+            return "a" + ZERO
+        new_head = chr(ord(head) + 1)
+        if new_head > "a":
+            digits.append(ZERO)
+        else:
+            digits.pop()
+    else:
+        if head == "A":
+            return None
+        if head == "a":
+            return "Z" + DIGITS[-1]
+        new_head = chr(ord(head) - 1)
+        if new_head < "Z":
+            digits.append(DIGITS[-1])
+        else:
+            digits.pop()
+    return new_head + "".join(digits)
+
+
+def rank_between(before: Optional[str], after: Optional[str]) -> str:
+    """A rank sorted after `before` and before `after`. `None` stands for the
+    start or the end of the list.
+    """
+    if before is not None and after is not None and before >= after:
+        raise RankError(f"{before!r} is not lower than {after!r}")
+
+    if before is None:
+        if after is None:
+            return FIRST_RANK
+        integer, fraction = _split(after)
+        if integer == SMALLEST_INTEGER:
+            return integer + _midpoint("", fraction)
+        if integer < after:
+            return integer
+        previous = _step(integer, increment=False)
+        if previous is None:
+            raise RankError("Cannot generate a lower rank")
+        return previous
+
+    integer, fraction = _split(before)
+    if after is None:
+        following = _step(integer, increment=True)
+        return following or integer + _midpoint(fraction, None)
+
+    after_integer, after_fraction = _split(after)
+    if integer == after_integer:
+        return integer + _midpoint(fraction, after_fraction)
+    following = _step(integer, increment=True)
+    if following is None:
+        raise RankError("Cannot generate a higher rank")
+    if following < after:
+        return following
+    return integer + _midpoint(fraction, None)
+
+
+def ranks_after(before: Optional[str], count: int) -> List[str]:
+    """`count` increasing ranks after `before`"""
+    ranks = []
+    for _ in range(count):
+        before = rank_between(before, None)
+        ranks.append(before)
+    return ranks
+
+
+def ranks_before(after: Optional[str], count: int) -> List[str]:
+    """`count` increasing ranks before `after`"""
+    ranks = []
+    for _ in range(count):
+        after = rank_between(None, after)
+        ranks.append(after)
+    return ranks[::-1]
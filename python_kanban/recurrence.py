@@ -0,0 +1,144 @@
+"""
+Rules of recurring todos, such as weekly chores that go back to "To do".
+
+A rule is a short text:
+
+- "daily", "weekly" or "monthly";
+- "every N days", "every N weeks" or "every N months";
+- weekly rules may add the days of the week, e.g. "weekly on mon,thu" or
+  "every 2 weeks on fri";
+- monthly rules may add the day of the month, e.g. "monthly on 15". Days
+  missing in shorter months become their last day. Rules without one are
+  given the day they start on by `anchor_rule`, so that day comes back after
+  shorter months.
+
+Todos are created by `python_kanban.models.Recurrence.materialize_due`. When
+several occurrences were missed, e.g. the board was not opened for a while,
+only one todo is created.
+"""
+import calendar
+import re
+from datetime import date, timedelta
+from typing import NamedTuple, Optional, Tuple
+
+
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+SHORTCUTS = {"daily": "day", "weekly": "week", "monthly": "month"}
+RULE = re.compile(
+    r"(?:(?P<shortcut>daily|weekly|monthly)"
+    r"|every\s+(?P<interval>\d+)\s+(?P<unit>day|week|month)s?)"
+    r"(?:\s+on\s+(?P<on>.+))?"
+)
+
+
+class RecurrenceError(ValueError):
+    pass
+
+
+class Rule(NamedTuple):
+    unit: str
+    interval: int = 1
+    weekdays: Tuple[int, ...] = ()
+    monthday: Optional[int] = None
+
+
+def _parse_weekdays(text: str) -> Tuple[int, ...]:
+    weekdays = set()
+    for name in text.split(","):
+        name = name.strip()[:3]
+        if name not in WEEKDAYS:
+            raise RecurrenceError(f"Unknown day of the week: {name!r}")
+        weekdays.add(WEEKDAYS.index(name))
+    return tuple(sorted(weekdays))
+
+
+def parse_rule(text: str) -> Rule:
+    match = RULE.fullmatch(" ".join(text.lower().split()))
+    if not match:
+        raise RecurrenceError(f"Invalid recurrence: {text!r}")
+    if match.group("shortcut"):
+        unit, interval = SHORTCUTS[match.group("shortcut")], 1
+    else:
+        unit, interval = match.group("unit"), int(match.group("interval"))
+    if interval < 1:
+        raise RecurrenceError("The interval must be at least 1")
+
+    on = match.group("on")
+    if on is None:
+        return Rule(unit, interval)
+    if unit == "week":
+        return Rule(unit, interval, weekdays=_parse_weekdays(on))
+    if unit == "month" and on.isdigit() and 1 <= int(on) <= 31:
+        return Rule(unit, interval, monthday=int(on))
+    raise RecurrenceError(f"Invalid day in {text!r}")
+
+
+def format_rule(rule: Rule) -> str:
+    """Text of a rule, as read by `parse_rule`"""
+    if rule.interval == 1:
+        text = next(
+            shortcut for shortcut, unit in SHORTCUTS.items()
+            if unit == rule.unit
+        )
+    else:
+        text = f"every {rule.interval} {rule.unit}s"
+    if rule.weekdays:
+        text += " on " + ",".join(WEEKDAYS[day] for day in rule.weekdays)
+    elif rule.monthday:
+        text += f" on {rule.monthday}"
+    return text
+
+
+def anchor_rule(rule: Rule, start: date) -> Rule:
+    """Monthly rules without a day get the one of their first occurrence.
+    Otherwise, once a short month cut it, e.g. from the 31st to the 28th,
+    later months would keep the shorter day.
+    """
+    if rule.unit == "month" and not rule.monthday:
+        return rule._replace(monthday=first_date(rule, start).day)
+    return rule
+
+
+def _in_month(year: int, month: int, day: int) -> date:
+    return date(year, month, min(day, calendar.monthrange(year, month)[1]))
+
+
+def first_date(rule: Rule, start: date) -> date:
+    """First occurrence on or after `start`"""
+    if rule.weekdays:
+        while start.weekday() not in rule.weekdays:
+            start += timedelta(days=1)
+    elif rule.monthday:
+        occurrence = _in_month(start.year, start.month, rule.monthday)
+        if occurrence < start:
+            return next_date(rule, occurrence)
+        return occurrence
+    return start
+
+
+def next_date(rule: Rule, current: date) -> date:
+    """Occurrence following `current`"""
+    if rule.unit == "day":
+        return current + timedelta(days=rule.interval)
+    if rule.unit == "week":
+        if not rule.weekdays:
+            return current + timedelta(weeks=rule.interval)
+        for offset in range(1, 8):
+            following = current + timedelta(days=offset)
+            if following.weekday() in rule.weekdays:
+                if following.weekday() > current.weekday():
+                    # Later in the same week
+                    return following
+                return following + timedelta(weeks=rule.interval - 1)
+    months = current.month - 1 + rule.interval
+    return _in_month(
+        current.year + months // 12, months % 12 + 1,
+        rule.monthday or current.day,
+    )
+
+
+def next_date_after(rule: Rule, current: date, today: date) -> date:
+    """First occurrence after `today`, skipping the missed ones"""
+    while current <= today:
+        current = next_date(rule, current)
+    return current
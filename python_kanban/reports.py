@@ -0,0 +1,240 @@
+"""
+Flow metrics computed from the status history in `TodoTransition`.
+
+The history is read once, in timestamp order, through a database cursor, and
+every row is fed to a few small aggregators. Hence memory does not grow with
+the number of transitions, only with the number of days shown and of finished
+todos.
+"""
+from collections import deque
+from datetime import date, datetime, timedelta
+from typing import (
+    Deque, Dict, Iterable, List, NamedTuple, Optional, Tuple
+)
+
+import peewee as pw
+
+from python_kanban.models import Todo, TodoTransition
+
+
+STATUSES = [status for status, _ in Todo.CHOICES]
+STARTED_STATUS = Todo.CHOICES[1][0]
+DONE_STATUS = Todo.CHOICES[-1][0]
+
+# A transition as read from the database:
+# (todo id, from status, to status, timestamp)
+Transition = Tuple[int, Optional[int], int, datetime]
+
+
+def iter_transitions() -> Iterable[Transition]:
+    """Stream the whole history without caching rows in memory"""
+    return (
+        TodoTransition.select(
+            TodoTransition.todo,
+            TodoTransition.from_status,
+            TodoTransition.to_status,
+            TodoTransition.timestamp,
+        )
+        .order_by(TodoTransition.timestamp, TodoTransition.id)
+        .tuples()
+        .iterator()
+    )
+
+
+class CumulativeFlow:
+    """Number of todos in each status at the end of each day, for the last
+    `days` days until the latest transition
+    """
+
+    def __init__(self, days: int = 14):
+        self.days = days
+        self.counts = {status: 0 for status in STATUSES}
+        self.snapshots: Deque[Tuple[date, Dict[int, int]]] = deque()
+        self.previous: Optional[Dict[int, int]] = None
+
+    def add(self, transition: Transition):
+        _, from_status, to_status, timestamp = transition
+        if from_status is not None:
+            self.counts[from_status] -= 1
+        self.counts[to_status] += 1
+
+        day = timestamp.date()
+        if self.snapshots and self.snapshots[-1][0] == day:
+            self.snapshots.pop()
+        # Days before the window of `day` are before the final one too. The
+        # last of them gives the counts at the start of the window.
+        first_day = day - timedelta(days=self.days - 1)
+        while self.snapshots and self.snapshots[0][0] < first_day:
+            self.previous = self.snapshots.popleft()[1]
+        self.snapshots.append((day, dict(self.counts)))
+
+    def result(self) -> List[Tuple[date, Dict[int, int]]]:
+        """One entry per calendar day, up to the last day with activity.
+        Days without activity repeat the counts of the day before.
+        """
+        if not self.snapshots:
+            return []
+
+        last_day = self.snapshots[-1][0]
+        snapshots = dict(self.snapshots)
+        counts = self.previous or {status: 0 for status in STATUSES}
+        result = []
+        for offset in range(self.days - 1, -1, -1):
+            day = last_day - timedelta(days=offset)
+            counts = snapshots.get(day, counts)
+            result.append((day, counts))
+        return result
+
+
+class WeeklyThroughput:
+    """Number of todos reaching the last status per ISO (year, week)"""
+
+    def __init__(self) -> None:
+        self.weeks: Dict[Tuple[int, int], int] = {}
+
+    def add(self, transition: Transition):
+        _, from_status, to_status, timestamp = transition
+        if to_status == DONE_STATUS and from_status is not None:
+            year, week_number, _ = timestamp.isocalendar()
+            week = (year, week_number)
+            self.weeks[week] = self.weeks.get(week, 0) + 1
+
+    def result(self) -> Dict[Tuple[int, int], int]:
+        return self.weeks
+
+
+class CycleTime:
+    """Time from the first move to "In progress" to the last move to "Done".
+    Todos that never went through "In progress" are not taken into account.
+    """
+
+    def __init__(self, percentiles: Iterable[int] = (50, 85, 95)):
+        self.percentiles = percentiles
+        self.started: Dict[int, datetime] = {}
+        self.cycle_times: Dict[int, timedelta] = {}
+
+    def add(self, transition: Transition):
+        todo_id, _, to_status, timestamp = transition
+        if to_status == STARTED_STATUS:
+            self.started.setdefault(todo_id, timestamp)
+        elif to_status == DONE_STATUS and todo_id in self.started:
+            self.cycle_times[todo_id] = timestamp - self.started[todo_id]
+
+    def result(self) -> Dict[int, timedelta]:
+        return percentiles(self.cycle_times.values(), self.percentiles)
+
+
+def percentiles(
+    values: Iterable[timedelta], ranks: Iterable[int]
+) -> Dict[int, timedelta]:
+    """Nearest-rank percentiles. Empty if there are no values"""
+    ordered = sorted(values)
+    if not ordered:
+        return {}
+    return {
+        rank: ordered[max(-(-rank * len(ordered) // 100), 1) - 1]
+        for rank in ranks
+    }
+
+
+def daily_flow() -> List[Tuple[date, Dict[int, int]]]:
+    """Number of todos in each status at the end of every day, from the first
+    transition to the last one.
+    The net changes per day come from a single aggregated query, so the cost
+    depends on the number of days and not on the number of transitions.
+    """
+    day = pw.fn.date(TodoTransition.timestamp).coerce(False)
+    query = (
+        TodoTransition.select(
+            day,
+            TodoTransition.from_status,
+            TodoTransition.to_status,
+            pw.fn.COUNT(TodoTransition.id),
+        )
+        .group_by(day, TodoTransition.from_status, TodoTransition.to_status)
+        .order_by(day)
+        .tuples()
+    )
+
+    changes: Dict[date, Dict[int, int]] = {}
+    for day_text, from_status, to_status, count in query:
+        day_changes = changes.setdefault(
+            date.fromisoformat(day_text), {status: 0 for status in STATUSES}
+        )
+        if from_status is not None:
+            day_changes[from_status] -= count
+        day_changes[to_status] += count
+
+    if not changes:
+        return []
+
+    counts = {status: 0 for status in STATUSES}
+    first_day, last_day = min(changes), max(changes)
+    flow = []
+    for offset in range((last_day - first_day).days + 1):
+        current_day = first_day + timedelta(days=offset)
+        for status, change in changes.get(current_day, {}).items():
+            counts[status] += change
+        flow.append((current_day, dict(counts)))
+    return flow
+
+
+class Report(NamedTuple):
+    cumulative_flow: List[Tuple[date, Dict[int, int]]]
+    throughput: Dict[Tuple[int, int], int]
+    cycle_time: Dict[int, timedelta]
+
+
+def compute_report(days: int = 14) -> Report:
+    """Run all aggregators in a single pass over the history"""
+    cumulative_flow = CumulativeFlow(days=days)
+    throughput = WeeklyThroughput()
+    cycle_time = CycleTime()
+    for transition in iter_transitions():
+        cumulative_flow.add(transition)
+        throughput.add(transition)
+        cycle_time.add(transition)
+    return Report(
+        cumulative_flow=cumulative_flow.result(),
+        throughput=throughput.result(),
+        cycle_time=cycle_time.result(),
+    )
+
+
+def format_report(report: Report) -> str:
+    status_names = [name for _, name in Todo.CHOICES]
+    widths = [max(len(name), 5) for name in status_names]
+
+    lines = ["Cumulative flow"]
+    lines.append(
+        "Date        " + "  ".join(
+            name.rjust(width) for name, width in zip(status_names, widths)
+        )
+    )
+    for day, counts in report.cumulative_flow:
+        lines.append(
+            f"{day.isoformat()}  " + "  ".join(
+                str(counts[status]).rjust(width)
+                for status, width in zip(STATUSES, widths)
+            )
+        )
+
+    lines.append("")
+    lines.append("Throughput per week")
+    for (year, week), count in sorted(report.throughput.items()):
+        lines.append(f"{year}-W{week:02d}  {count}")
+
+    lines.append("")
+    lines.append(
+        f"Cycle time ({Todo.CHOICES[1][1]} -> {Todo.CHOICES[-1][1]})"
+    )
+    if not report.cycle_time:
+        lines.append("No finished tasks yet.")
+    for rank, cycle_time in report.cycle_time.items():
+        lines.append(f"{rank}th percentile: {cycle_time}")
+
+    return "\n".join(lines)
+
+
+def print_report(days: int = 14):
+    print(format_report(compute_report(days=days)))
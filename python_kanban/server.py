@@ -0,0 +1,447 @@
+"""
+Small HTTP/JSON API over the board, built on asyncio streams only.
+
+Endpoints:
+
+- `GET /statuses`, `GET /categories`;
+- `GET /todos?status=&category=&after=&limit=`: todos ordered by id. The
+  `next` value of the answer is the `after` of the next page;
+- `GET /todos/<id>`, `POST /todos`, `PATCH /todos/<id>`,
+  `DELETE /todos/<id>`, `POST /todos/<id>/promote` and `.../regress`.
+  Promoting a todo blocked by others not done yet, or moving it forward with
+  its `status` field, answers a `409`;
+- `GET /revision`: current board revision;
+- `GET /changes?since=<revision>&timeout=<seconds>`: long poll answering as
+  soon as the revision is greater than `since`;
+- `GET /events`: server-sent events with every new revision.
+
+Todos are JSON objects with `title`, `body`, `category`, `status`, `due` (an
+ISO date or `null`) and `priority`; `POST` and `PATCH` take the same fields.
+
+All `GET` answers carry an `ETag` with the board revision, so clients sending
+it back in `If-None-Match` get a `304` while nothing changed.
+
+Requests are handled one at a time in the event loop, which shares a single
+database connection.
+"""
+import asyncio
+import json
+from datetime import date, datetime
+from http import HTTPStatus
+from typing import Dict, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import peewee as pw
+
+from python_kanban.models import BoardRevision, Category, Todo
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+POLL_INTERVAL = 0.25
+MAX_LONG_POLL_TIMEOUT = 60
+
+
+class Request(NamedTuple):
+    method: str
+    path: str
+    query: Dict[str, str]
+    headers: Dict[str, str]
+    body: bytes = b""
+
+
+class Response(NamedTuple):
+    status: int
+    body: Optional[object] = None
+    headers: Dict[str, str] = {}
+
+    def encode(self) -> bytes:
+        content = (
+            json.dumps(self.body).encode()
+            if self.body is not None
+            else b""
+        )
+        headers = {
+            "Content-Type": "application/json",
+            "Content-Length": str(len(content)),
+            "Connection": "close",
+            **self.headers,
+        }
+        head = "".join(
+            [f"HTTP/1.1 {self.status} {HTTPStatus(self.status).phrase}\r\n"]
+            + [f"{name}: {value}\r\n" for name, value in headers.items()]
+        )
+        return head.encode() + b"\r\n" + content
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def serialize_todo(todo: Todo) -> dict:
+    return {
+        "id": todo.id,
+        "title": todo.title,
+        "body": todo.body,
+        "status": todo.status,
+        "category": todo.category.name if todo.category else None,
+        "created": todo.created.isoformat(),
+        "updated": todo.updated.isoformat(),
+        "due": todo.due.isoformat() if todo.due else None,
+        "priority": todo.priority,
+    }
+
+
+class KanbanServer:
+    def __init__(self):
+        self.routes = [
+            ("GET", ("statuses",), self.list_statuses),
+            ("GET", ("categories",), self.list_categories),
+            ("GET", ("revision",), self.get_revision),
+            ("GET", ("todos",), self.list_todos),
+            ("POST", ("todos",), self.create_todo),
+            ("GET", ("todos", None), self.get_todo),
+            ("PATCH", ("todos", None), self.update_todo),
+            ("DELETE", ("todos", None), self.delete_todo),
+            ("POST", ("todos", None, "promote"), self.promote_todo),
+            ("POST", ("todos", None, "regress"), self.regress_todo),
+        ]
+
+    async def dispatch(self, request: Request) -> Response:
+        """Find the handler of a request and build its response"""
+        parts = tuple(part for part in request.path.split("/") if part)
+        try:
+            if request.method == "GET" and parts == ("changes",):
+                return await self.wait_for_changes(request)
+
+            handler, arguments = self._resolve(request.method, parts)
+            revision = BoardRevision.current()
+            etag = f'"{revision}"'
+            if (
+                request.method == "GET"
+                and request.headers.get("if-none-match") == etag
+            ):
+                return Response(304, headers={"ETag": etag})
+
+            response = handler(request, *arguments)
+            if request.method == "GET":
+                response = response._replace(
+                    headers={**response.headers, "ETag": etag}
+                )
+            return response
+        except HttpError as error:
+            return Response(error.status, {"error": error.message})
+
+    def _resolve(self, method: str, parts: Tuple[str, ...]):
+        path_found = False
+        for route_method, pattern, handler in self.routes:
+            if len(pattern) != len(parts) or any(
+                expected is not None and expected != part
+                for expected, part in zip(pattern, parts)
+            ):
+                continue
+            path_found = True
+            if route_method == method:
+                arguments = [
+                    part for expected, part in zip(pattern, parts)
+                    if expected is None
+                ]
+                return handler, arguments
+        if path_found:
+            raise HttpError(405, "Method not allowed")
+        raise HttpError(404, "Not found")
+
+    def list_statuses(self, request: Request) -> Response:
+        return Response(
+            200,
+            [{"id": status, "name": name} for status, name in Todo.CHOICES],
+        )
+
+    def list_categories(self, request: Request) -> Response:
+        return Response(
+            200,
+            [
+                {
+                    "id": category.id,
+                    "name": category.name,
+                    "todo_count": category.todo_count,
+                }
+                for category in Category.with_todo_counts()
+            ],
+        )
+
+    def get_revision(self, request: Request) -> Response:
+        return Response(200, {"revision": BoardRevision.current()})
+
+    def list_todos(self, request: Request) -> Response:
+        """Keyset pagination: each page starts after the last id of the
+        previous one, so deep pages cost as much as the first one.
+        """
+        after = _int_parameter(request.query, "after", 0)
+        limit = max(
+            min(
+                _int_parameter(request.query, "limit", DEFAULT_PAGE_SIZE),
+                MAX_PAGE_SIZE,
+            ),
+            1,
+        )
+        query = Todo.select(Todo, Category).join(
+            Category, join_type=pw.JOIN.LEFT_OUTER, on=(
+                Todo.category == Category.id
+            )
+        ).where(Todo.id > after)
+        if "status" in request.query:
+            query = query.where(
+                Todo.status == _int_parameter(request.query, "status", 0)
+            )
+        if "category" in request.query:
+            query = query.where(Category.name == request.query["category"])
+
+        # One extra row tells whether there is a next page
+        todos = list(query.order_by(Todo.id).limit(limit + 1))
+        next_after = todos[limit - 1].id if len(todos) > limit else None
+        todos = todos[:limit]
+        return Response(
+            200,
+            {
+                "items": [serialize_todo(todo) for todo in todos],
+                "next": next_after,
+            },
+        )
+
+    def get_todo(self, request: Request, todo_id: str) -> Response:
+        return Response(200, serialize_todo(_get_todo(todo_id)))
+
+    def create_todo(self, request: Request) -> Response:
+        fields = _validated_fields(_json_body(request), required=True)
+        todo = Todo.create_todo_with_category(**fields)
+        return Response(201, serialize_todo(todo))
+
+    def update_todo(self, request: Request, todo_id: str) -> Response:
+        todo = _get_todo(todo_id)
+        fields = {
+            "title": todo.title,
+            "body": todo.body,
+            "category_name": todo.category.name if todo.category else "",
+            **_validated_fields(_json_body(request), required=False),
+        }
+        status = fields.pop("status", todo.status)
+        # Same rule as promoting it
+        if status > todo.status and todo.is_blocked():
+            raise HttpError(409, f"Todo {todo_id} is blocked")
+        Todo.update_todo_with_category(todo, **fields)
+        todo = _get_todo(todo_id)
+        if status != todo.status:
+            # On top of its new status, as when promoted or regressed
+            todo.status = status
+            todo.updated = datetime.now()
+            todo.rank = Todo.top_rank(status, todo.category_id)
+            todo.save()
+        return Response(200, serialize_todo(todo))
+
+    def delete_todo(self, request: Request, todo_id: str) -> Response:
+        _get_todo(todo_id).delete_instance()
+        return Response(204)
+
+    def promote_todo(self, request: Request, todo_id: str) -> Response:
+        todo = _get_todo(todo_id)
+        if todo.is_blocked():
+            raise HttpError(409, f"Todo {todo_id} is blocked")
+        todo.promote()
+        return Response(200, serialize_todo(todo))
+
+    def regress_todo(self, request: Request, todo_id: str) -> Response:
+        todo = _get_todo(todo_id)
+        todo.regress()
+        return Response(200, serialize_todo(todo))
+
+    async def wait_for_changes(self, request: Request) -> Response:
+        """Long poll: answer as soon as the revision moves past `since`, or
+        with the current revision after `timeout` seconds
+        """
+        since = _int_parameter(request.query, "since", 0)
+        timeout = min(
+            _int_parameter(request.query, "timeout", 30),
+            MAX_LONG_POLL_TIMEOUT,
+        )
+        loop = asyncio.get_event_loop()
+        deadline = loop.time() + timeout
+        revision = BoardRevision.current()
+        while revision <= since and loop.time() < deadline:
+            await asyncio.sleep(POLL_INTERVAL)
+            revision = BoardRevision.current()
+        return Response(
+            200,
+            {"revision": revision, "changed": revision > since}
+        )
+
+    async def stream_events(self, writer: asyncio.StreamWriter):
+        """Server-sent events: one `revision` event per change"""
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Connection: keep-alive\r\n\r\n"
+        )
+        last_revision = None
+        while True:
+            revision = BoardRevision.current()
+            if revision != last_revision:
+                writer.write(
+                    f"event: revision\ndata: {revision}\n\n".encode()
+                )
+                await writer.drain()
+                last_revision = revision
+            await asyncio.sleep(POLL_INTERVAL)
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        try:
+            request = await read_request(reader)
+            if request is None:
+                return
+            if request.method == "GET" and request.path == "/events":
+                await self.stream_events(writer)
+                return
+            response = await self.dispatch(request)
+            writer.write(response.encode())
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[Request]:
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, _ = lines[0].split(" ", 2)
+    except ValueError:
+        return None
+
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+
+    length = int(headers.get("content-length", 0) or 0)
+    body = await reader.readexactly(length) if length else b""
+
+    url = urlsplit(target)
+    query = {
+        name: values[-1] for name, values in parse_qs(url.query).items()
+    }
+    return Request(method.upper(), url.path, query, headers, body)
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8000):
+    server = KanbanServer()
+    asyncio_server = await asyncio.start_server(
+        server.handle_connection, host, port
+    )
+    print(f"Serving the board on http://{host}:{port}")
+    async with asyncio_server:
+        await asyncio_server.serve_forever()
+
+
+def run_server(host: str = "127.0.0.1", port: int = 8000):
+    try:
+        asyncio.run(serve(host, port))
+    except KeyboardInterrupt:
+        pass
+
+
+def _get_todo(todo_id: str) -> Todo:
+    todo = Todo.get_or_none(Todo.id == todo_id) if todo_id.isdigit() else None
+    if todo is None:
+        raise HttpError(404, f"Todo {todo_id} not found")
+    return todo
+
+
+def _int_parameter(query: Dict[str, str], name: str, default: int) -> int:
+    try:
+        return int(query.get(name, default))
+    except ValueError:
+        raise HttpError(400, f"Parameter {name} must be an integer")
+
+
+def _json_body(request: Request) -> dict:
+    try:
+        data = json.loads(request.body or b"{}")
+    except ValueError:
+        raise HttpError(400, "Invalid JSON")
+    if not isinstance(data, dict):
+        raise HttpError(400, "Expected a JSON object")
+    return data
+
+
+def _validated_fields(data: dict, required: bool) -> dict:
+    """Translate the JSON fields to the arguments of the `Todo` methods"""
+    fields: Dict[str, object] = {}
+    if "title" in data or required:
+        title = data.get("title")
+        if not isinstance(title, str) or not (
+            0 < len(title) <= Todo.title.max_length
+        ):
+            raise HttpError(
+                400,
+                "Title cannot be empty nor larger than "
+                f"{Todo.title.max_length} characters",
+            )
+        fields["title"] = title
+    if "body" in data:
+        body = data["body"] or ""
+        if not isinstance(body, str):
+            raise HttpError(400, "Body must be a string")
+        fields["body"] = body
+    if "category" in data:
+        category = data["category"] or ""
+        if not isinstance(category, str) or (
+            len(category) > Category.name.max_length
+        ):
+            raise HttpError(
+                400,
+                "Category cannot be larger than "
+                f"{Category.name.max_length} characters",
+            )
+        fields["category_name"] = category
+    if "status" in data:
+        fields["status"] = _choice(data, "status", Todo.CHOICES)
+    if "due" in data:
+        fields["due"] = _due_date(data["due"])
+    if "priority" in data:
+        fields["priority"] = _choice(data, "priority", Todo.PRIORITIES)
+    return fields
+
+
+def _due_date(value: object) -> Optional[date]:
+    """An ISO date such as "2021-05-01", or `None` for no due date"""
+    if value is None:
+        return None
+    try:
+        if isinstance(value, str):
+            return date.fromisoformat(value)
+    except ValueError:
+        pass
+    raise HttpError(400, "Due must be an ISO date (YYYY-MM-DD) or null")
+
+
+def _choice(
+    data: dict, name: str, choices: Tuple[Tuple[int, str], ...]
+) -> int:
+    """Id of one of the `choices` of a model field"""
+    value = data[name]
+    # Booleans are integers too
+    if type(value) is not int or value not in dict(choices):
+        raise HttpError(
+            400,
+            f"{name.capitalize()} must be one of "
+            + ", ".join(str(choice) for choice, _ in choices),
+        )
+    return value
@@ -0,0 +1,114 @@
+"""
+Settings of the board, such as `DB_FILE` or `KEYMAP`.
+
+They are read from `settings.toml` and then `.secrets.toml` in the current
+folder, and from the environment variables starting with `DYNACONF_`, which
+win. Values of environment variables are read as TOML when they can be, so
+`DYNACONF_COMPACT=true` is a boolean and `DYNACONF_DB_FILE=other.db` a
+string. Names are case-insensitive.
+
+This is the small subset of dynaconf the board uses, without its import and
+file discovery time. Dynaconf itself, installed with the "dynaconf" extra, is
+used instead when `KANBAN_SETTINGS_LOADER=dynaconf` is set, e.g. for its
+environments or other file formats.
+
+Files are only read on the first access to a setting.
+"""
+import os
+from typing import Any, Dict, Optional, Sequence
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib  # type: ignore[no-redef]
+
+
+SETTINGS_FILES = ("settings.toml", ".secrets.toml")
+ENVIRONMENT_PREFIX = "DYNACONF_"
+LOADER_VARIABLE = "KANBAN_SETTINGS_LOADER"
+DEFAULT_DB_FILE = "kanban.db"
+
+
+def _parse_environment_value(value: str) -> Any:
+    try:
+        return tomllib.loads(f"value = {value}")["value"]
+    except tomllib.TOMLDecodeError:
+        return value
+
+
+def load_settings(
+    files: Sequence[str] = SETTINGS_FILES,
+    environment: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """Values of the files, in order, then of the environment"""
+    values: Dict[str, Any] = {}
+    for path in files:
+        if os.path.exists(path):
+            with open(path, "rb") as settings_file:
+                values.update(
+                    (name.upper(), value)
+                    for name, value in tomllib.load(settings_file).items()
+                )
+    for name, value in (
+        os.environ if environment is None else environment
+    ).items():
+        if name.startswith(ENVIRONMENT_PREFIX):
+            values[name[len(ENVIRONMENT_PREFIX):].upper()] = (
+                _parse_environment_value(value)
+            )
+    return values
+
+
+class Settings:
+    """Settings loaded on first use, with the same `get`, `in` and
+    attribute access as dynaconf's
+    """
+
+    def __init__(self, values: Optional[Dict[str, Any]] = None):
+        self._values = values
+
+    def _load(self) -> Dict[str, Any]:
+        if self._values is None:
+            self._values = load_settings()
+        return self._values
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self._load().get(name.upper(), default)
+
+    def __contains__(self, name: str) -> bool:
+        return name.upper() in self._load()
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self._load()[name.upper()]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def reload(self):
+        """Read the files and environment again on next use"""
+        self._values = None
+
+
+class _DynaconfSettings:
+    """Dynaconf's settings, only imported on first use"""
+
+    def __getattr__(self, name: str) -> Any:
+        from dynaconf import settings as dynaconf_settings
+
+        return getattr(dynaconf_settings, name)
+
+    def __contains__(self, name: str) -> bool:
+        from dynaconf import settings as dynaconf_settings
+
+        return name in dynaconf_settings
+
+
+def create_settings() -> Any:
+    if os.environ.get(LOADER_VARIABLE) == "dynaconf":
+        return _DynaconfSettings()
+    return Settings()
+
+
+settings = create_settings()
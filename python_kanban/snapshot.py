@@ -0,0 +1,228 @@
+"""
+Compact read-only copy of the board in a single binary file, for status
+bars, shell prompts and other tools that only need a few numbers.
+
+The file starts with a fixed header and a table with the offset and number of
+todos of each status, followed by the packed todos of each status in board
+order. It is memory-mapped when read, so counting the todos only reads the
+table and the top todos of a status only read their own records, whatever the
+size of the board. Reading it needs neither SQLite nor peewee.
+
+Layout, little-endian:
+
+- header: magic "PKBS", format version, number of statuses, board revision
+  and generation time (Unix seconds);
+- one (status, offset, count) entry per status;
+- one record per todo: id, priority, due date (ordinal day, 0 if none),
+  length of the category name, length of the title, then the UTF-8 category
+  name and title.
+
+The app keeps the file given in `SNAPSHOT_FILE` up to date after every change
+of the board, see `SnapshotWriter`.
+"""
+import mmap
+import os
+import struct
+import time
+from datetime import date
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from python_kanban.settings import settings
+
+
+MAGIC = b"PKBS"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQd")
+SECTION = struct.Struct("<HII")
+RECORD = struct.Struct("<IBIBH")
+DEFAULT_SNAPSHOT_FILE = "kanban.snapshot"
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+class SnapshotCard(NamedTuple):
+    id: int
+    title: str
+    category: str
+    priority: int
+    due: Optional[date]
+
+
+def snapshot_file(path: Optional[str] = None) -> str:
+    return path or settings.get("SNAPSHOT_FILE") or DEFAULT_SNAPSHOT_FILE
+
+
+def encode_record(todo: Any) -> bytes:
+    category = (todo.category.name if todo.category else "").encode()
+    title = todo.title.encode()
+    due = todo.due.toordinal() if todo.due else 0
+    return (
+        RECORD.pack(todo.id, todo.priority, due, len(category), len(title))
+        + category + title
+    )
+
+
+def pack_snapshot(
+    sections: List[Tuple[int, List[bytes]]],
+    revision: int = 0,
+    generated: Optional[float] = None,
+) -> bytes:
+    """Whole file from the encoded records of each status"""
+    header = HEADER.pack(
+        MAGIC, VERSION, len(sections), revision,
+        time.time() if generated is None else generated,
+    )
+    offset = HEADER.size + SECTION.size * len(sections)
+    table = []
+    for status, records in sections:
+        table.append(SECTION.pack(status, offset, len(records)))
+        offset += sum(len(record) for record in records)
+    return b"".join(
+        [header, *table, *(b"".join(records) for _, records in sections)]
+    )
+
+
+def _write_atomically(path: str, data: bytes):
+    """Readers see either the previous file or the new one, never a part of
+    it. Those with the previous file mapped keep reading it.
+    """
+    # Imported here, as it is slow and readers do not need it
+    import tempfile
+
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temporary_path = tempfile.mkstemp(dir=directory, prefix=".part-")
+    try:
+        with os.fdopen(handle, "wb") as temporary:
+            temporary.write(data)
+        os.replace(temporary_path, path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+
+class SnapshotWriter:
+    """Writes the snapshot of a repository again when the board changed.
+
+    Encoded records are kept from one write to the next, keyed by the values
+    they hold, so only new and changed todos are encoded again. The file is
+    not touched when the board revision or the content did not change.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = snapshot_file(path)
+        self.revision: Optional[int] = None
+        self._records: Dict[tuple, bytes] = {}
+        self._sections: Optional[List[Tuple[int, List[bytes]]]] = None
+
+    def update(self, repository: Optional[Any] = None) -> bool:
+        """Write the file if the board changed since the last call. Return
+        whether it was written.
+        """
+        if repository is None:
+            from python_kanban.storage import get_repository
+
+            repository = get_repository()
+        revision = repository.revision()
+        if (
+            revision is not None
+            and revision == self.revision
+            and os.path.exists(self.path)
+        ):
+            return False
+
+        records: Dict[tuple, bytes] = {}
+        sections = []
+        for status, todos in repository.group_todos_per_status().items():
+            encoded = []
+            for todo in todos:
+                key = (
+                    todo.id, todo.title, todo.priority, todo.due,
+                    todo.category.name if todo.category else "",
+                )
+                record = self._records.get(key) or encode_record(todo)
+                records[key] = record
+                encoded.append(record)
+            sections.append((status, encoded))
+        # Records of deleted and changed todos are dropped
+        self._records = records
+        self.revision = revision
+
+        if sections == self._sections and os.path.exists(self.path):
+            return False
+        _write_atomically(self.path, pack_snapshot(sections, revision or 0))
+        self._sections = sections
+        return True
+
+
+class Snapshot:
+    """Memory-mapped snapshot. Use it as a context manager, or close it"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = snapshot_file(path)
+        with open(self.path, "rb") as snapshot:
+            if os.fstat(snapshot.fileno()).st_size < HEADER.size:
+                raise SnapshotError("File too short")
+            self._data = mmap.mmap(
+                snapshot.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        try:
+            self._read_table()
+        except (SnapshotError, struct.error) as error:
+            self.close()
+            raise SnapshotError(str(error)) from error
+
+    def _read_table(self):
+        magic, version, statuses, self.revision, self.generated = (
+            HEADER.unpack_from(self._data)
+        )
+        if magic != MAGIC:
+            raise SnapshotError("Not a board snapshot")
+        if version != VERSION:
+            raise SnapshotError(f"Unsupported snapshot version {version}")
+        self._sections: Dict[int, Tuple[int, int]] = {}
+        for index in range(statuses):
+            status, offset, count = SECTION.unpack_from(
+                self._data, HEADER.size + index * SECTION.size
+            )
+            self._sections[status] = (offset, count)
+
+    def close(self):
+        self._data.close()
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def counts(self) -> Dict[int, int]:
+        """Number of todos per status"""
+        return {
+            status: count for status, (_, count) in self._sections.items()
+        }
+
+    def count(self, status: int) -> int:
+        return self._sections.get(status, (0, 0))[1]
+
+    def top(self, status: int, limit: int) -> List[SnapshotCard]:
+        """First `limit` todos of a status, in board order"""
+        offset, count = self._sections.get(status, (0, 0))
+        cards = []
+        for _ in range(min(limit, count)):
+            todo_id, priority, due, category_length, title_length = (
+                RECORD.unpack_from(self._data, offset)
+            )
+            offset += RECORD.size
+            category = self._data[offset:offset + category_length].decode()
+            offset += category_length
+            title = self._data[offset:offset + title_length].decode()
+            offset += title_length
+            cards.append(
+                SnapshotCard(
+                    todo_id, title, category, priority,
+                    date.fromordinal(due) if due else None,
+                )
+            )
+        return cards
@@ -0,0 +1,70 @@
+"""
+Orders of the todos inside a status column.
+
+Each mode has a sort key, used to keep a column sorted when a single todo is
+added to it, and the database reads columns through an index in the same
+order (see `Todo.group_todos_per_status`), so the whole board never needs to
+be sorted.
+
+In the "rank" and "category" modes todos are grouped by category, and the
+columns show a header per category.
+"""
+from typing import Any, Callable, Dict, List, Optional
+
+
+SORT_MODES = {
+    "rank": "manual order",
+    "category": "category name",
+    "updated": "last moved",
+    "created": "newest",
+    "title": "title",
+}
+DEFAULT_SORT_MODE = "rank"
+GROUPED_SORT_MODES = ("rank", "category")
+
+
+def _category_id(todo: Any) -> int:
+    return todo.category.id if todo.category else 0
+
+
+def _category_name(todo: Any) -> str:
+    return todo.category.name if todo.category else ""
+
+
+SORT_KEYS: Dict[str, Callable[[Any], tuple]] = {
+    # Todos without category first, then by category creation
+    "rank": lambda todo: (_category_id(todo), todo.rank),
+    "category": lambda todo: (
+        _category_name(todo), _category_id(todo), todo.rank
+    ),
+    "updated": lambda todo: (-todo.updated.timestamp(), -todo.id),
+    "created": lambda todo: (-todo.created.timestamp(), -todo.id),
+    "title": lambda todo: (todo.title, todo.id),
+}
+
+
+def validate_sort_mode(sort_mode: Optional[str]) -> str:
+    """The given mode, or the default one if it is unknown"""
+    return sort_mode if sort_mode in SORT_MODES else DEFAULT_SORT_MODE
+
+
+def next_sort_mode(sort_mode: str) -> str:
+    modes = list(SORT_MODES)
+    return modes[(modes.index(sort_mode) + 1) % len(modes)]
+
+
+def insert_sorted(entries: List[Any], todo: Any, sort_mode: str) -> int:
+    """Insert a todo in a sorted column with a binary search. Return its
+    position.
+    """
+    key = SORT_KEYS[sort_mode]
+    todo_key = key(todo)
+    low, high = 0, len(entries)
+    while low < high:
+        middle = (low + high) // 2
+        if key(entries[middle]) <= todo_key:
+            low = middle + 1
+        else:
+            high = middle
+    entries.insert(low, todo)
+    return low
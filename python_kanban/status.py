@@ -0,0 +1,104 @@
+"""
+Number of todos per status for shell prompts and status bars, e.g. in tmux:
+
+    set -g status-right "#(python_kanban status --format tmux)"
+
+These run every few seconds, so this module only uses the standard library
+and the built-in settings: neither peewee, prompt_toolkit nor dynaconf are
+imported. Counts are read with a single query on the summary table kept by
+SQLite triggers (see `python_kanban.models.TodoStats`), or from the snapshot
+of `python_kanban.snapshot` when there is one.
+"""
+import os
+import sqlite3
+from typing import Dict, Optional
+
+from python_kanban.settings import DEFAULT_DB_FILE, settings
+
+
+# Same order as `Todo.CHOICES`, which is not imported to keep this fast
+STATUS_KEYS = ("todo", "in_progress", "done")
+
+FORMATS = {
+    "plain": "To do: {todo}  In progress: {in_progress}  Done: {done}",
+    "short": "{todo}/{in_progress}/{done}",
+    "tmux": (
+        "#[fg=yellow]{todo} #[fg=cyan]{in_progress} "
+        "#[fg=green]{done}#[default]"
+    ),
+    "polybar": (
+        "%{{F#e5c07b}}{todo}%{{F-}} %{{F#56b6c2}}{in_progress}%{{F-}} "
+        "%{{F#98c379}}{done}%{{F-}}"
+    ),
+}
+DEFAULT_FORMAT = "plain"
+
+# Summary table first, the todos themselves for databases created before it
+QUERIES = (
+    "SELECT status, SUM(count) FROM todostats GROUP BY status",
+    "SELECT status, COUNT(*) FROM todo GROUP BY status",
+)
+
+
+class StatusError(Exception):
+    pass
+
+
+def count_from_database(path: str) -> Dict[int, int]:
+    """Todos per status, without creating the database if it is missing"""
+    if not os.path.exists(path):
+        raise StatusError(f"No database at {path}")
+    counts = {status: 0 for status in range(len(STATUS_KEYS))}
+    # Read-only, so a missing table does not create an empty board
+    uri = path.replace("%", "%25").replace("?", "%3f").replace("#", "%23")
+    connection = sqlite3.connect(f"file:{uri}?mode=ro", uri=True)
+    try:
+        for query in QUERIES:
+            try:
+                rows = connection.execute(query).fetchall()
+            except sqlite3.OperationalError:
+                continue
+            counts.update((status, int(count)) for status, count in rows)
+            return counts
+    finally:
+        connection.close()
+    raise StatusError(f"No board in {path}")
+
+
+def count_from_snapshot(path: str) -> Dict[int, int]:
+    from python_kanban.snapshot import Snapshot, SnapshotError
+
+    try:
+        with Snapshot(path) as snapshot:
+            return snapshot.counts()
+    except (OSError, SnapshotError) as error:
+        raise StatusError(f"Cannot read {path}: {error}") from error
+
+
+def count_todos(
+    database: Optional[str] = None, snapshot: Optional[str] = None
+) -> Dict[int, int]:
+    """Counts from the snapshot when one is given, either here or in the
+    settings, from the database otherwise
+    """
+    if snapshot is None and database is None:
+        snapshot = settings.get("SNAPSHOT_FILE")
+    if snapshot:
+        return count_from_snapshot(snapshot)
+    return count_from_database(
+        database or settings.get("DB_FILE") or DEFAULT_DB_FILE
+    )
+
+
+def format_status(counts: Dict[int, int], template: str) -> str:
+    """`template` is the name of a format or a `str.format` template with
+    `todo`, `in_progress`, `done` and `total` fields
+    """
+    values = {
+        key: counts.get(status, 0) for status, key in enumerate(STATUS_KEYS)
+    }
+    template = FORMATS.get(template, template)
+    try:
+        return template.format(total=sum(values.values()), **values)
+    except (KeyError, IndexError, ValueError) as error:
+        raise StatusError(f"Invalid format {template!r}: {error}") from error
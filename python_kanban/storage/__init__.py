@@ -0,0 +1,63 @@
+"""
+Storage layer used by the views and the main app.
+
+Views never talk to a database directly. They go through a `Repository`,
+whose implementation is chosen with the `STORAGE` setting:
+
+- "sqlite" (default): the peewee models on the `DB_FILE` database;
+- "memory": plain Python objects, lost on exit. Handy for tests and
+  benchmarks;
+- "jsonl": an append-only log of changes in the `JSONL_FILE` file, replayed
+  in memory on startup.
+
+Only the board itself (listing, adding, editing, deleting and moving tasks)
+goes through this layer. Features built on SQL aggregates, such as
+statistics, reports and category management, still need the SQLite backend.
+"""
+from typing import Optional
+
+from python_kanban.settings import settings
+from python_kanban.storage.base import Repository
+
+
+_repository: Optional[Repository] = None
+
+
+def create_repository(backend: str = "sqlite", **options) -> Repository:
+    if backend == "sqlite":
+        from python_kanban.storage.sqlite import SqliteRepository
+
+        return SqliteRepository()
+    if backend == "memory":
+        from python_kanban.storage.memory import MemoryRepository
+
+        return MemoryRepository()
+    if backend == "jsonl":
+        from python_kanban.storage.jsonl import JsonlRepository
+
+        return JsonlRepository(options.get("path", "kanban.jsonl"))
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+def get_repository() -> Repository:
+    """Return the repository configured in the settings, creating it on the
+    first call
+    """
+    global _repository
+    if _repository is None:
+        _repository = create_repository(
+            settings.get("STORAGE", "sqlite"),
+            path=settings.get("JSONL_FILE", "kanban.jsonl"),
+        )
+    return _repository
+
+
+def set_repository(repository: Optional[Repository]):
+    """Replace the current repository. `None` goes back to the settings"""
+    global _repository
+    _repository = repository
+
+
+__all__ = [
+    "Repository", "create_repository", "get_repository", "set_repository"
+]
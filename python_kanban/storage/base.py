@@ -0,0 +1,122 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from python_kanban.dependencies import DependencyGraph
+from python_kanban.sorting import DEFAULT_SORT_MODE
+
+
+class Repository(ABC):
+    """Operations the views need on the board.
+    Todos are returned as objects with, at least, the same attributes as
+    `python_kanban.models.Todo`: `id`, `title`, `body`, `status`, `category`
+    (with a `name`, or `None`), `created`, `updated` and `rank`.
+    """
+
+    def setup(self):
+        """Prepare the storage before the first use"""
+
+    def revision(self) -> Optional[int]:
+        """A number changing with every change of the board, to skip reading
+        it again when nothing changed. `None` when the storage has none.
+        """
+        return None
+
+    def dependency_graph(self) -> Optional[DependencyGraph]:
+        """"Blocked by" links between todos, kept up to date by the changes
+        of status made through this repository. `None` when the storage has
+        none.
+        """
+        return None
+
+    @abstractmethod
+    def count_todos(self) -> int:
+        ...
+
+    @abstractmethod
+    def group_todos_per_status(
+        self, sort_mode: str = DEFAULT_SORT_MODE
+    ) -> Dict[int, List[Any]]:
+        """Todos per status, in the order of `sort_mode` as in
+        `Todo.group_todos_per_status`
+        """
+
+    @abstractmethod
+    def category_names(self) -> List[str]:
+        ...
+
+    @abstractmethod
+    def create_todo(self, category_name: str = "", **fields) -> Any:
+        """Create a todo. The category is created if needed"""
+
+    @abstractmethod
+    def update_todo(self, todo: Any, category_name: str = "", **fields):
+        """Update a todo without touching its "updated" time"""
+
+    @abstractmethod
+    def delete_todo(self, todo: Any):
+        ...
+
+    @abstractmethod
+    def move_todo(
+        self, todo: Any, above: Optional[Any] = None,
+        below: Optional[Any] = None,
+    ):
+        """Place a todo between two others of the same status and category.
+        `None` stands for the top or the bottom.
+        """
+
+    @abstractmethod
+    def tag_names(self) -> List[str]:
+        """Every tag in use"""
+
+    @abstractmethod
+    def todo_tag_names(self, todo: Any) -> List[str]:
+        ...
+
+    @abstractmethod
+    def set_tags(self, todo: Any, names: Iterable[str]):
+        """Replace the tags of a todo"""
+
+    @abstractmethod
+    def tag_postings(self) -> Dict[str, Set[int]]:
+        """Ids of the todos with each tag, see `python_kanban.tags`.
+        It must not be modified.
+        """
+
+    @abstractmethod
+    def checklist(self, todo: Any) -> List[Tuple[str, bool]]:
+        """(text, done) items of a todo, in order"""
+
+    @abstractmethod
+    def set_checklist(self, todo: Any, items: Iterable[Tuple[str, bool]]):
+        """Replace the checklist of a todo"""
+
+    @abstractmethod
+    def checklist_progress(self) -> Dict[int, Tuple[int, int]]:
+        """(done, total) items per id of todo with a checklist"""
+
+    @abstractmethod
+    def attachments(self, todo: Any) -> List[Any]:
+        """Files attached to a todo, by name. Each has a `name`, a `digest`
+        and a `size`, see `python_kanban.attachments`
+        """
+
+    @abstractmethod
+    def add_attachment(
+        self, todo: Any, name: str, digest: str, size: int
+    ) -> Any:
+        """Record a file already stored with `store_blob`"""
+
+    @abstractmethod
+    def attachment_digests(self) -> Set[str]:
+        """Digests of the files attached to any todo"""
+
+    @abstractmethod
+    def promote(self, todo: Any):
+        """Move the status forward, unless the todo is blocked. The given
+        object is updated in place
+        """
+
+    @abstractmethod
+    def regress(self, todo: Any):
+        """Move the status backwards. The given object is updated in place"""
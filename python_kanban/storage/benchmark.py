@@ -0,0 +1,98 @@
+"""Run the same workload against every storage backend"""
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+import peewee as pw
+
+from python_kanban.models import MODELS
+from python_kanban.storage import create_repository
+from python_kanban.storage.base import Repository
+
+
+BACKENDS = ("sqlite", "memory", "jsonl")
+
+
+@contextmanager
+def _temporary_repository(
+    backend: str, directory: str
+) -> Iterator[Repository]:
+    if backend == "sqlite":
+        database = pw.SqliteDatabase(os.path.join(directory, "kanban.db"))
+        with database.bind_ctx(MODELS):
+            repository = create_repository("sqlite")
+            repository.setup()
+            yield repository
+        database.close()
+    else:
+        repository = create_repository(
+            backend, path=os.path.join(directory, "kanban.jsonl")
+        )
+        repository.setup()
+        yield repository
+
+
+def benchmark_repository(
+    repository: Repository, cards: int
+) -> Dict[str, float]:
+    """Seconds taken by each step of a typical session"""
+    timings = {}
+
+    start = time.perf_counter()
+    for i in range(cards):
+        repository.create_todo(
+            title=f"Task {i}", body="", category_name=f"Category {i % 10}"
+        )
+    timings["create"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    todos = [
+        todo
+        for todos in repository.group_todos_per_status().values()
+        for todo in todos
+    ]
+    timings["list"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for todo in todos:
+        repository.promote(todo)
+    timings["promote"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for todo in todos:
+        repository.update_todo(
+            todo, title=f"{todo.title}!", body="", category_name=""
+        )
+    timings["update"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for todo in todos:
+        repository.delete_todo(todo)
+    timings["delete"] = time.perf_counter() - start
+
+    return timings
+
+
+def run_benchmark(cards: int = 1000) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for backend in BACKENDS:
+        with tempfile.TemporaryDirectory() as directory:
+            with _temporary_repository(backend, directory) as repository:
+                results[backend] = benchmark_repository(repository, cards)
+                if hasattr(repository, "close"):
+                    repository.close()
+    return results
+
+
+def print_benchmark(cards: int = 1000):
+    results = run_benchmark(cards)
+    steps = list(next(iter(results.values())))
+    print(f"Seconds for {cards} tasks")
+    print("Backend " + "".join(step.rjust(10) for step in steps))
+    for backend, timings in results.items():
+        print(
+            backend.ljust(8)
+            + "".join(f"{timings[step]:10.4f}" for step in steps)
+        )
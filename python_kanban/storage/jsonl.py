@@ -0,0 +1,216 @@
+import json
+import os
+from datetime import date, datetime
+from typing import IO, Iterable, Optional, Tuple
+
+from python_kanban.storage.memory import (
+    Card, CardAttachment, MemoryRepository
+)
+
+
+class JsonlRepository(MemoryRepository):
+    """Keep the board in memory and append every change to a JSON lines file.
+    The file is replayed when the repository is created. `compact` rewrites
+    it with only the current state.
+    """
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._file: Optional[IO[str]] = None
+        # Changes appended since the file was opened
+        self._changes = 0
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as log:
+                for line in log:
+                    if line.strip():
+                        self._apply(json.loads(line))
+
+    def revision(self) -> int:
+        return self._changes
+
+    def create_todo(self, category_name: str = "", **fields) -> Card:
+        card = super().create_todo(category_name=category_name, **fields)
+        self._append(_card_record(card))
+        return card
+
+    def update_todo(self, todo: Card, category_name: str = "", **fields):
+        super().update_todo(todo, category_name=category_name, **fields)
+        self._append(
+            {"op": "update", "id": todo.id, "category": category_name,
+             **_encode_dates(fields)}
+        )
+
+    def delete_todo(self, todo: Card):
+        super().delete_todo(todo)
+        self._append({"op": "delete", "id": todo.id})
+
+    def set_tags(self, todo: Card, names: Iterable[str]):
+        super().set_tags(todo, names)
+        self._append(
+            {"op": "tags", "id": todo.id, "tags": self.cards[todo.id].tags}
+        )
+
+    def set_checklist(self, todo: Card, items: Iterable[Tuple[str, bool]]):
+        super().set_checklist(todo, items)
+        self._append(
+            {"op": "checklist", "id": todo.id,
+             "checklist": self.cards[todo.id].checklist}
+        )
+
+    def add_attachment(
+        self, todo: Card, name: str, digest: str, size: int
+    ) -> CardAttachment:
+        attachment = super().add_attachment(todo, name, digest, size)
+        self._append(
+            {"op": "attach", "id": todo.id,
+             **_attachment_record(attachment)}
+        )
+        return attachment
+
+    def _set_status(self, todo: Card, status: int):
+        super()._set_status(todo, status)
+        self._append(
+            {"op": "status", "id": todo.id, "status": status,
+             "updated": todo.updated.isoformat(), "rank": todo.rank}
+        )
+
+    def move_todo(
+        self, todo: Card, above: Optional[Card] = None,
+        below: Optional[Card] = None,
+    ):
+        super().move_todo(todo, above, below)
+        self._append({"op": "rank", "id": todo.id, "rank": todo.rank})
+
+    def compact(self):
+        """Replace the log by one "create" record per existing todo"""
+        self.close()
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as log:
+            for card in self.cards.values():
+                log.write(json.dumps(_card_record(card)) + "\n")
+        os.replace(temporary_path, self.path)
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def _append(self, record: dict):
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+        self._changes += 1
+
+    def _apply(self, record: dict):
+        """Replay a record from the log, without writing it again"""
+        op = record.pop("op")
+        card_id = record.pop("id")
+        if op == "create":
+            category = self._get_or_create_category(record.pop("category"))
+            tags = record.pop("tags", [])
+            checklist = record.pop("checklist", [])
+            attachments = record.pop("attachments", [])
+            card = Card(
+                id=card_id,
+                category=category,
+                created=datetime.fromisoformat(record.pop("created")),
+                updated=datetime.fromisoformat(record.pop("updated")),
+                **_decode_dates(record),
+            )
+            self._index_tags(card, tags)
+            card.checklist = _decode_checklist(checklist)
+            card.attachments = [
+                _decode_attachment(attachment) for attachment in attachments
+            ]
+            # Logs written before ranks existed
+            card.rank = card.rank or self._top_rank(card.status, category)
+            self.cards[card_id] = card
+            self._last_id = max(self._last_id, card_id)
+        elif op == "update":
+            card = self.cards[card_id]
+            card.category = self._get_or_create_category(
+                record.pop("category")
+            )
+            for name, value in _decode_dates(record).items():
+                setattr(card, name, value)
+        elif op == "status":
+            card = self.cards[card_id]
+            card.status = record["status"]
+            card.updated = datetime.fromisoformat(record["updated"])
+            card.rank = record.get("rank") or self._top_rank(
+                card.status, card.category, card
+            )
+        elif op == "tags":
+            self._index_tags(self.cards[card_id], record["tags"])
+        elif op == "checklist":
+            self.cards[card_id].checklist = _decode_checklist(
+                record["checklist"]
+            )
+        elif op == "attach":
+            self.cards[card_id].attachments.append(
+                _decode_attachment(record)
+            )
+        elif op == "rank":
+            self.cards[card_id].rank = record["rank"]
+        elif op == "delete":
+            if card_id in self.cards:
+                self._index_tags(self.cards.pop(card_id), [])
+
+
+def _card_record(card: Card) -> dict:
+    return {
+        "op": "create",
+        "id": card.id,
+        "title": card.title,
+        "body": card.body,
+        "status": card.status,
+        "category": card.category.name if card.category else "",
+        "created": card.created.isoformat(),
+        "updated": card.updated.isoformat(),
+        "rank": card.rank,
+        "due": card.due.isoformat() if card.due else None,
+        "priority": card.priority,
+        "tags": card.tags,
+        "checklist": card.checklist,
+        "attachments": [
+            _attachment_record(attachment) for attachment in card.attachments
+        ],
+    }
+
+
+def _attachment_record(attachment: CardAttachment) -> dict:
+    return {
+        "name": attachment.name,
+        "digest": attachment.digest,
+        "size": attachment.size,
+        "added": attachment.added.isoformat(),
+    }
+
+
+def _decode_attachment(record: dict) -> CardAttachment:
+    return CardAttachment(
+        name=record["name"],
+        digest=record["digest"],
+        size=record["size"],
+        added=datetime.fromisoformat(record["added"]),
+    )
+
+
+def _encode_dates(fields: dict) -> dict:
+    return {
+        name: value.isoformat() if isinstance(value, date) else value
+        for name, value in fields.items()
+    }
+
+
+def _decode_checklist(items: list) -> list:
+    """JSON has no tuples"""
+    return [(text, done) for text, done in items]
+
+
+def _decode_dates(record: dict) -> dict:
+    if record.get("due"):
+        record["due"] = date.fromisoformat(record["due"])
+    return record
@@ -0,0 +1,209 @@
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from python_kanban.models import Todo
+from python_kanban.ranks import rank_between
+from python_kanban.sorting import DEFAULT_SORT_MODE, SORT_KEYS
+from python_kanban.storage.base import Repository
+
+
+FIRST_STATUS = Todo.CHOICES[0][0]
+LAST_STATUS = Todo.CHOICES[-1][0]
+
+
+@dataclass(frozen=True)
+class CardCategory:
+    id: int
+    name: str
+
+    def __str__(self):
+        return self.name
+
+
+@dataclass(frozen=True)
+class CardAttachment:
+    name: str
+    digest: str
+    size: int
+    added: datetime = field(default_factory=datetime.now)
+
+    def __str__(self):
+        return self.name
+
+
+@dataclass
+class Card:
+    """Plain counterpart of a `Todo`"""
+
+    id: int
+    title: str
+    body: str = ""
+    status: int = FIRST_STATUS
+    category: Optional[CardCategory] = None
+    created: datetime = field(default_factory=datetime.now)
+    updated: datetime = field(default_factory=datetime.now)
+    rank: str = ""
+    due: Optional[date] = None
+    priority: int = Todo.PRIORITIES[1][0]
+    tags: List[str] = field(default_factory=list)
+    checklist: List[Tuple[str, bool]] = field(default_factory=list)
+    attachments: List[CardAttachment] = field(default_factory=list)
+
+    def __str__(self):
+        return self.title
+
+
+class MemoryRepository(Repository):
+    """Keep everything in dictionaries. Nothing is persisted"""
+
+    def __init__(self) -> None:
+        self.cards: Dict[int, Card] = {}
+        self.categories: Dict[str, CardCategory] = {}
+        self.postings: Dict[str, Set[int]] = {}
+        self._last_id = 0
+
+    def count_todos(self) -> int:
+        return len(self.cards)
+
+    def group_todos_per_status(
+        self, sort_mode: str = DEFAULT_SORT_MODE
+    ) -> Dict[int, List[Card]]:
+        todos_dict: Dict[int, List[Card]] = {
+            status: [] for status, _ in Todo.CHOICES
+        }
+        cards = sorted(self.cards.values(), key=SORT_KEYS[sort_mode])
+        for card in cards:
+            todos_dict[card.status].append(card)
+        return todos_dict
+
+    def category_names(self) -> List[str]:
+        return list(self.categories)
+
+    def create_todo(self, category_name: str = "", **fields) -> Card:
+        self._last_id += 1
+        card = Card(
+            id=self._last_id,
+            category=self._get_or_create_category(category_name),
+            **fields,
+        )
+        card.rank = card.rank or self._top_rank(card.status, card.category)
+        self.cards[card.id] = card
+        return card
+
+    def update_todo(self, todo: Card, category_name: str = "", **fields):
+        card = self.cards[todo.id]
+        card.category = self._get_or_create_category(category_name)
+        for name, value in fields.items():
+            setattr(card, name, value)
+
+    def delete_todo(self, todo: Card):
+        card = self.cards.pop(todo.id, None)
+        if card:
+            self._index_tags(card, [])
+
+    def move_todo(
+        self, todo: Card, above: Optional[Card] = None,
+        below: Optional[Card] = None,
+    ):
+        self.cards[todo.id].rank = todo.rank = rank_between(
+            above.rank if above else None, below.rank if below else None
+        )
+
+    def tag_names(self) -> List[str]:
+        return sorted(self.postings)
+
+    def todo_tag_names(self, todo: Card) -> List[str]:
+        return sorted(self.cards[todo.id].tags)
+
+    def set_tags(self, todo: Card, names: Iterable[str]):
+        self._index_tags(self.cards[todo.id], names)
+
+    def tag_postings(self) -> Dict[str, Set[int]]:
+        return self.postings
+
+    def _index_tags(self, card: Card, names: Iterable[str]):
+        """Replace the tags of a card, keeping the posting lists in sync"""
+        for name in card.tags:
+            self.postings[name].discard(card.id)
+            if not self.postings[name]:
+                del self.postings[name]
+        card.tags = list(dict.fromkeys(names))
+        for name in card.tags:
+            self.postings.setdefault(name, set()).add(card.id)
+
+    def checklist(self, todo: Card) -> List[Tuple[str, bool]]:
+        return list(self.cards[todo.id].checklist)
+
+    def set_checklist(self, todo: Card, items: Iterable[Tuple[str, bool]]):
+        self.cards[todo.id].checklist = [
+            (text, bool(done)) for text, done in items
+        ]
+
+    def checklist_progress(self) -> Dict[int, Tuple[int, int]]:
+        return {
+            card.id: (
+                sum(done for _, done in card.checklist), len(card.checklist)
+            )
+            for card in self.cards.values()
+            if card.checklist
+        }
+
+    def attachments(self, todo: Card) -> List[CardAttachment]:
+        return sorted(
+            self.cards[todo.id].attachments,
+            key=lambda attachment: attachment.name,
+        )
+
+    def add_attachment(
+        self, todo: Card, name: str, digest: str, size: int
+    ) -> CardAttachment:
+        attachment = CardAttachment(name=name, digest=digest, size=size)
+        self.cards[todo.id].attachments.append(attachment)
+        return attachment
+
+    def attachment_digests(self) -> Set[str]:
+        return {
+            attachment.digest
+            for card in self.cards.values()
+            for attachment in card.attachments
+        }
+
+    def promote(self, todo: Card):
+        if todo.status < LAST_STATUS:
+            self._set_status(todo, todo.status + 1)
+
+    def regress(self, todo: Card):
+        if todo.status > FIRST_STATUS:
+            self._set_status(todo, todo.status - 1)
+
+    def _set_status(self, todo: Card, status: int):
+        card = self.cards[todo.id]
+        card.status = todo.status = status
+        card.updated = todo.updated = datetime.now()
+        card.rank = todo.rank = self._top_rank(status, card.category, card)
+
+    def _top_rank(
+        self,
+        status: int,
+        category: Optional[CardCategory],
+        moved: Optional[Card] = None,
+    ) -> str:
+        """A rank above every other card with this status and category"""
+        ranks = [
+            card.rank for card in self.cards.values()
+            if card.status == status and card.category == category
+            and card is not moved
+        ]
+        return rank_between(None, min(ranks) if ranks else None)
+
+    def _get_or_create_category(
+        self, category_name: str
+    ) -> Optional[CardCategory]:
+        if not category_name:
+            return None
+        if category_name not in self.categories:
+            self.categories[category_name] = CardCategory(
+                id=len(self.categories) + 1, name=category_name
+            )
+        return self.categories[category_name]
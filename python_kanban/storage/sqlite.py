@@ -0,0 +1,148 @@
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from python_kanban.dependencies import DependencyGraph
+from python_kanban.models import (
+    Attachment, BoardRevision, Category, ChecklistItem, Tag, Todo,
+    TodoDependency, TodoStats, create_tables,
+)
+from python_kanban.sorting import DEFAULT_SORT_MODE
+from python_kanban.storage.base import Repository
+
+
+class SqliteRepository(Repository):
+    """Thin wrapper around the peewee models"""
+
+    def __init__(self) -> None:
+        self._postings: Optional[Dict[str, Set[int]]] = None
+        self._graph: Optional[DependencyGraph] = None
+        # Board revision the caches are up to date with. Another one means
+        # changes from elsewhere.
+        self._revision: Optional[int] = None
+
+    def setup(self):
+        create_tables()
+
+    def revision(self) -> int:
+        return BoardRevision.current()
+
+    def _forget_changes_from_elsewhere(self):
+        revision = BoardRevision.current()
+        if revision != self._revision:
+            self._postings = None
+            self._graph = None
+            self._revision = revision
+
+    @contextmanager
+    def _writing(self):
+        """Changes made inside are kept in the caches, unless they already
+        missed changes from elsewhere
+        """
+        up_to_date = BoardRevision.current() == self._revision
+        yield
+        if up_to_date:
+            self._revision = BoardRevision.current()
+
+    def dependency_graph(self) -> DependencyGraph:
+        """Read once, then updated with each change of status or deletion
+        made through this repository. Read again after other changes.
+        """
+        self._forget_changes_from_elsewhere()
+        if self._graph is None:
+            self._graph = TodoDependency.graph()
+        return self._graph
+
+    def count_todos(self) -> int:
+        return TodoStats.total()
+
+    def group_todos_per_status(
+        self, sort_mode: str = DEFAULT_SORT_MODE
+    ) -> Dict[int, List[Todo]]:
+        return Todo.group_todos_per_status(sort_mode)
+
+    def category_names(self) -> List[str]:
+        return [category.name for category in Category.select(Category.name)]
+
+    def create_todo(self, category_name: str = "", **fields) -> Todo:
+        with self._writing():
+            return Todo.create_todo_with_category(
+                category_name=category_name, **fields
+            )
+
+    def update_todo(self, todo: Todo, category_name: str = "", **fields):
+        with self._writing():
+            Todo.update_todo_with_category(
+                todo, category_name=category_name, **fields
+            )
+        if "status" in fields:
+            self._graph = None
+
+    def delete_todo(self, todo: Todo):
+        with self._writing():
+            todo.delete_instance()
+        self._postings = None
+        if self._graph is not None:
+            self._graph.discard(todo.id)
+
+    def move_todo(
+        self, todo: Todo, above: Optional[Todo] = None,
+        below: Optional[Todo] = None,
+    ):
+        with self._writing():
+            todo.move_between(above, below)
+
+    def tag_names(self) -> List[str]:
+        return [tag.name for tag in Tag.select(Tag.name).order_by(Tag.name)]
+
+    def todo_tag_names(self, todo: Todo) -> List[str]:
+        return todo.tag_names()
+
+    def set_tags(self, todo: Todo, names: Iterable[str]):
+        with self._writing():
+            todo.set_tags(names)
+        self._postings = None
+
+    def tag_postings(self) -> Dict[str, Set[int]]:
+        """Cached until tags are changed, through this repository or not"""
+        self._forget_changes_from_elsewhere()
+        if self._postings is None:
+            self._postings = Tag.postings()
+        return self._postings
+
+    def checklist(self, todo: Todo) -> List[Tuple[str, bool]]:
+        return [
+            (item.text, item.done) for item in ChecklistItem.items_of(todo)
+        ]
+
+    def set_checklist(self, todo: Todo, items: Iterable[Tuple[str, bool]]):
+        ChecklistItem.replace_items(todo, items)
+
+    def checklist_progress(self) -> Dict[int, Tuple[int, int]]:
+        return ChecklistItem.progress()
+
+    def attachments(self, todo: Todo) -> List[Attachment]:
+        return Attachment.files_of(todo)
+
+    def add_attachment(
+        self, todo: Todo, name: str, digest: str, size: int
+    ) -> Attachment:
+        return Attachment.create(
+            todo=todo.id, name=name, digest=digest, size=size
+        )
+
+    def attachment_digests(self) -> Set[str]:
+        return Attachment.digests()
+
+    def promote(self, todo: Todo):
+        with self._writing():
+            todo.promote()
+        self._status_changed(todo)
+
+    def regress(self, todo: Todo):
+        with self._writing():
+            todo.regress()
+        self._status_changed(todo)
+
+    def _status_changed(self, todo: Todo):
+        if self._graph is not None:
+            self._graph.set_done(todo.id, todo.status == Todo.CHOICES[-1][0])
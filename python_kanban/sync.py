@@ -0,0 +1,263 @@
+"""
+Synchronization of two copies of the board, e.g. a laptop copy used offline
+and a shared one.
+
+Rows are matched by their `uuid`, since autoincrement ids differ between
+copies. Every change stores the board revision in the changed row (or in a
+`Tombstone` for deletions), and each copy remembers in `SyncState` the
+revisions of both boards at the end of their last sync. Hence only the rows
+changed since then are read, compared and written.
+
+When the same todo changed on both sides, the copy with the latest `updated`
+time wins, a deletion counting as changed at the time it happened. On a tie,
+e.g. when neither side moved the card, the local copy wins. Categories have no
+modification time: when both sides changed one, the local copy wins too, and
+categories created on both sides with the same name become one.
+
+The other copy must exist, so that a mistyped path does not quietly become a
+new board. A new copy starts empty, e.g. with
+`python_kanban --db /media/usb/kanban.db sync kanban.db`.
+"""
+import os
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, NamedTuple, Optional, Tuple
+
+import peewee as pw
+
+from python_kanban.models import (
+    MODELS, BoardRevision, Category, SyncState, Todo, Tombstone,
+    create_tables,
+)
+
+
+TODO_FIELDS = (
+    "title", "body", "status", "created", "updated", "rank", "due", "priority"
+)
+
+
+class Changes(NamedTuple):
+    """Rows changed since a revision, keyed by uuid"""
+
+    categories: Dict[str, dict]
+    todos: Dict[str, dict]
+    # uuid: (table name, deletion time)
+    deleted: Dict[str, Tuple[str, datetime]]
+
+
+class SyncResult(NamedTuple):
+    sent: int
+    received: int
+
+
+@contextmanager
+def _bound(database: pw.Database) -> Iterator[None]:
+    with database.bind_ctx(MODELS):
+        yield
+
+
+def _changes(since: int) -> Changes:
+    categories = {
+        row["uuid"]: row
+        for row in Category.select(Category.uuid, Category.name)
+        .where(Category.revision > since)
+        .dicts()
+    }
+    todos = {
+        row["uuid"]: row
+        for row in Todo.select(
+            Todo.uuid,
+            *(getattr(Todo, field) for field in TODO_FIELDS),
+            Category.uuid.alias("category_uuid"),
+        )
+        .join(Category, pw.JOIN.LEFT_OUTER, on=(Todo.category == Category.id))
+        .where(Todo.revision > since)
+        .dicts()
+    }
+    deleted = {
+        uuid: (table_name, deleted_time)
+        for uuid, table_name, deleted_time in Tombstone.select(
+            Tombstone.uuid, Tombstone.table_name, Tombstone.deleted
+        )
+        .where(Tombstone.revision > since)
+        .tuples()
+    }
+    return Changes(categories, todos, deleted)
+
+
+def _last_change(changes: Changes, uuid: str) -> Optional[datetime]:
+    if uuid in changes.todos:
+        return changes.todos[uuid]["updated"]
+    if uuid in changes.deleted:
+        return changes.deleted[uuid][1]
+    return None
+
+
+def _winning_changes(
+    incoming: Changes, local: Changes, incoming_is_local_board: bool
+) -> Changes:
+    """Keep the incoming changes that must be applied to the other side.
+    `incoming_is_local_board` tells which side wins the ties.
+    """
+    category_table = Category._meta.table_name
+
+    def category_wins(uuid: str) -> bool:
+        conflict = uuid in local.categories or uuid in local.deleted
+        return incoming_is_local_board or not conflict
+
+    def todo_wins(uuid: str) -> bool:
+        local_time = _last_change(local, uuid)
+        incoming_time = _last_change(incoming, uuid)
+        if local_time is None or incoming_time is None:
+            return True
+        if incoming_time == local_time:
+            return incoming_is_local_board
+        return incoming_time > local_time
+
+    return Changes(
+        categories={
+            uuid: row
+            for uuid, row in incoming.categories.items()
+            if category_wins(uuid)
+        },
+        todos={
+            uuid: row
+            for uuid, row in incoming.todos.items()
+            if todo_wins(uuid)
+        },
+        deleted={
+            uuid: deletion
+            for uuid, deletion in incoming.deleted.items()
+            if (
+                category_wins(uuid)
+                if deletion[0] == category_table
+                else todo_wins(uuid)
+            )
+        },
+    )
+
+
+def _apply(changes: Changes) -> int:
+    """Write the changes in the bound database. Return the number of rows
+    written.
+    """
+    category_ids = {}
+    for uuid, row in changes.categories.items():
+        category = Category.get_or_none(Category.uuid == uuid)
+        same_name = Category.get_or_none(
+            (Category.name == row["name"]) & (Category.uuid != uuid)
+        )
+        if same_name is not None and category is not None:
+            # Renamed like another category: merged as `Category.rename` does
+            Category.merge([category], same_name)
+            category_ids[uuid] = same_name.id
+        elif same_name is not None:
+            # Created on both sides: the smallest uuid is kept on both
+            if uuid < same_name.uuid:
+                same_name.uuid = uuid
+                same_name.save()
+            category_ids[uuid] = same_name.id
+        elif category is not None:
+            category.name = row["name"]
+            category.save()
+            category_ids[uuid] = category.id
+        else:
+            category_ids[uuid] = Category.insert(
+                uuid=uuid, name=row["name"]
+            ).execute()
+
+    for uuid, row in changes.todos.items():
+        category_uuid = row["category_uuid"]
+        if category_uuid is None:
+            category_id = None
+        elif category_uuid in category_ids:
+            category_id = category_ids[category_uuid]
+        else:
+            category_id = (
+                Category.select(Category.id)
+                .where(Category.uuid == category_uuid)
+                .scalar()
+            )
+        fields = {field: row[field] for field in TODO_FIELDS}
+        updated_rows = Todo.update(category=category_id, **fields).where(
+            Todo.uuid == uuid
+        ).execute()
+        if not updated_rows:
+            Todo.insert(uuid=uuid, category=category_id, **fields).execute()
+        # A deletion undone by a later change on the other side
+        Tombstone.delete().where(Tombstone.uuid == uuid).execute()
+
+    deleted_todos = [
+        uuid for uuid, (table_name, _) in changes.deleted.items()
+        if table_name == Todo._meta.table_name
+    ]
+    deleted_categories = [
+        uuid for uuid, (table_name, _) in changes.deleted.items()
+        if table_name == Category._meta.table_name
+    ]
+    if deleted_todos:
+        Todo.delete().where(Todo.uuid.in_(deleted_todos)).execute()
+    if deleted_categories:
+        removed = Category.select(Category.id).where(
+            Category.uuid.in_(deleted_categories)
+        )
+        # Todos moved to such a category on this side only lose it
+        Todo.update(category=None).where(
+            Todo.category.in_(removed)
+        ).execute()
+        Category.delete().where(
+            Category.uuid.in_(deleted_categories)
+        ).execute()
+
+    return len(changes.categories) + len(changes.todos) + len(changes.deleted)
+
+
+def _save_state(peer_uuid: str, local_revision: int, peer_revision: int):
+    SyncState.insert(
+        peer_uuid=peer_uuid,
+        local_revision=local_revision,
+        peer_revision=peer_revision,
+        synced=datetime.now(),
+    ).on_conflict_replace().execute()
+
+
+def sync(peer_path: str) -> SyncResult:
+    """Merge the board in `peer_path` with the current one, both ways"""
+    if not os.path.exists(peer_path):
+        raise ValueError("No such board")
+    local_database = Todo._meta.database
+    peer_database = pw.SqliteDatabase(peer_path)
+    try:
+        with _bound(peer_database):
+            create_tables()
+            peer_uuid = BoardRevision.board_uuid()
+
+        local_uuid = BoardRevision.board_uuid()
+        if local_uuid == peer_uuid:
+            raise ValueError("Cannot synchronize a board with itself")
+        state = SyncState.get_or_none(SyncState.peer_uuid == peer_uuid)
+        local_since = state.local_revision if state else 0
+        peer_since = state.peer_revision if state else 0
+
+        local_changes = _changes(local_since)
+        with _bound(peer_database):
+            peer_changes = _changes(peer_since)
+
+        with local_database.atomic(), peer_database.atomic():
+            with _bound(peer_database):
+                sent = _apply(
+                    _winning_changes(local_changes, peer_changes, True)
+                )
+                peer_revision = BoardRevision.current()
+            received = _apply(
+                _winning_changes(peer_changes, local_changes, False)
+            )
+            local_revision = BoardRevision.current()
+
+            _save_state(peer_uuid, local_revision, peer_revision)
+            with _bound(peer_database):
+                _save_state(local_uuid, peer_revision, local_revision)
+    finally:
+        peer_database.close()
+
+    return SyncResult(sent=sent, received=received)
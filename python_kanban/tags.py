@@ -0,0 +1,71 @@
+"""
+Tag parsing and filtering.
+
+Tags are typed as a list separated by commas or spaces. Filters are typed the
+same way: todos must have every tag of the filter, and alternatives are
+separated by "|". For instance "bug ui|ux" keeps the todos tagged "bug" and
+either "ui" or "ux".
+
+Filters are evaluated with set operations over posting lists, the ids of the
+todos with each tag, which are read once and cached by the repository.
+"""
+import re
+from typing import Dict, List, Optional, Set
+
+from python_kanban.models import Tag
+
+
+TAG_SEPARATORS = re.compile(r"[\s,]+")
+ALTERNATIVE_SEPARATOR = "|"
+SPACED_ALTERNATIVES = re.compile(r"\s*\|\s*")
+
+
+def parse_tags(text: str) -> List[str]:
+    """Tag names in the order they were typed, without duplicates"""
+    names: Dict[str, None] = {}
+    for name in TAG_SEPARATORS.split(text):
+        if name:
+            names[name] = None
+    return list(names)
+
+
+def format_tags(names: List[str]) -> str:
+    return ", ".join(names)
+
+
+def tags_are_valid(text: str) -> bool:
+    return all(
+        len(name) <= Tag.name.max_length and ALTERNATIVE_SEPARATOR not in name
+        for name in parse_tags(text)
+    )
+
+
+def parse_filter(text: str) -> List[List[str]]:
+    """Groups of alternative tags, every group being required"""
+    return [
+        [name for name in group.split(ALTERNATIVE_SEPARATOR) if name]
+        for group in parse_tags(SPACED_ALTERNATIVES.sub("|", text))
+        if group.strip(ALTERNATIVE_SEPARATOR)
+    ]
+
+
+def filter_todo_ids(
+    postings: Dict[str, Set[int]], text: str
+) -> Optional[Set[int]]:
+    """Ids of the todos matching the filter, `None` if there is no filter"""
+    groups = parse_filter(text)
+    if not groups:
+        return None
+
+    matches = [
+        set().union(*(postings.get(name, set()) for name in group))
+        for group in groups
+    ]
+    # Starting with the smallest set keeps every intersection small
+    matches.sort(key=len)
+    result = matches[0]
+    for match in matches[1:]:
+        if not result:
+            break
+        result &= match
+    return result
@@ -1,4 +1,5 @@
 """This view is used to create a new task"""
+from datetime import date
 from typing import Optional, TYPE_CHECKING
 
 from prompt_toolkit import HTML
@@ -14,10 +15,12 @@ from prompt_toolkit.layout.containers import (
 )
 from prompt_toolkit.layout.controls import BufferControl
 from prompt_toolkit.validation import Validator
-from prompt_toolkit.widgets import Box, Button, Frame, Label
+from prompt_toolkit.widgets import Box, Button, Frame, Label, RadioList
 from prompt_toolkit.filters import Condition
 
-from python_kanban.models import Category, Todo
+from python_kanban.models import Category, Tag, Todo
+from python_kanban.storage import get_repository
+from python_kanban.tags import parse_tags, tags_are_valid
 
 
 if TYPE_CHECKING:
@@ -38,18 +41,39 @@ class AddTaskView:
     def load_view(self):
         title_row = self._get_title_row()
         category_row = self._get_category_row()
+        planning_row = self._get_planning_row()
         body_row = self._get_body_row()
         buttons_row = self._get_buttons_row()
         help_text_row = self._get_help_text_row()
 
         root_container = HSplit(
-            [title_row, category_row, body_row, buttons_row, help_text_row]
+            [
+                title_row,
+                category_row,
+                planning_row,
+                body_row,
+                buttons_row,
+                help_text_row,
+            ]
         )
 
         self.layout = Layout(root_container, focused_element=title_row)
 
         return self.layout
 
+    def show(self):
+        """Empty the form to add another task"""
+        self._reset_form()
+
+    def _reset_form(self):
+        for buffer in (
+            self.title_buffer, self.category_buffer, self.due_buffer,
+            self.tags_buffer, self.body_buffer,
+        ):
+            buffer.reset()
+        self.priority_list.current_value = Todo.priority.default
+        self.layout.focus(self.title_buffer)
+
     def _get_title_row(self):
         self.title_buffer = Buffer(
             validator=Validator.from_callable(_title_validator),
@@ -75,10 +99,11 @@ class AddTaskView:
         return Frame(title="Title*", body=title_body, height=5)
 
     def _get_category_row(self):
-        category_names = [
-            category.name for category in Category.select(Category.name)
-        ]
-        category_completer = WordCompleter(category_names)
+        # Words are read when completing, so they stay up to date when the
+        # view is reused
+        category_completer = WordCompleter(
+            lambda: get_repository().category_names()
+        )
         self.category_buffer = Buffer(
             validator=Validator.from_callable(_category_validator),
             multiline=False,
@@ -104,6 +129,60 @@ class AddTaskView:
 
         return Frame(title="Category", body=category_body, height=5)
 
+    def _get_planning_row(self):
+        """Due date and priority, side by side"""
+        self.due_buffer = Buffer(
+            validator=Validator.from_callable(_due_validator),
+            multiline=False,
+        )
+        wrong_due_filter = Condition(lambda: not self.due_buffer.validate())
+        due_body = HSplit(
+            [
+                Window(content=BufferControl(buffer=self.due_buffer)),
+                ConditionalContainer(
+                    content=Label(
+                        HTML("<ansired>Use the YYYY-MM-DD format</ansired>")
+                    ),
+                    filter=wrong_due_filter,
+                ),
+            ]
+        )
+
+        self.priority_list = RadioList(values=list(Todo.PRIORITIES))
+        self.priority_list.current_value = Todo.priority.default
+
+        self.tags_buffer = Buffer(
+            validator=Validator.from_callable(tags_are_valid),
+            multiline=False,
+            completer=WordCompleter(lambda: get_repository().tag_names()),
+            complete_while_typing=True,
+        )
+        wrong_tags_filter = Condition(lambda: not self.tags_buffer.validate())
+        tags_body = HSplit(
+            [
+                Window(content=BufferControl(buffer=self.tags_buffer)),
+                ConditionalContainer(
+                    content=Label(
+                        HTML(
+                            "<ansired>Tags cannot contain \"|\" nor be "
+                            f"larger than {Tag.name.max_length} "
+                            "characters</ansired>"
+                        )
+                    ),
+                    filter=wrong_tags_filter,
+                ),
+            ]
+        )
+
+        return VSplit(
+            [
+                Frame(title="Due date (YYYY-MM-DD)", body=due_body),
+                Frame(title="Priority", body=self.priority_list),
+                Frame(title="Tags (separated by commas)", body=tags_body),
+            ],
+            height=5,
+        )
+
     def _get_body_row(self):
         self.body_buffer = Buffer()
 
@@ -140,25 +219,41 @@ class AddTaskView:
             return
 
         # If everything is o.k., create a new Todo
-        Todo.create_todo_with_category(
+        repository = get_repository()
+        todo = repository.create_todo(
             title=self.title_buffer.text,
             body=self.body_buffer.text,
             category_name=self.category_buffer.text,
+            **self._planning_fields(),
         )
+        tags = parse_tags(self.tags_buffer.text)
+        if tags:
+            repository.set_tags(todo, tags)
 
         if self.app:
             self.app.load_list_tasks_view()
 
+    def _planning_fields(self):
+        return {
+            "due": _parse_due(self.due_buffer.text),
+            "priority": self.priority_list.current_value,
+        }
+
     def _is_valid_form(self):
         """Return `True` if all required buffers are valid"""
-        return self.title_buffer.validate() and self.category_buffer.validate()
+        return (
+            self.title_buffer.validate()
+            and self.category_buffer.validate()
+            and self.due_buffer.validate()
+            and self.tags_buffer.validate()
+        )
 
     def _cancel(self):
         """
         Main app should call `load_list_tasks_view` without creating anything
         """
         if self.app:
-            self.app.load_list_tasks_view()
+            self.app.load_list_tasks_view(refresh=False)
 
 
 def _title_validator(text):
@@ -167,3 +262,15 @@ def _title_validator(text):
 
 def _category_validator(text):
     return len(text) <= Category.name.max_length
+
+
+def _parse_due(text: str) -> Optional[date]:
+    return date.fromisoformat(text.strip()) if text.strip() else None
+
+
+def _due_validator(text):
+    try:
+        _parse_due(text)
+    except ValueError:
+        return False
+    return True
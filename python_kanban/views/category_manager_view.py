@@ -0,0 +1,237 @@
+"""
+View to manage categories: see how many tasks each one has, rename them,
+merge several into one and delete the unused ones.
+"""
+from typing import Optional, TYPE_CHECKING
+
+from prompt_toolkit import HTML
+from prompt_toolkit.buffer import Buffer
+from prompt_toolkit.filters import Condition
+from prompt_toolkit.formatted_text import merge_formatted_text
+from prompt_toolkit.key_binding import KeyBindings
+from prompt_toolkit.layout.containers import (
+    ConditionalContainer, HSplit, Window
+)
+from prompt_toolkit.layout.controls import BufferControl, FormattedTextControl
+from prompt_toolkit.layout.layout import Layout
+from prompt_toolkit.widgets import Frame, Label
+
+from python_kanban.models import Category
+
+
+if TYPE_CHECKING:
+    # Import here to prevent a circular import
+    from python_kanban.app import KanbanApplication
+
+
+class CategoryManagerView:
+    HELP_TEXT = (
+        "Navigate with j, k or arrow keys. Press \"space\" to mark a "
+        "category, \"r\" to rename the selected one and \"m\" to merge the "
+        "marked ones into the selected one.\n"
+        "Press \"x\" to delete the marked categories without tasks (or all of "
+        "them if none is marked). Use \"q\" or \"Esc\" to go back."
+    )
+
+    def __init__(self, app: Optional["KanbanApplication"] = None):
+        self.app = app
+        self.load_view()
+
+    def load_view(self):
+        self.categories = Category.with_todo_counts()
+        self.selected_line = 0
+        self.marked = set()
+        self.renaming = False
+
+        self.list_window = Window(
+            content=FormattedTextControl(
+                text=self._get_formatted_text, focusable=True
+            ),
+            cursorline=True,
+        )
+        self.rename_buffer = Buffer(
+            multiline=False, accept_handler=self._accept_rename
+        )
+        self.rename_window = Window(
+            content=BufferControl(buffer=self.rename_buffer), height=1
+        )
+        wrong_name_message = HTML(
+            "<ansired>Name cannot be empty nor larger than "
+            f"{Category.name.max_length} characters</ansired>"
+        )
+
+        root_container = HSplit([
+            Frame(title="Categories", body=self.list_window),
+            ConditionalContainer(
+                content=Frame(
+                    title="New name",
+                    body=HSplit([
+                        self.rename_window,
+                        ConditionalContainer(
+                            content=Label(wrong_name_message),
+                            filter=Condition(
+                                lambda: not _name_validator(
+                                    self.rename_buffer.text
+                                )
+                            ),
+                        ),
+                    ]),
+                ),
+                filter=Condition(lambda: self.renaming),
+            ),
+            Label(text=self.HELP_TEXT),
+        ])
+
+        self.layout = Layout(root_container, focused_element=self.list_window)
+
+        return self.layout
+
+    def _get_formatted_text(self):
+        if not self.categories:
+            return "No categories yet."
+
+        result = []
+        for i, category in enumerate(self.categories):
+            if i == self.selected_line:
+                result.append([("[SetCursorPosition]", "")])
+
+            mark = "x" if category.id in self.marked else " "
+            result.append(f"[{mark}] ")
+            result.append(HTML("<bold>{}</bold>").format(category.name))
+            result.append(f" ({category.todo_count})\n")
+
+        return merge_formatted_text(result)
+
+    def load_key_bindings(self):  # noqa
+        kb = KeyBindings()
+        browsing = Condition(lambda: not self.renaming)
+
+        @kb.add("k", filter=browsing)
+        @kb.add("up", filter=browsing)
+        def go_up(event):
+            if self.categories:
+                self.selected_line = (
+                    (self.selected_line - 1) % len(self.categories)
+                )
+
+        @kb.add("j", filter=browsing)
+        @kb.add("down", filter=browsing)
+        def go_down(event):
+            if self.categories:
+                self.selected_line = (
+                    (self.selected_line + 1) % len(self.categories)
+                )
+
+        @kb.add("space", filter=browsing)
+        def toggle_mark(event):
+            category = self._selected_category()
+            if category:
+                self.marked ^= {category.id}
+
+        @kb.add("r", filter=browsing)
+        def rename(event):
+            category = self._selected_category()
+            if category:
+                self.renaming = True
+                self.rename_buffer.text = category.name
+                self.layout.focus(self.rename_window)
+
+        @kb.add("m", filter=browsing)
+        def merge(event):
+            self._merge_marked()
+
+        @kb.add("x", filter=browsing)
+        def delete_unused(event):
+            self._delete_unused()
+
+        @kb.add("escape")
+        def cancel(event):
+            if self.renaming:
+                self._stop_renaming()
+            else:
+                self._back()
+
+        @kb.add("q", filter=browsing)
+        def back(event):
+            self._back()
+
+        return kb
+
+    def _selected_category(self) -> Optional[Category]:
+        if not self.categories:
+            return None
+        return self.categories[self.selected_line]
+
+    def _accept_rename(self, buffer: Buffer) -> bool:
+        """Handler for "Enter" in the rename buffer"""
+        self._rename_selected(buffer.text)
+        return False
+
+    def _rename_selected(self, name: str):
+        """Rename the selected category. Invalid names are ignored"""
+        category = self._selected_category()
+        if not category or not _name_validator(name):
+            return
+
+        category.rename(name)
+        self._stop_renaming()
+        self._refresh()
+
+    def _merge_marked(self):
+        """Merge all marked categories into the selected one"""
+        target = self._selected_category()
+        if not target or not self.marked:
+            return
+
+        Category.merge(
+            [
+                category for category in self.categories
+                if category.id in self.marked
+            ],
+            target=target,
+        )
+        self._refresh(selected_id=target.id)
+
+    def _delete_unused(self):
+        """Delete the marked categories without todos, or all unused ones if
+        nothing is marked
+        """
+        candidates = (
+            [
+                category for category in self.categories
+                if category.id in self.marked
+            ]
+            if self.marked
+            else None
+        )
+        Category.delete_unused(candidates)
+        self._refresh()
+
+    def _stop_renaming(self):
+        self.renaming = False
+        self.rename_buffer.reset()
+        self.layout.focus(self.list_window)
+
+    def _refresh(self, selected_id: Optional[int] = None):
+        """Reload the categories, keeping the selection when possible"""
+        if selected_id is None:
+            current = self._selected_category()
+            selected_id = current.id if current else None
+
+        self.categories = Category.with_todo_counts()
+        self.marked = set()
+        self.selected_line = next(
+            (
+                i for i, category in enumerate(self.categories)
+                if category.id == selected_id
+            ),
+            min(self.selected_line, max(len(self.categories) - 1, 0)),
+        )
+
+    def _back(self):
+        if self.app:
+            self.app.load_list_tasks_view()
+
+
+def _name_validator(text):
+    return 0 < len(text) <= Category.name.max_length
@@ -0,0 +1,143 @@
+"""
+View with a cumulative flow diagram: how many tasks were in each status at the
+end of every day, stacked with "Done" at the bottom.
+"""
+from datetime import date
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from prompt_toolkit.application.current import get_app
+from prompt_toolkit.key_binding import KeyBindings
+from prompt_toolkit.layout.containers import HSplit, Window
+from prompt_toolkit.layout.controls import FormattedTextControl
+from prompt_toolkit.layout.layout import Layout
+from prompt_toolkit.widgets import Frame, Label
+
+from python_kanban.models import Todo
+from python_kanban.reports import daily_flow
+
+
+if TYPE_CHECKING:
+    # Import here to prevent a circular import
+    from python_kanban.app import KanbanApplication
+
+
+STATUS_STYLES = {0: "fg:ansiblue", 1: "fg:ansiyellow", 2: "fg:ansigreen"}
+BLOCK = "█"
+
+# Rows and columns taken by the frame, the legend and the help text
+VERTICAL_MARGIN = 6
+HORIZONTAL_MARGIN = 2
+
+
+class CumulativeFlowView:
+    HELP_TEXT = "Press \"q\" or \"Esc\" to go back to the tasks."
+
+    def __init__(self, app: Optional["KanbanApplication"] = None):
+        self.app = app
+        self.load_view()
+
+    def load_view(self):
+        self.flow = daily_flow()
+        self._chart_cache: Dict[Tuple[int, int], list] = {}
+
+        legend = [
+            fragment
+            for status, name in Todo.CHOICES
+            for fragment in (
+                (STATUS_STYLES[status], BLOCK), ("", f" {name}   ")
+            )
+        ]
+        root_container = HSplit([
+            Frame(
+                title="Cumulative flow",
+                body=Window(
+                    content=FormattedTextControl(text=self._get_chart_text)
+                ),
+            ),
+            Label(text=legend),
+            Label(text=self.HELP_TEXT),
+        ])
+        self.layout = Layout(root_container)
+
+        return self.layout
+
+    def _get_chart_text(self):
+        """The chart fills the screen. It is only recomputed when the terminal
+        is resized.
+        """
+        if not self.flow:
+            return "No history yet."
+
+        size = get_app().output.get_size()
+        dimensions = (
+            max(size.columns - HORIZONTAL_MARGIN, 10),
+            max(size.rows - VERTICAL_MARGIN, 3),
+        )
+        if dimensions not in self._chart_cache:
+            self._chart_cache[dimensions] = render_chart(
+                self.flow, *dimensions
+            )
+        return self._chart_cache[dimensions]
+
+    def load_key_bindings(self):
+        kb = KeyBindings()
+
+        @kb.add("q")
+        @kb.add("escape")
+        def back(event):
+            if self.app:
+                self.app.load_list_tasks_view()
+
+        return kb
+
+
+def render_chart(
+    flow: List[Tuple[date, Dict[int, int]]], width: int, height: int
+) -> List[Tuple[str, str]]:
+    """Draw a stacked area chart as formatted text fragments.
+    When there are more days than columns, each column shows the last day of
+    its period.
+    """
+    max_total = max(sum(counts.values()) for _, counts in flow) or 1
+    axis_width = len(str(max_total)) + 1
+    plot_width = max(width - axis_width, 1)
+
+    columns = len(flow) if len(flow) <= plot_width else plot_width
+    sampled = [
+        flow[-(-(i + 1) * len(flow) // columns) - 1][1]
+        for i in range(columns)
+    ]
+
+    # Upper bound of each status band in each column, "Done" at the bottom
+    bands = []
+    for counts in sampled:
+        upper_bounds = []
+        total = 0
+        for status, _ in reversed(Todo.CHOICES):
+            total += counts[status]
+            upper_bounds.append((total, status))
+        bands.append(upper_bounds)
+
+    fragments: List[Tuple[str, str]] = []
+    for row in range(height - 1, -1, -1):
+        label = str(max_total) if row == height - 1 else (
+            "0" if row == 0 else ""
+        )
+        fragments.append(("", label.rjust(axis_width - 1) + "|"))
+        level = (row + 0.5) * max_total / height
+        for upper_bounds in bands:
+            band = next(
+                (status for bound, status in upper_bounds if level < bound),
+                None,
+            )
+            fragments.append(
+                (STATUS_STYLES[band], BLOCK) if band is not None else ("", " ")
+            )
+        fragments.append(("", "\n"))
+
+    first_day, last_day = flow[0][0].isoformat(), flow[-1][0].isoformat()
+    padding = max(columns - len(first_day) - len(last_day), 1)
+    fragments.append(
+        ("", " " * axis_width + first_day + " " * padding + last_day)
+    )
+    return fragments
@@ -6,6 +6,7 @@ from prompt_toolkit.layout.containers import HSplit, VSplit
 from prompt_toolkit.layout.layout import Layout
 
 from python_kanban.models import Todo
+from python_kanban.storage import get_repository
 from python_kanban.views.add_task_view import AddTaskView
 
 
@@ -35,12 +36,18 @@ class DeleteTaskView(AddTaskView):
         )
 
         self.layout = Layout(root_container, focused_element=buttons_row)
+        self.buttons_row = buttons_row
 
         return self.layout
 
+    def show(self, todo: Todo):  # type: ignore[override]
+        """Ask about another todo"""
+        self.todo = todo
+        self.layout.focus(self.buttons_row)
+
     def _get_message_row(self):
         dialog_text = Label(text="Are you sure you want to delete:")
-        todo_text = Label(text=f"\"{self.todo.title}\"?")
+        todo_text = Label(text=lambda: f"\"{self.todo.title}\"?")
 
         return Box(
             body=HSplit(
@@ -60,6 +67,6 @@ class DeleteTaskView(AddTaskView):
         )
 
     def _delete(self):
-        self.todo.delete_instance()
+        get_repository().delete_todo(self.todo)
         if self.app:
             self.app.load_list_tasks_view()
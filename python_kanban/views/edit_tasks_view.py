@@ -4,12 +4,18 @@ more info.
 """
 from typing import Optional, TYPE_CHECKING
 
-from prompt_toolkit.layout.containers import HSplit, VSplit
+from prompt_toolkit.buffer import Buffer
+from prompt_toolkit.layout.containers import HSplit, VSplit, Window
+from prompt_toolkit.layout.controls import BufferControl
 from prompt_toolkit.layout.layout import Layout
 
+from python_kanban.attachments import format_size
+from python_kanban.checklists import format_checklist, parse_checklist
 from python_kanban.views.add_task_view import AddTaskView
 from python_kanban.models import Todo
-from prompt_toolkit.widgets import Box, Button, Label
+from python_kanban.storage import get_repository
+from python_kanban.tags import format_tags, parse_tags
+from prompt_toolkit.widgets import Box, Button, Frame, Label
 
 
 if TYPE_CHECKING:
@@ -26,7 +32,10 @@ class EditTaskView(AddTaskView):
     def load_view(self):
         title_row = self._get_title_row()
         category_row = self._get_category_row()
+        planning_row = self._get_planning_row()
         body_row = self._get_body_row()
+        checklist_row = self._get_checklist_row()
+        attachments_row = self._get_attachments_row()
         buttons_row = self._get_buttons_row()
         info_row = self._get_info_row()
         help_text_row = self._get_help_text_row()
@@ -35,7 +44,10 @@ class EditTaskView(AddTaskView):
             [
                 title_row,
                 category_row,
+                planning_row,
                 body_row,
+                checklist_row,
+                attachments_row,
                 buttons_row,
                 info_row,
                 help_text_row
@@ -48,6 +60,27 @@ class EditTaskView(AddTaskView):
 
         return self.layout
 
+    def show(self, todo: Todo):  # type: ignore[override]
+        """Fill the form with another todo"""
+        self.todo = todo
+        self._reset_form()
+        self._populate_fields()
+
+    def _get_checklist_row(self):
+        self.checklist_buffer = Buffer()
+
+        return Frame(
+            title="Checklist (one item per line, [x] when done)",
+            body=Window(content=BufferControl(buffer=self.checklist_buffer)),
+        )
+
+    def _get_attachments_row(self):
+        """Names and sizes of the attached files. Files are attached with
+        the "attachments" command.
+        """
+        self.attachments_label = Label(text="")
+        return Frame(title="Attachments", body=self.attachments_label)
+
     def _get_buttons_row(self):
         add_button = Button(text="Save", handler=self._update)
         cancel_button = Button(text="Cancel", handler=self._cancel)
@@ -61,8 +94,10 @@ class EditTaskView(AddTaskView):
 
     def _get_info_row(self):
         """Return time info about the task"""
-        created_at = Label(text=f"Created at {self.todo.created}")
-        updated_at = Label(text=f"Last updated at {self.todo.updated}")
+        created_at = Label(text=lambda: f"Created at {self.todo.created}")
+        updated_at = Label(
+            text=lambda: f"Last updated at {self.todo.updated}"
+        )
         return Box(
             body=VSplit(
                 [created_at, updated_at], align="CENTER", padding=3
@@ -77,7 +112,21 @@ class EditTaskView(AddTaskView):
             if self.todo.category
             else ""
         )
-        self.body_buffer.text = self.todo.body
+        self.body_buffer.text = self.todo.body or ""
+        self.due_buffer.text = (
+            self.todo.due.isoformat() if self.todo.due else ""
+        )
+        self.priority_list.current_value = self.todo.priority
+        self.tags_buffer.text = format_tags(
+            get_repository().todo_tag_names(self.todo)
+        )
+        self.checklist_buffer.text = format_checklist(
+            get_repository().checklist(self.todo)
+        )
+        self.attachments_label.text = "\n".join(
+            f"{attachment.name} ({format_size(attachment.size)})"
+            for attachment in get_repository().attachments(self.todo)
+        ) or "No attachments"
 
     def _update(self):
         """Validate the inputs, save the edited Todo and load the list view"""
@@ -85,11 +134,17 @@ class EditTaskView(AddTaskView):
             return
 
         # If everything is o.k., update the todo
-        Todo.update_todo_with_category(
-            todo=self.todo,
+        repository = get_repository()
+        repository.update_todo(
+            self.todo,
             title=self.title_buffer.text,
             body=self.body_buffer.text,
             category_name=self.category_buffer.text,
+            **self._planning_fields(),
+        )
+        repository.set_tags(self.todo, parse_tags(self.tags_buffer.text))
+        repository.set_checklist(
+            self.todo, parse_checklist(self.checklist_buffer.text)
         )
 
         if self.app:
@@ -1,15 +1,30 @@
 """Main view where the user can see and manipulate existing tasks"""
-from typing import Optional, TYPE_CHECKING
+from functools import partial
+from typing import (
+    AbstractSet, Any, Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+)
 
 from prompt_toolkit import HTML
-from prompt_toolkit.key_binding import KeyBindings
-from prompt_toolkit.keys import Keys
-from prompt_toolkit.layout.dimension import D
+from prompt_toolkit.buffer import Buffer
+from prompt_toolkit.filters import Condition
+from prompt_toolkit.key_binding import ConditionalKeyBindings, KeyBindings
+from prompt_toolkit.layout.dimension import D, Dimension
 from prompt_toolkit.layout.layout import Layout
-from prompt_toolkit.layout.containers import HSplit, VSplit
+from prompt_toolkit.layout.containers import (
+    ConditionalContainer, HSplit, VSplit, Window
+)
+from prompt_toolkit.layout.controls import BufferControl, FormattedTextControl
 from prompt_toolkit.widgets import Frame, Label
 
-from python_kanban.models import Todo
+from python_kanban.columns import validate_column_weights
+from python_kanban.keymap import add_action
+from python_kanban.models import Todo, TodoStats
+from python_kanban.preview import PreviewCache
+from python_kanban.sorting import (
+    SORT_MODES, next_sort_mode, validate_sort_mode
+)
+from python_kanban.storage import get_repository
+from python_kanban.tags import filter_todo_ids
 from python_kanban.views.status_container_view import StatusContainer
 
 
@@ -22,34 +37,102 @@ class ListTasksView:
     HELP_TEXT = (
         "Navigate along tasks with h, j, k, l or usual navigation keys. "
         "Press \"p\" to promote a task and \"r\" to regress it. "
+        "Reorder tasks with \"K\" and \"J\", or \"T\" and \"B\" to move "
+        "them to the top or bottom of their category. "
         "Press \"a\" to add a new task, and \"d\" to delete an existing one.\n"
+        "Press \"c\" to manage categories, \"s\" to toggle statistics, "
+        "\"f\" to see the cumulative flow, \"o\" to change the order, "
+        "\"t\" to filter by tags, \"v\" to preview descriptions and "
+        "\"z\" to show one line per task. "
+        "Jump to a task with \"/\" and the start of its title, or with "
+        "\":\" and its line. "
         "Finally, use \"q\" to quit the application."
     )
 
     def __init__(
         self,
         app: Optional["KanbanApplication"] = None,
-        initial_container_focus: Optional[int] = None
+        initial_container_focus: Optional[int] = None,
+        sort_mode: Optional[str] = None,
+        tag_filter: str = "",
+        column_weights: Optional[Sequence[int]] = None,
+        compact: bool = False,
     ):
         self.app = app
+        self.sort_mode = validate_sort_mode(sort_mode)
+        self.tag_filter = tag_filter
+        self.column_weights = validate_column_weights(column_weights)
+        self.compact = compact
+        self.show_stats = False
+        self.editing_filter = False
+        self.show_preview = False
+        # "title" or "line" while the jump bar is open
+        self.jump_mode: Optional[str] = None
+        self.jump_start = 0
+        self.previews = PreviewCache()
         self.load_view(initial_container_focus=initial_container_focus)
 
     def load_view(self, initial_container_focus: Optional[int] = None):
         """"""
 
-        todo_entries_dict = Todo.group_todos_per_status()
-
+        todo_entries_dict, checklist_progress, blocked = self._read_board()
+        self.columns = {
+            status: StatusContainer(
+                entries=todo_entries,
+                app=self.app,
+                sort_mode=self.sort_mode,
+                on_status_change=self._move_to_column,
+                checklist_progress=checklist_progress,
+                compact=self.compact,
+                blocked=blocked,
+            )
+            for status, todo_entries in todo_entries_dict.items()
+        }
         status_containers = [
             Frame(
-                body=StatusContainer(entries=todo_entries, app=self.app),
+                body=column,
                 title=HTML(f"<bold>{Todo.CHOICES[status][1]}</bold>"),
-                width=D(),
+                # Read at each render, so weights can change with `show`
+                width=partial(self._column_width, status),
             )
-            for status, todo_entries in todo_entries_dict.items()
+            for status, column in self.columns.items()
         ]
 
+        self.stats_text: Optional[str] = None
+        self.stats_label = Label(text=self._get_stats_text)
         root_container = HSplit([
-            VSplit(status_containers), Label(text=self.HELP_TEXT)
+            VSplit(status_containers),
+            HSplit([
+                ConditionalContainer(
+                    content=self._get_filter_bar(),
+                    filter=Condition(
+                        lambda: self.editing_filter or bool(self.tag_filter)
+                    ),
+                ),
+                ConditionalContainer(
+                    content=self._get_jump_bar(),
+                    filter=Condition(lambda: self.jump_mode is not None),
+                ),
+                ConditionalContainer(
+                    content=Frame(
+                        body=Window(
+                            content=FormattedTextControl(
+                                text=self._get_preview_text
+                            ),
+                            height=D(max=10),
+                            wrap_lines=True,
+                        ),
+                        title="Description",
+                    ),
+                    filter=Condition(lambda: self.show_preview),
+                ),
+                ConditionalContainer(
+                    content=Frame(body=self.stats_label, title="Statistics"),
+                    filter=Condition(lambda: self.show_stats),
+                ),
+                Label(text=lambda: f"Order: {SORT_MODES[self.sort_mode]}"),
+                Label(text=self.HELP_TEXT),
+            ]),
         ])
 
         self.layout = Layout(root_container)
@@ -65,6 +148,210 @@ class ListTasksView:
 
         return self.layout
 
+    def show(
+        self,
+        initial_container_focus: Optional[int] = None,
+        sort_mode: Optional[str] = None,
+        tag_filter: str = "",
+        column_weights: Optional[Sequence[int]] = None,
+        compact: bool = False,
+    ):
+        """Read the board again into the existing layout. The selected todo
+        of each column stays selected, and the focus stays on the same
+        column unless another one is given or it became empty.
+        """
+        self.sort_mode = validate_sort_mode(sort_mode)
+        self.tag_filter = tag_filter
+        self.column_weights = validate_column_weights(column_weights)
+        self._set_compact(compact)
+        self.filter_buffer.text = tag_filter
+        todo_entries_dict, checklist_progress, blocked = self._read_board()
+        # Descriptions may have been edited
+        self.previews.clear()
+        for status, column in self.columns.items():
+            column.sort_mode = self.sort_mode
+            column.set_entries(
+                todo_entries_dict[status], checklist_progress, blocked
+            )
+        self.todo_entries_dict = todo_entries_dict
+        self.stats_text = None
+
+        if initial_container_focus:
+            self.focused_element = initial_container_focus
+            self._focus_on_element()
+        elif not self.todo_entries_dict[self.focused_element]:
+            self._focus_on_first_non_empty_container()
+
+    def _column_width(self, status: int) -> Dimension:
+        return D(weight=self.column_weights[status])
+
+    def _set_compact(self, compact: bool):
+        self.compact = compact
+        for column in self.columns.values():
+            column.compact = compact
+
+    def _read_board(
+        self,
+    ) -> Tuple[
+        Dict[int, List[Any]], Dict[int, Tuple[int, int]], AbstractSet[int]
+    ]:
+        """Todos per status matching the tag filter, the progress of their
+        checklists and the ids of the blocked ones
+        """
+        repository = get_repository()
+        todo_entries_dict = repository.group_todos_per_status(self.sort_mode)
+        # Read once for the whole board
+        checklist_progress = repository.checklist_progress()
+        # Kept up to date by the repository as todos change status
+        graph = repository.dependency_graph()
+        blocked = graph.blocked if graph is not None else frozenset()
+        todo_ids = filter_todo_ids(
+            repository.tag_postings(), self.tag_filter
+        )
+        if todo_ids is not None:
+            todo_entries_dict = {
+                status: [todo for todo in todos if todo.id in todo_ids]
+                for status, todos in todo_entries_dict.items()
+            }
+        return todo_entries_dict, checklist_progress, blocked
+
+    def _get_filter_bar(self):
+        self.filter_buffer = Buffer(
+            multiline=False, accept_handler=self._accept_filter
+        )
+        self.filter_buffer.text = self.tag_filter
+
+        kb = KeyBindings()
+
+        @kb.add("escape")
+        def cancel(event):
+            self.filter_buffer.text = self.tag_filter
+            self.editing_filter = False
+            self._focus_on_element()
+
+        self.filter_window = Window(
+            content=BufferControl(buffer=self.filter_buffer, key_bindings=kb),
+            height=1,
+        )
+        return VSplit([
+            Label(
+                text="Filter by tags (\"|\" for or): ",
+                dont_extend_width=True,
+            ),
+            self.filter_window,
+        ])
+
+    def _get_jump_bar(self):
+        """Incremental jump in the focused column, as the text is typed.
+        Enter keeps the selected todo, escape goes back to the previous one.
+        """
+        self.jump_buffer = Buffer(
+            multiline=False,
+            on_text_changed=self._jump,
+            accept_handler=lambda buffer: self._close_jump_bar(),
+        )
+
+        kb = KeyBindings()
+
+        @kb.add("escape")
+        def cancel(event):
+            self.columns[self.focused_element].selected_line = (
+                self.jump_start
+            )
+            self._close_jump_bar()
+
+        self.jump_window = Window(
+            content=BufferControl(buffer=self.jump_buffer, key_bindings=kb),
+            height=1,
+        )
+        return VSplit([
+            Label(
+                text=lambda: f"Jump to {self.jump_mode}: ",
+                dont_extend_width=True,
+            ),
+            self.jump_window,
+        ])
+
+    def _open_jump_bar(self, mode: str):
+        self.jump_mode = mode
+        self.jump_start = self.columns[self.focused_element].selected_line
+        self.jump_buffer.reset()
+        self.layout.focus(self.jump_window)
+
+    def _jump(self, buffer: Buffer):
+        column = self.columns[self.focused_element]
+        text = buffer.text.strip()
+        if not text:
+            column.selected_line = self.jump_start
+        elif self.jump_mode == "title":
+            column.jump_to_title(text, start=self.jump_start)
+        elif text.isdigit():
+            column.jump_to_line(int(text))
+
+    def _close_jump_bar(self) -> bool:
+        self.jump_mode = None
+        self._focus_on_element()
+        return False
+
+    def _accept_filter(self, buffer: Buffer) -> bool:
+        self.tag_filter = buffer.text
+        self.editing_filter = False
+        if self.app:
+            self.app.tag_filter = self.tag_filter
+            self.app.load_list_tasks_view(
+                initial_container_focus=self.focused_element
+            )
+        else:
+            self.show(
+                initial_container_focus=self.focused_element,
+                sort_mode=self.sort_mode,
+                tag_filter=self.tag_filter,
+            )
+        # Keep the text in the buffer
+        return True
+
+    def _get_stats_text(self):
+        """Summary read from `TodoStats`. It is computed once when the panel
+        is opened, so redrawing the screen costs nothing.
+        """
+        if self.stats_text is None:
+            counts = TodoStats.count_per_status()
+            ages = TodoStats.average_age_per_status()
+            statuses = " | ".join(
+                f"{name}: {counts[status]}"
+                + (
+                    f" (avg. age {ages[status].days}d)"
+                    if status in ages
+                    else ""
+                )
+                for status, name in Todo.CHOICES
+            )
+            categories = ", ".join(
+                f"{name or '(none)'}: {count}"
+                for name, count in TodoStats.count_per_category().items()
+            )
+            self.stats_text = f"{statuses}\nCategories: {categories}"
+        return self.stats_text
+
+    def _get_preview_text(self):
+        """Description of the selected todo. Its body is only read, and
+        rendered, the first time it is selected.
+        """
+        column = self.columns[self.focused_element]
+        if not column.entries:
+            return ""
+        return self.previews.get(column.entries[column.selected_line])
+
+    def _move_to_column(self, todo: Any, previous_status: int):
+        """Move a todo that changed status, keeping both columns sorted
+        without reading the board again
+        """
+        self.columns[previous_status].remove(todo)
+        self.columns[todo.status].insert(todo)
+        self.stats_text = None
+        self.focused_element = todo.status
+        self._focus_on_element()
+
     def _focus_on_element(self):
         self.layout.focus(self.status_containers[self.focused_element])
 
@@ -76,21 +363,58 @@ class ListTasksView:
         self.focused_element = next(
             (
                 status for status in statuses if self.todo_entries_dict[status]
-            )
+            ),
+            statuses[0],
         )
         self._focus_on_element()
 
     def load_key_bindings(self):
+        """Keys come from `python_kanban.keymap`"""
         kb = KeyBindings()
         statuses = sorted(self.todo_entries_dict.keys())
 
-        @kb.add("a")
         def add_todo(event):
             if self.app:
                 self.app.load_add_task_view()
 
-        @kb.add("l")
-        @kb.add(Keys.Right)
+        def manage_categories(event):
+            if self.app:
+                self.app.load_category_manager_view()
+
+        def show_cumulative_flow(event):
+            if self.app:
+                self.app.load_cumulative_flow_view()
+
+        def change_sort_mode(event):
+            self.sort_mode = next_sort_mode(self.sort_mode)
+            if self.app:
+                self.app.sort_mode = self.sort_mode
+                self.app.load_list_tasks_view(
+                    initial_container_focus=self.focused_element
+                )
+
+        def edit_filter(event):
+            self.editing_filter = True
+            self.layout.focus(self.filter_window)
+
+        def jump_to_title(event):
+            self._open_jump_bar("title")
+
+        def jump_to_line(event):
+            self._open_jump_bar("line")
+
+        def toggle_preview(event):
+            self.show_preview = not self.show_preview
+
+        def toggle_compact(event):
+            self._set_compact(not self.compact)
+            if self.app:
+                self.app.compact = self.compact
+
+        def toggle_stats(event):
+            self.show_stats = not self.show_stats
+            self.stats_text = None
+
         def move_next_container(event):
             self.focused_element = next(
                 (
@@ -101,8 +425,6 @@ class ListTasksView:
             )
             self._focus_on_element()
 
-        @kb.add("h")
-        @kb.add(Keys.Left)
         def move_previous_container(event):
             self.focused_element = next(
                 (
@@ -114,9 +436,31 @@ class ListTasksView:
             )
             self._focus_on_element()
 
-        @kb.add("q")
         def exit(event) -> None:
             if self.app:
                 self.app.exit()
 
-        return kb
+        for action, handler in (
+            ("add", add_todo),
+            ("categories", manage_categories),
+            ("cumulative_flow", show_cumulative_flow),
+            ("order", change_sort_mode),
+            ("filter", edit_filter),
+            ("jump_to_title", jump_to_title),
+            ("jump_to_line", jump_to_line),
+            ("preview", toggle_preview),
+            ("compact", toggle_compact),
+            ("stats", toggle_stats),
+            ("next_column", move_next_container),
+            ("previous_column", move_previous_container),
+            ("quit", exit),
+        ):
+            add_action(kb, action, handler)
+
+        # Keys are typed in the filter or jump bar while they are edited
+        return ConditionalKeyBindings(
+            kb,
+            filter=Condition(
+                lambda: not self.editing_filter and self.jump_mode is None
+            ),
+        )
@@ -0,0 +1,45 @@
+"""This view is shown while the database is opened, before the board.
+It only allows to quit.
+"""
+
+from typing import Optional, TYPE_CHECKING
+
+from prompt_toolkit.key_binding import KeyBindings
+from prompt_toolkit.layout.layout import Layout
+from prompt_toolkit.widgets import Box, Label
+
+from python_kanban.keymap import add_action
+
+
+if TYPE_CHECKING:
+    # Import here to prevent a circular import
+    from python_kanban.app import KanbanApplication
+
+
+class LoadingView:
+    MAIN_TEXT = "Opening the board..."
+
+    def __init__(self, app: Optional["KanbanApplication"] = None):
+        self.app = app
+        self.load_view()
+
+    def load_view(self):
+        """Load main layout"""
+        root_container = Box(
+            body=Label(self.MAIN_TEXT, dont_extend_width=True),
+        )
+        self.layout = Layout(root_container)
+        return self.layout
+
+    def show(self):
+        """Nothing to update"""
+
+    def load_key_bindings(self):
+        kb = KeyBindings()
+
+        def exit(event) -> None:
+            if self.app:
+                self.app.exit()
+
+        add_action(kb, "quit", exit)
+        return kb
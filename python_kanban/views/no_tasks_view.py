@@ -9,6 +9,8 @@ from prompt_toolkit.key_binding import KeyBindings
 from prompt_toolkit.layout.layout import Layout
 from prompt_toolkit.widgets import Box, Label
 
+from python_kanban.keymap import add_action
+
 
 if TYPE_CHECKING:
     # Import here to prevent a circular import
@@ -30,17 +32,20 @@ class NoTasksView:
         self.layout = Layout(root_container)
         return self.layout
 
+    def show(self):
+        """Nothing to update"""
+
     def load_key_bindings(self):
         kb = KeyBindings()
 
-        @kb.add("a")
         def add_task(event) -> None:
             if self.app:
                 self.app.load_add_task_view()
 
-        @kb.add("q")
         def exit(event) -> None:
             if self.app:
                 self.app.exit()
 
+        add_action(kb, "add", add_task)
+        add_action(kb, "quit", exit)
         return kb
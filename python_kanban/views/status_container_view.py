@@ -1,15 +1,32 @@
 """
 """
-from typing import List, Optional, TYPE_CHECKING
+from typing import (
+    AbstractSet, Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+)
 
 from prompt_toolkit import HTML
+from prompt_toolkit.filters import Condition
 from prompt_toolkit.formatted_text import merge_formatted_text
 from prompt_toolkit.key_binding import KeyBindings
 from prompt_toolkit.layout.containers import Window
-from prompt_toolkit.layout.controls import FormattedTextControl
+from prompt_toolkit.layout.controls import FormattedTextControl, UIContent
+from prompt_toolkit.utils import get_cwidth
 
 
+from python_kanban.checklists import progress_badge
+from python_kanban.columns import truncate
+from python_kanban.jump import TitleIndex
+from python_kanban.keymap import add_action, add_count_keys
 from python_kanban.models import Todo
+from python_kanban.next_up import is_overdue
+from python_kanban.sorting import (
+    DEFAULT_SORT_MODE, GROUPED_SORT_MODES, insert_sorted
+)
+from python_kanban.storage import get_repository
+
+
+DEFAULT_PAGE_SIZE = 10
+BLOCKED_BADGE = " (blocked)"
 
 
 if TYPE_CHECKING:
@@ -17,16 +34,57 @@ if TYPE_CHECKING:
     from python_kanban.app import KanbanApplication
 
 
+class _ColumnControl(FormattedTextControl):
+    """Give the width of the column before its text is computed"""
+
+    def __init__(self, on_width: Callable[[int], None], **kwargs):
+        super().__init__(**kwargs)
+        self.on_width = on_width
+
+    def create_content(self, width: int, height: Optional[int]) -> UIContent:
+        self.on_width(width)
+        return super().create_content(width, height)
+
+
 class StatusContainer:
-    """A widget-like container for the todos with a given status"""
+    """A widget-like container for the todos with a given status.
+    `entries` must be sorted according to `sort_mode`. When a todo changes
+    status, it is given to `on_status_change` with its previous status, or
+    the whole board is reloaded if there is no such callback.
+    `checklist_progress` gives the (done, total) checklist items per todo id.
+    `blocked` holds the ids of the todos waiting for others. It is only read,
+    so it can be kept up to date elsewhere, see `python_kanban.dependencies`.
+    Titles are cut to the width of the column. In `compact` mode, each line
+    is a todo: categories are shown before the titles instead of as headers.
+    """
 
     def __init__(
-        self, entries: List[Todo], app: Optional["KanbanApplication"] = None
+        self,
+        entries: List[Todo],
+        app: Optional["KanbanApplication"] = None,
+        sort_mode: str = DEFAULT_SORT_MODE,
+        on_status_change: Optional[Callable[[Any, int], None]] = None,
+        checklist_progress: Optional[Dict[int, Tuple[int, int]]] = None,
+        compact: bool = False,
+        blocked: Optional[AbstractSet[int]] = None,
     ):
         self.entries = entries
+        self.sort_mode = sort_mode
+        self.on_status_change = on_status_change
+        self.checklist_progress = checklist_progress or {}
+        self.blocked: AbstractSet[int] = (
+            frozenset() if blocked is None else blocked
+        )
         self.selected_line = 0
+        self._title_index: Optional[TitleIndex] = None
+        self.compact = compact
+        # Width of the last render, unknown until the column is displayed
+        self.width: Optional[int] = None
+        # Todo id: (title, width, truncated title)
+        self._truncated_titles: Dict[int, Tuple[str, int, str]] = {}
         self.container = Window(
-            content=FormattedTextControl(
+            content=_ColumnControl(
+                on_width=self._set_width,
                 text=self._get_formatted_text,
                 focusable=True,
                 key_bindings=self._get_key_bindings(),
@@ -35,70 +93,285 @@ class StatusContainer:
         )
         self.app = app
 
+    def _set_width(self, width: int):
+        """Called before each render. Truncated titles are only computed
+        again when the width changes.
+        """
+        if width != self.width:
+            self.width = width
+            self._truncated_titles.clear()
+
+    def _fit_title(self, todo: Any, width: Optional[int]) -> str:
+        """Title of a todo cut to `width`, memoized per todo"""
+        if width is None:
+            return todo.title
+        cached = self._truncated_titles.get(todo.id)
+        if cached is None or cached[:2] != (todo.title, width):
+            cached = (todo.title, width, truncate(todo.title, width))
+            self._truncated_titles[todo.id] = cached
+        return cached[2]
+
     def _get_formatted_text(self):
+        grouped = self.sort_mode in GROUPED_SORT_MODES and not self.compact
         result = []
+        previous_category = None
         for i, entry in enumerate(self.entries):
+            if grouped and entry.category and (
+                previous_category is None
+                or entry.category.id != previous_category.id
+            ):
+                name = entry.category.name
+                result.append([(
+                    "bold underline",
+                    truncate(name, self.width) if self.width else name,
+                )])
+                result.append("\n")
+            previous_category = entry.category
+
             if i == self.selected_line:
                 result.append([("[SetCursorPosition]", "")])
 
-            category_name = HTML(
-                f"[<bold>{entry.category.name}</bold>] "
-                if entry.category
-                else ""
+            prefix = ""
+            if grouped:
+                prefix = "  " if entry.category else ""
+                result.append(prefix)
+            elif entry.category:
+                prefix = f"[{entry.category.name}] "
+                result.append(HTML("[<bold>{}</bold>] ").format(
+                    entry.category.name
+                ))
+
+            progress = self.checklist_progress.get(entry.id)
+            badge = f" {progress_badge(progress)}" if progress else ""
+            blocked = entry.id in self.blocked
+            title = self._fit_title(
+                entry,
+                max(
+                    self.width - get_cwidth(
+                        prefix + badge + (BLOCKED_BADGE if blocked else "")
+                    ),
+                    1,
+                )
+                if self.width else None,
             )
-            result.append(category_name)
-            result.append(entry.title)
+            if is_overdue(entry):
+                result.append([("fg:ansired", title)])
+            elif blocked:
+                result.append([("fg:ansibrightblack", title)])
+            else:
+                result.append(title)
+            if progress:
+                done, total = progress
+                style = "fg:ansigreen" if done == total else "fg:ansiblue"
+                result.append([(style, badge)])
+            if blocked:
+                result.append([("fg:ansibrightblack", BLOCKED_BADGE)])
             result.append("\n")
 
         return merge_formatted_text(result)
 
+    def set_entries(
+        self,
+        entries: List[Any],
+        checklist_progress: Optional[Dict[int, Tuple[int, int]]] = None,
+        blocked: Optional[AbstractSet[int]] = None,
+    ):
+        """Show other todos, keeping the selected one if it is still there"""
+        selected_id = (
+            self.entries[self.selected_line].id if self.entries else None
+        )
+        self.entries = entries
+        self.checklist_progress = checklist_progress or {}
+        self.blocked = frozenset() if blocked is None else blocked
+        self._title_index = None
+        self.selected_line = next(
+            (
+                line for line, todo in enumerate(entries)
+                if todo.id == selected_id
+            ),
+            max(min(self.selected_line, len(entries) - 1), 0),
+        )
+
+    def insert(self, todo: Any):
+        """Add a todo where it belongs, and select it"""
+        self.selected_line = insert_sorted(self.entries, todo, self.sort_mode)
+        self._title_index = None
+
+    def remove(self, todo: Any):
+        self.entries.remove(todo)
+        self._title_index = None
+        self._select_line(self.selected_line)
+
+    def _category_bounds(self) -> Tuple[int, int]:
+        """First and last lines with the category of the selected todo.
+        Todos are only reordered inside their category.
+        """
+        def category_id(line):
+            category = self.entries[line].category
+            return category.id if category else None
+
+        selected_category = category_id(self.selected_line)
+        first = last = self.selected_line
+        while first > 0 and category_id(first - 1) == selected_category:
+            first -= 1
+        while (
+            last < len(self.entries) - 1
+            and category_id(last + 1) == selected_category
+        ):
+            last += 1
+        return first, last
+
+    def _move_selected(self, line: int):
+        """Move the selected todo to another line of its category. Only that
+        todo is written, and the list is reordered in place.
+        """
+        if not self.entries or self.sort_mode not in GROUPED_SORT_MODES:
+            return
+        first, last = self._category_bounds()
+        line = max(first, min(line, last))
+        if line == self.selected_line:
+            return
+
+        todo = self.entries.pop(self.selected_line)
+        above = self.entries[line - 1] if line > first else None
+        below = self.entries[line] if line < last else None
+        get_repository().move_todo(todo, above, below)
+        self.entries.insert(line, todo)
+        self.selected_line = line
+        self._title_index = None
+
+    def _change_status(self, todo: Any, change: Callable[[Any], None]):
+        previous_status = todo.status
+        change(todo)
+        if todo.status == previous_status:
+            return
+        if self.on_status_change:
+            self.on_status_change(todo, previous_status)
+        elif self.app:
+            self.app.load_list_tasks_view(initial_container_focus=todo.status)
+
+    def _select_line(self, line: int):
+        self.selected_line = max(min(line, len(self.entries) - 1), 0)
+
+    def jump_to_title(self, prefix: str, start: Optional[int] = None) -> bool:
+        """Select the first todo from `start` (by default the selected one)
+        whose title starts with `prefix`. Return whether there is one.
+        """
+        if self._title_index is None:
+            self._title_index = TitleIndex(self.entries)
+        line = self._title_index.find(
+            prefix, self.selected_line if start is None else start
+        )
+        if line is not None:
+            self.selected_line = line
+        return line is not None
+
+    def jump_to_line(self, line: int):
+        """Select a line, counting from 1"""
+        self._select_line(line - 1)
+
+    def _page_size(self) -> int:
+        """Number of visible lines, once the column is displayed"""
+        render_info = self.container.render_info
+        if render_info is None:
+            return DEFAULT_PAGE_SIZE
+        return max(render_info.window_height - 1, 1)
+
     def _get_key_bindings(self):  # noqa
         """
         Set #noqa to prevent flake8 from calling this function 'too complex'.
         It should actually contain all keybindings here.
+        Keys come from `python_kanban.keymap`.
         """
         kb = KeyBindings()
 
-        @kb.add("k")
-        @kb.add("up")
+        has_entries = Condition(lambda: bool(self.entries))
+        add_count_keys(kb, filter=has_entries)
+
         def go_up(event):
-            self.selected_line = (self.selected_line - 1) % len(self.entries)
+            if event.arg_present:
+                self._select_line(self.selected_line - event.arg)
+            else:
+                self.selected_line = (
+                    (self.selected_line - 1) % len(self.entries)
+                )
 
-        @kb.add("j")
-        @kb.add("down")
         def go_down(event):
-            self.selected_line = (self.selected_line + 1) % len(self.entries)
+            if event.arg_present:
+                self._select_line(self.selected_line + event.arg)
+            else:
+                self.selected_line = (
+                    (self.selected_line + 1) % len(self.entries)
+                )
+
+        def go_to_first(event):
+            """Or to the given line, counting from 1"""
+            self._select_line(event.arg - 1 if event.arg_present else 0)
+
+        def go_to_last(event):
+            """Or to the given line, counting from 1"""
+            self._select_line(
+                event.arg - 1 if event.arg_present else len(self.entries)
+            )
+
+        def page_up(event):
+            self._select_line(
+                self.selected_line - self._page_size() * event.arg
+            )
+
+        def page_down(event):
+            self._select_line(
+                self.selected_line + self._page_size() * event.arg
+            )
+
+        def move_up(event):
+            self._move_selected(self.selected_line - 1)
+
+        def move_down(event):
+            self._move_selected(self.selected_line + 1)
+
+        def move_to_top(event):
+            self._move_selected(0)
+
+        def move_to_bottom(event):
+            self._move_selected(len(self.entries) - 1)
 
-        @kb.add("p")
         def promote(event):
             todo = self.entries[self.selected_line]
-            todo.promote()
-            if self.app:
-                self.app.load_list_tasks_view(
-                    initial_container_focus=todo.status
-                )
+            self._change_status(todo, get_repository().promote)
 
-        @kb.add("r")
         def regress(event):
             todo = self.entries[self.selected_line]
-            todo.regress()
-            if self.app:
-                self.app.load_list_tasks_view(
-                    initial_container_focus=todo.status
-                )
+            self._change_status(todo, get_repository().regress)
 
-        @kb.add("d")
         def delete(event):
             todo = self.entries[self.selected_line]
             if self.app:
                 self.app.load_delete_task_view(todo=todo)
 
-        @kb.add("e")
         def edit_todo(event):
             todo = self.entries[self.selected_line]
             if self.app:
                 self.app.load_edit_task_view(todo=todo)
 
+        for action, handler in (
+            ("up", go_up),
+            ("down", go_down),
+            ("first", go_to_first),
+            ("last", go_to_last),
+            ("page_up", page_up),
+            ("page_down", page_down),
+            ("move_up", move_up),
+            ("move_down", move_down),
+            ("move_to_top", move_to_top),
+            ("move_to_bottom", move_to_bottom),
+            ("promote", promote),
+            ("regress", regress),
+            ("delete", delete),
+            ("edit", edit_todo),
+        ):
+            add_action(kb, action, handler, filter=has_entries)
+
         return kb
 
     def __pt_container__(self):
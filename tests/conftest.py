@@ -1,11 +1,12 @@
 import peewee as pw
 import pytest
 
-from python_kanban.models import Category, Todo
+from python_kanban.keymap import set_keymap
+from python_kanban.models import MODELS
+from python_kanban.storage import set_repository
 
 
 test_db = pw.SqliteDatabase(":memory:")
-MODELS = (Category, Todo)
 
 
 @pytest.fixture(scope="function", autouse=True)
@@ -15,3 +16,6 @@ def test_database():
         test_db.create_tables(MODELS)
         yield ctx
         test_db.drop_tables(MODELS)
+    # The repository may cache data of this database
+    set_repository(None)
+    set_keymap(None)
@@ -1,3 +1,5 @@
+from datetime import date
+
 from mock import Mock
 
 from prompt_toolkit.key_binding.key_processor import KeyPress, KeyProcessor
@@ -119,3 +121,36 @@ def test_escape_cancels():
     processor.process_keys()
 
     mocked_app.load_list_tasks_view.assert_called_once()
+
+
+def test_add_with_due_date_and_priority():
+    view = AddTaskView()
+    view.title_buffer.text = "Something to do"
+    view.due_buffer.text = "2021-05-01"
+    view.priority_list.current_value = Todo.PRIORITIES[2][0]
+
+    view._add()
+
+    todo = Todo.get()
+    assert todo.due == date(2021, 5, 1)
+    assert todo.priority == Todo.PRIORITIES[2][0]
+
+
+def test_invalid_due_date_is_not_saved():
+    view = AddTaskView()
+    view.title_buffer.text = "Something to do"
+    view.due_buffer.text = "tomorrow"
+
+    view._add()
+
+    assert Todo.select().count() == 0
+
+
+def test_add_with_tags():
+    view = AddTaskView()
+    view.title_buffer.text = "Something to do"
+    view.tags_buffer.text = "bug, ui"
+
+    view._add()
+
+    assert Todo.get().tag_names() == ["bug", "ui"]
@@ -0,0 +1,195 @@
+import asyncio
+import threading
+from datetime import date
+
+import peewee as pw
+import pytest
+from mock import patch
+from prompt_toolkit.application import create_app_session
+from prompt_toolkit.application.current import set_app
+from prompt_toolkit.input import DummyInput
+from prompt_toolkit.key_binding.key_processor import KeyPress
+from prompt_toolkit.output import DummyOutput
+
+from python_kanban.app import KanbanApplication, prepare_storage
+from python_kanban.models import MODELS, SCHEMA_VERSION, Recurrence, Todo
+from python_kanban.snapshot import Snapshot
+from python_kanban.views.add_task_view import AddTaskView
+from python_kanban.views.edit_tasks_view import EditTaskView
+from python_kanban.views.list_tasks_view import ListTasksView
+from python_kanban.views.loading_view import LoadingView
+from python_kanban.views.no_tasks_view import NoTasksView
+
+
+@pytest.fixture
+def app():
+    with create_app_session(input=DummyInput(), output=DummyOutput()):
+        yield KanbanApplication()
+
+
+def view_of(app, view_class):
+    return app._views[view_class]
+
+
+def test_empty_board_shows_no_tasks_view(app):
+    assert app.layout is view_of(app, NoTasksView).layout
+
+
+def test_views_are_reused(app):
+    first = Todo.create(title="Task 1")
+    second = Todo.create(title="Task 2", body="Details")
+    app.load_list_tasks_view()
+    board = view_of(app, ListTasksView)
+    key_bindings = app.key_bindings
+
+    app.load_edit_task_view(todo=first)
+    edit_view = view_of(app, EditTaskView)
+    app.load_edit_task_view(todo=second)
+
+    assert view_of(app, EditTaskView) is edit_view
+    assert edit_view.title_buffer.text == "Task 2"
+    assert edit_view.body_buffer.text == "Details"
+
+    app.load_list_tasks_view()
+    assert view_of(app, ListTasksView) is board
+    assert app.layout is board.layout
+    assert app.key_bindings is key_bindings
+
+
+def test_board_keeps_its_selection(app):
+    for title in ("Task 1", "Task 2", "Task 3"):
+        Todo.create(title=title)
+    app.load_list_tasks_view()
+    board = view_of(app, ListTasksView)
+    board.columns[0].selected_line = 1
+    selected = board.columns[0].entries[1]
+
+    # A new task is put on top, and the selected one stays selected
+    app.load_add_task_view()
+    add_view = view_of(app, AddTaskView)
+    add_view.title_buffer.text = "Task 4"
+    add_view._add()
+
+    assert board.columns[0].entries[2].id == selected.id
+    assert board.columns[0].selected_line == 2
+
+
+def test_cancel_does_not_read_the_board_again(app):
+    Todo.create(title="Task 1")
+    app.load_list_tasks_view()
+    board = view_of(app, ListTasksView)
+    entries = board.columns[0].entries
+
+    app.load_add_task_view()
+    view_of(app, AddTaskView).title_buffer.text = "Draft"
+    view_of(app, AddTaskView)._cancel()
+    assert board.columns[0].entries is entries
+
+    # The form is empty when opened again
+    app.load_add_task_view()
+    assert view_of(app, AddTaskView).title_buffer.text == ""
+
+
+def test_board_emptied_goes_back_to_no_tasks_view(app):
+    todo = Todo.create(title="Task 1")
+    app.load_list_tasks_view()
+
+    todo.delete_instance()
+    app.load_list_tasks_view()
+
+    assert app.layout is view_of(app, NoTasksView).layout
+    assert ListTasksView not in app._views
+
+
+def test_snapshot_follows_the_changes(tmp_path):
+    path = str(tmp_path / "kanban.snapshot")
+    Todo.create(title="Task 1")
+    with create_app_session(
+        input=DummyInput(), output=DummyOutput()
+    ), patch("python_kanban.app.settings") as settings:
+        settings.get.side_effect = lambda key, default=None: (
+            path if key == "SNAPSHOT_FILE" else default
+        )
+        app = KanbanApplication()
+        with Snapshot(path) as snapshot:
+            assert snapshot.counts() == {0: 1, 1: 0, 2: 0}
+
+        with set_app(app):
+            app.key_processor.feed(KeyPress("p"))
+            app.key_processor.process_keys()
+
+    with Snapshot(path) as snapshot:
+        assert snapshot.counts() == {0: 0, 1: 1, 2: 0}
+
+
+def test_board_is_shown_once_the_storage_is_ready():
+    Todo.create(title="Task 1")
+    with create_app_session(input=DummyInput(), output=DummyOutput()):
+        app = KanbanApplication(storage_ready=False)
+        assert app.layout is view_of(app, LoadingView).layout
+        assert app._start_preparing_storage in app.pre_run_callables
+
+        # A loop of its own, the other tests use the default one
+        loop = asyncio.new_event_loop()
+        with patch("python_kanban.app.prepare_storage") as prepare:
+            loop.run_until_complete(app._prepare_storage())
+        loop.close()
+
+    prepare.assert_called_once()
+    assert app.layout is view_of(app, ListTasksView).layout
+
+
+def test_storage_errors_end_the_app():
+    error = pw.OperationalError("database is locked")
+    with create_app_session(input=DummyInput(), output=DummyOutput()):
+        app = KanbanApplication(storage_ready=False)
+
+        loop = asyncio.new_event_loop()
+        with patch(
+            "python_kanban.app.prepare_storage", side_effect=error
+        ), patch.object(app, "exit") as exit:
+            loop.run_until_complete(app._prepare_storage())
+        loop.close()
+
+    exit.assert_called_once_with(exception=error)
+    assert app.layout is view_of(app, LoadingView).layout
+
+
+def test_prepare_storage_in_another_thread(tmp_path):
+    database = pw.SqliteDatabase(str(tmp_path / "kanban.db"))
+    with database.bind_ctx(MODELS):
+        thread = threading.Thread(target=prepare_storage)
+        thread.start()
+        thread.join()
+
+        assert database.pragma("user_version") == SCHEMA_VERSION
+        assert Todo.select().count() == 0
+    database.close()
+
+
+def test_recurrences_show_on_the_board(app):
+    Todo.create(title="Task 1")
+    app.load_list_tasks_view()
+    board = view_of(app, ListTasksView)
+    Recurrence.create(title="Chore", rule="daily", next_run=date.today())
+
+    app.materialize_recurrences()
+
+    assert [todo.title for todo in board.columns[0].entries] == [
+        "Chore", "Task 1"
+    ]
+
+
+def test_recurrences_wait_for_the_board(app):
+    todo = Todo.create(title="Task 1")
+    app.load_list_tasks_view()
+    board = view_of(app, ListTasksView)
+    app.load_edit_task_view(todo=todo)
+    Recurrence.create(title="Chore", rule="daily", next_run=date.today())
+
+    app.materialize_recurrences()
+    assert app.layout is view_of(app, EditTaskView).layout
+
+    # Even when nothing else changed
+    app.load_list_tasks_view(refresh=False)
+    assert len(board.columns[0].entries) == 2
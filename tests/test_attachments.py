@@ -0,0 +1,70 @@
+import io
+import os
+
+from mock import patch
+
+from python_kanban.attachments import (
+    blob_path, export_blob, format_size, prune_blobs, store_blob, store_file
+)
+
+
+def test_store_blob(tmp_path):
+    directory = str(tmp_path)
+
+    digest, size = store_blob(io.BytesIO(b"log line\n"), directory)
+
+    assert size == 9
+    assert len(digest) == 64
+    with open(blob_path(digest, directory), "rb") as blob:
+        assert blob.read() == b"log line\n"
+
+
+def test_same_content_is_stored_once(tmp_path):
+    directory = str(tmp_path)
+    (tmp_path / "first.log").write_bytes(b"same")
+    (tmp_path / "second.log").write_bytes(b"same")
+
+    first = store_file(str(tmp_path / "first.log"), directory)
+    second = store_file(str(tmp_path / "second.log"), directory)
+
+    assert first == second
+    assert os.listdir(tmp_path / first[0][:2]) == [first[0][2:]]
+    # No leftover of the copies
+    assert sorted(os.listdir(tmp_path)) == [
+        first[0][:2], "first.log", "second.log"
+    ]
+
+
+def test_blobs_are_copied_in_chunks(tmp_path):
+    content = bytes(range(256)) * 10
+    source = io.BytesIO(content)
+
+    with patch("python_kanban.attachments.CHUNK_SIZE", 100), patch.object(
+        source, "read", wraps=source.read
+    ) as read:
+        digest, size = store_blob(source, str(tmp_path))
+    assert size == len(content)
+    assert read.call_count == 27
+
+    destination = io.BytesIO()
+    export_blob(digest, destination, str(tmp_path))
+    assert destination.getvalue() == content
+
+
+def test_prune_blobs(tmp_path):
+    directory = str(tmp_path)
+    kept, _ = store_blob(io.BytesIO(b"kept"), directory)
+    removed, _ = store_blob(io.BytesIO(b"removed"), directory)
+
+    assert prune_blobs({kept}, directory) == 1
+
+    assert os.path.exists(blob_path(kept, directory))
+    assert not os.path.exists(blob_path(removed, directory))
+    assert prune_blobs(set(), str(tmp_path / "missing")) == 0
+
+
+def test_format_size():
+    assert format_size(12) == "12 bytes"
+    assert format_size(1536) == "1.5 KB"
+    assert format_size(3 * 1024 ** 2) == "3.0 MB"
+    assert format_size(2 * 1024 ** 3) == "2.0 GB"
@@ -0,0 +1,131 @@
+import gzip
+import sqlite3
+import time
+
+import peewee as pw
+import pytest
+
+from python_kanban.backup import (
+    AutoBackup, RestoreError, backup, list_snapshots, restore
+)
+from python_kanban.models import MODELS, SCHEMA_VERSION, Todo, create_tables
+
+
+@pytest.fixture
+def database_path(tmp_path):
+    """A file database with a single todo"""
+    path = str(tmp_path / "kanban.db")
+    database = pw.SqliteDatabase(path)
+    with database.bind_ctx(MODELS):
+        create_tables()
+        Todo.create(title="Saved task")
+    database.close()
+    return path
+
+
+def count_todos(path):
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute("SELECT COUNT(*) FROM todo").fetchone()[0]
+    finally:
+        connection.close()
+
+
+def test_backup_creates_compressed_snapshot(database_path, tmp_path):
+    directory = str(tmp_path / "backups")
+
+    snapshot = backup(directory=directory, database_path=database_path)
+
+    assert list_snapshots(directory) == [snapshot]
+    with gzip.open(snapshot) as content:
+        assert content.read(16) == b"SQLite format 3\x00"
+
+
+def test_backup_rotation(database_path, tmp_path):
+    directory = str(tmp_path / "backups")
+
+    snapshots = [
+        backup(directory=directory, keep=2, database_path=database_path)
+        for _ in range(3)
+    ]
+
+    assert list_snapshots(directory) == snapshots[1:]
+
+
+def test_restore(database_path, tmp_path):
+    snapshot = backup(
+        directory=str(tmp_path / "backups"), database_path=database_path
+    )
+    connection = sqlite3.connect(database_path)
+    connection.execute("DELETE FROM todo")
+    connection.commit()
+    connection.close()
+    assert count_todos(database_path) == 0
+
+    restore(snapshot, database_path=database_path)
+
+    assert count_todos(database_path) == 1
+
+
+def test_restore_rejects_newer_schema(database_path, tmp_path):
+    connection = sqlite3.connect(database_path)
+    connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+    connection.close()
+    snapshot = backup(
+        directory=str(tmp_path / "backups"), database_path=database_path
+    )
+    other_path = str(tmp_path / "other.db")
+    sqlite3.connect(other_path).close()
+
+    with pytest.raises(RestoreError):
+        restore(snapshot, database_path=other_path)
+
+    assert list((tmp_path).glob("tmp*.db")) == []
+
+
+def test_restore_rejects_databases_without_todos(tmp_path):
+    empty_path = str(tmp_path / "empty.db")
+    sqlite3.connect(empty_path).execute("CREATE TABLE other (id)").close()
+    snapshot = backup(
+        directory=str(tmp_path / "backups"), database_path=empty_path
+    )
+
+    with pytest.raises(RestoreError):
+        restore(snapshot, database_path=str(tmp_path / "kanban.db"))
+
+
+def test_restore_rejects_invalid_files(tmp_path):
+    not_a_snapshot = tmp_path / "kanban-nope.db.gz"
+    not_a_snapshot.write_bytes(b"garbage")
+
+    with pytest.raises(RestoreError):
+        restore(str(not_a_snapshot), database_path=str(tmp_path / "k.db"))
+
+
+def test_restore_rejects_corrupted_snapshots(database_path, tmp_path):
+    with open(database_path, "rb") as database:
+        compressed = gzip.compress(database.read())
+    corrupted = tmp_path / "kanban-corrupted.db.gz"
+    # A valid gzip header followed by invalid deflate data
+    corrupted.write_bytes(compressed[:10] + b"\xff" * 8 + compressed[18:])
+
+    with pytest.raises(RestoreError):
+        restore(str(corrupted), database_path=database_path)
+    with sqlite3.connect(database_path) as connection:
+        assert connection.execute("SELECT title FROM todo").fetchall() == [
+            ("Saved task",)
+        ]
+
+
+def test_auto_backup(database_path, tmp_path):
+    directory = str(tmp_path / "backups")
+    auto_backup = AutoBackup(
+        interval=0.05, directory=directory, database_path=database_path
+    )
+
+    auto_backup.start()
+    time.sleep(0.3)
+    auto_backup.stop()
+    auto_backup.join()
+
+    assert list_snapshots(directory)
@@ -0,0 +1,99 @@
+import pytest
+from mock import Mock
+from prompt_toolkit.key_binding.key_processor import KeyPress, KeyProcessor
+
+from python_kanban.models import Category, Todo
+from python_kanban.views.category_manager_view import CategoryManagerView
+
+
+@pytest.fixture
+def categories():
+    """Categories ordered by name: "Home", "Orphan" and "Work" """
+    work = Category.create(name="Work")
+    home = Category.create(name="Home")
+    orphan = Category.create(name="Orphan")
+    Todo.create(title="Task 1", category=work)
+    Todo.create(title="Task 2", category=home)
+    return home, orphan, work
+
+
+def test_categories_are_listed_with_counts(categories):
+    view = CategoryManagerView()
+
+    text = "".join(
+        fragment[1] for fragment in view.list_window.content.text()()
+    )
+
+    assert "Home (1)" in text
+    assert "Orphan (0)" in text
+    assert "Work (1)" in text
+
+
+def test_navigation_and_marking(categories):
+    view = CategoryManagerView()
+
+    processor = KeyProcessor(view.load_key_bindings())
+    processor.feed(KeyPress("j"))
+    processor.feed(KeyPress(" "))
+    processor.process_keys()
+
+    assert view.selected_line == 1
+    assert view.marked == {categories[1].id}
+
+    processor.feed(KeyPress(" "))
+    processor.process_keys()
+
+    assert view.marked == set()
+
+
+def test_rename_selected(categories):
+    view = CategoryManagerView()
+
+    view._rename_selected("House")
+
+    assert Category.get_by_id(categories[0].id).name == "House"
+    assert view.categories[0].name == "House"
+
+
+def test_rename_with_invalid_name_is_ignored(categories):
+    view = CategoryManagerView()
+
+    view._rename_selected("")
+
+    assert Category.get_by_id(categories[0].id).name == "Home"
+
+
+def test_merge_marked_into_selected(categories):
+    home, orphan, work = categories
+    view = CategoryManagerView()
+    view.marked = {home.id, orphan.id}
+    view.selected_line = 2  # "Work"
+
+    view._merge_marked()
+
+    assert list(Category.select()) == [work]
+    assert Todo.select().where(Todo.category == work).count() == 2
+    assert view.categories[view.selected_line].id == work.id
+
+
+def test_delete_unused(categories):
+    home, orphan, work = categories
+    view = CategoryManagerView()
+
+    processor = KeyProcessor(view.load_key_bindings())
+    processor.feed(KeyPress("x"))
+    processor.process_keys()
+
+    assert set(Category.select()) == {home, work}
+    assert len(view.categories) == 2
+
+
+def test_q_goes_back_to_list(categories):
+    mocked_app = Mock()
+    view = CategoryManagerView(app=mocked_app)
+
+    processor = KeyProcessor(view.load_key_bindings())
+    processor.feed(KeyPress("q"))
+    processor.process_keys()
+
+    mocked_app.load_list_tasks_view.assert_called_once()
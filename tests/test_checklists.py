@@ -0,0 +1,26 @@
+from python_kanban.checklists import (
+    format_checklist, parse_checklist, progress_badge
+)
+
+
+def test_parse_checklist():
+    text = "[x] Write tests\n\n[ ] Update docs\nRelease\n[X]  Merge \n[ ]"
+
+    assert parse_checklist(text) == [
+        ("Write tests", True),
+        ("Update docs", False),
+        ("Release", False),
+        ("Merge", True),
+    ]
+
+
+def test_format_checklist():
+    items = [("Write tests", True), ("Update docs", False)]
+
+    assert format_checklist(items) == "[x] Write tests\n[ ] Update docs"
+    assert parse_checklist(format_checklist(items)) == items
+
+
+def test_progress_badge():
+    assert progress_badge((3, 7)) == "3/7"
+    assert progress_badge(None) == ""
@@ -0,0 +1,173 @@
+import peewee as pw
+import pytest
+from mock import patch
+
+from python_kanban.cli import main
+from python_kanban.models import MODELS, Todo, create_tables
+
+
+def test_no_command_runs_app():
+    with patch("python_kanban.app.run_app") as run_app:
+        main([])
+
+    run_app.assert_called_once()
+
+
+def test_report_command(capsys):
+    Todo.create(title="Task 1")
+
+    main(["report", "--days", "3"])
+
+    output = capsys.readouterr().out
+    assert "Cumulative flow" in output
+    assert "Throughput per week" in output
+
+
+def test_benchmark_command(capsys):
+    main(["benchmark", "--cards", "3"])
+
+    output = capsys.readouterr().out
+    assert "Seconds for 3 tasks" in output
+    assert "jsonl" in output
+
+
+def test_backup_and_restore_commands(tmp_path, capsys):
+    database_path = str(tmp_path / "kanban.db")
+    database = pw.SqliteDatabase(database_path)
+    with database.bind_ctx(MODELS):
+        create_tables()
+        Todo.create(title="Task 1")
+
+        main(["backup", "--dir", str(tmp_path / "backups"), "--keep", "3"])
+        snapshot = capsys.readouterr().out.strip()
+        Todo.delete().execute()
+        database.close()
+
+        main(["restore", snapshot])
+
+        assert Todo.select().count() == 1
+    database.close()
+
+
+def test_restore_command_fails_on_invalid_snapshot(tmp_path, capsys):
+    not_a_snapshot = tmp_path / "kanban-nope.db.gz"
+    not_a_snapshot.write_bytes(b"garbage")
+
+    with pytest.raises(SystemExit) as error:
+        main(["restore", str(not_a_snapshot)])
+
+    assert error.value.code == 1
+    assert "Cannot restore" in capsys.readouterr().err
+
+
+def test_sync_command(tmp_path, capsys):
+    Todo.create(title="Task 1")
+    path = str(tmp_path / "other.db")
+    other = pw.SqliteDatabase(path)
+    with other.bind_ctx(MODELS):
+        create_tables()
+    other.close()
+
+    main(["sync", path])
+    assert capsys.readouterr().out.strip() == "1 changes sent, 0 received"
+
+    with pytest.raises(SystemExit):
+        main(["sync", str(tmp_path / "typo.db")])
+    assert "No such board" in capsys.readouterr().err
+
+
+def test_next_command(capsys):
+    Todo.create(title="Task 1")
+
+    main(["next", "-n", "5"])
+
+    assert "Task 1" in capsys.readouterr().out
+
+
+def test_attachments_command(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    todo = Todo.create(title="Task 1")
+    (tmp_path / "error.log").write_bytes(b"Traceback")
+
+    main(["attachments", "add", str(todo.id), "error.log"])
+    assert capsys.readouterr().out == "1: error.log (9 bytes)\n"
+
+    main(["attachments", "list", str(todo.id)])
+    assert capsys.readouterr().out == "1: error.log (9 bytes)\n"
+
+    main(["attachments", "export", "1", "copy.log"])
+    assert (tmp_path / "copy.log").read_bytes() == b"Traceback"
+
+    todo.delete_instance()
+    main(["attachments", "prune"])
+    assert capsys.readouterr().out == "1 files removed\n"
+
+
+def test_attachments_command_with_unknown_task(capsys):
+    with pytest.raises(SystemExit):
+        main(["attachments", "list", "42"])
+
+    assert "No task with id 42" in capsys.readouterr().err
+
+
+def test_database_option(tmp_path):
+    path = str(tmp_path / "board.db")
+
+    with patch("python_kanban.models.db") as db:
+        main(["--db", path, "next"])
+
+    db.init.assert_called_once_with(path)
+
+
+def test_recur_command(capsys):
+    main([
+        "recur", "add", "Trash", "weekly on mon", "--category", "Home",
+        "--start", "2021-03-03",
+    ])
+    assert capsys.readouterr().out == "1: Trash, first on 2021-03-08\n"
+
+    main(["recur", "list"])
+    assert capsys.readouterr().out == (
+        "1: Trash (weekly on mon), next on 2021-03-08\n"
+    )
+
+    main(["recur", "run"])
+    assert capsys.readouterr().out == "1 tasks created\n"
+    assert Todo.get(Todo.title == "Trash").category.name == "Home"
+
+    main(["recur", "add", "Rent", "monthly", "--start", "2021-01-31"])
+    main(["recur", "list"])
+    assert "2: Rent (monthly on 31), next on 2021-01-31\n" in (
+        capsys.readouterr().out
+    )
+
+    main(["recur", "remove", "1"])
+    with pytest.raises(SystemExit):
+        main(["recur", "remove", "1"])
+    assert "No recurring task with id 1" in capsys.readouterr().err
+
+    with pytest.raises(SystemExit):
+        main(["recur", "add", "Trash", "hourly"])
+    assert "Invalid recurrence" in capsys.readouterr().err
+
+
+def test_dependencies_command(capsys):
+    blocker = Todo.create(title="Blocker")
+    todo = Todo.create(title="Task")
+
+    main(["dependencies", "add", str(todo.id), str(blocker.id)])
+    main(["dependencies", "list", str(todo.id)])
+    assert capsys.readouterr().out == f"{blocker.id}: Blocker (blocking)\n"
+
+    with pytest.raises(SystemExit):
+        main(["dependencies", "add", str(blocker.id), str(todo.id)])
+    assert "already waits for" in capsys.readouterr().err
+
+    main(["dependencies", "remove", str(todo.id), str(blocker.id)])
+    with pytest.raises(SystemExit):
+        main(["dependencies", "remove", str(todo.id), str(blocker.id)])
+    assert "is not blocked by" in capsys.readouterr().err
+
+    with pytest.raises(SystemExit):
+        main(["dependencies", "list", "42"])
+    assert "No task with id 42" in capsys.readouterr().err
@@ -0,0 +1,19 @@
+from python_kanban.columns import truncate, validate_column_weights
+
+
+def test_truncate():
+    assert truncate("Short", 10) == "Short"
+    assert truncate("Fix the login page", 10) == "Fix the l…"
+    assert truncate("Fix", 1) == "…"
+    assert truncate("Fix", 0) == ""
+    # Wide characters take two cells
+    assert truncate("日本語のタスク", 6) == "日本…"
+
+
+def test_validate_column_weights():
+    assert validate_column_weights([1, 2, 1]) == [1, 2, 1]
+    assert validate_column_weights(["3", 1, 1]) == [3, 1, 1]
+    assert validate_column_weights(None) == [1, 1, 1]
+    assert validate_column_weights([1, 2]) == [1, 1, 1]
+    assert validate_column_weights([1, 0, 1]) == [1, 1, 1]
+    assert validate_column_weights("wide") == [1, 1, 1]
@@ -0,0 +1,71 @@
+from datetime import date
+
+from mock import Mock
+from prompt_toolkit.key_binding.key_processor import KeyPress, KeyProcessor
+
+from python_kanban.models import Todo
+from python_kanban.views.cumulative_flow_view import (
+    BLOCK, CumulativeFlowView, render_chart
+)
+
+
+FLOW = [
+    (date(2021, 1, 1), {0: 4, 1: 0, 2: 0}),
+    (date(2021, 1, 2), {0: 2, 1: 2, 2: 0}),
+    (date(2021, 1, 3), {0: 0, 1: 2, 2: 2}),
+]
+
+
+def chart_lines(fragments):
+    return "".join(text for _, text in fragments).split("\n")
+
+
+def test_render_chart_stacks_done_at_the_bottom():
+    fragments = render_chart(FLOW, width=5, height=4)
+    lines = chart_lines(fragments)
+
+    assert len(lines) == 5  # 4 rows plus the dates
+    assert lines[0] == "4|" + BLOCK * 3
+    assert lines[-2] == "0|" + BLOCK * 3
+    assert lines[-1].startswith("  2021-01-01")
+
+    # The bottom row of the last day is "Done", the first day is "To do"
+    bottom_row = fragments[-6:-1][1:-1]
+    assert bottom_row[0][0] == "fg:ansiblue"
+    assert bottom_row[-1][0] == "fg:ansigreen"
+
+
+def test_render_chart_samples_days_to_the_available_width():
+    flow = [(date(2021, 1, 1 + i), {0: i, 1: 0, 2: 0}) for i in range(20)]
+
+    lines = chart_lines(render_chart(flow, width=13, height=2))
+
+    # 3 characters are taken by the axis, so the 20 days fit in 10 columns,
+    # each one showing every other day: 1, 3, 5, ..., 19 tasks
+    assert lines[0] == "19|" + " " * 7 + BLOCK * 3
+    assert lines[1] == " 0|" + " " * 2 + BLOCK * 8
+
+
+def test_view_without_history():
+    view = CumulativeFlowView()
+
+    assert view._get_chart_text() == "No history yet."
+
+
+def test_view_chart_is_cached():
+    Todo.create(title="Task 1")
+    view = CumulativeFlowView()
+
+    assert view._get_chart_text() is view._get_chart_text()
+    assert len(view._chart_cache) == 1
+
+
+def test_q_goes_back_to_list():
+    mocked_app = Mock()
+    view = CumulativeFlowView(app=mocked_app)
+
+    processor = KeyProcessor(view.load_key_bindings())
+    processor.feed(KeyPress("q"))
+    processor.process_keys()
+
+    mocked_app.load_list_tasks_view.assert_called_once()
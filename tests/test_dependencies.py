@@ -0,0 +1,124 @@
+import pytest
+from mock import patch
+
+from python_kanban.dependencies import DependencyCycleError, DependencyGraph
+from python_kanban.models import Todo, TodoDependency
+
+
+DONE = Todo.CHOICES[-1][0]
+
+
+def test_blocked_until_every_blocker_is_done():
+    graph = DependencyGraph([(1, 2, False), (1, 3, True), (4, 3, True)])
+    blocked = graph.blocked
+
+    assert blocked == {1}
+    assert graph.open_blockers_of(1) == {2}
+    assert len(graph) == 3
+
+    graph.set_done(2, True)
+    assert blocked == set()
+    # The same set, updated in place
+    assert graph.blocked is blocked
+
+    graph.set_done(3, False)
+    assert blocked == {1, 4}
+    graph.set_done(3, False)
+    assert graph.open_blockers_of(1) == {3}
+
+
+def test_status_changes_only_visit_the_blocked_todos():
+    graph = DependencyGraph((todo_id, 0, False) for todo_id in range(1, 4))
+    graph.add(10, 20)
+
+    with patch.object(
+        graph, "_close_blocker", wraps=graph._close_blocker
+    ) as close_blocker:
+        graph.set_done(20, True)
+
+    close_blocker.assert_called_once_with(10)
+    assert graph.blocked == {1, 2, 3}
+
+
+def test_cycles_are_refused():
+    graph = DependencyGraph()
+    graph.add(1, 2)
+    graph.add(2, 3)
+    graph.add(1, 3)
+
+    for todo_id, blocker_id in ((3, 1), (3, 2), (2, 1), (1, 1)):
+        with pytest.raises(DependencyCycleError):
+            graph.add(todo_id, blocker_id)
+    assert graph.blockers_of(3) == set()
+    assert graph.blocked == {1, 2}
+
+
+def test_new_links_follow_the_status_of_the_blocker():
+    graph = DependencyGraph([(1, 2, False)])
+
+    graph.add(3, 2, done=True)
+
+    assert graph.blocked == set()
+
+
+def test_remove_and_discard():
+    graph = DependencyGraph([(1, 2, False), (1, 3, False), (4, 1, False)])
+
+    graph.remove(1, 2)
+    assert graph.blocked == {1, 4}
+    graph.remove(1, 2)
+
+    graph.discard(1)
+    assert graph.blocked == set()
+    assert len(graph) == 0
+    # Forgotten, so its new links start from scratch
+    graph.add(3, 4, done=True)
+    assert graph.blocked == set()
+
+
+class TestTodoDependency:
+    def test_promote_waits_for_the_blockers(self):
+        blocker = Todo.create(title="Blocker")
+        todo = Todo.create(title="Todo")
+        TodoDependency.link(todo, blocker)
+
+        assert todo.is_blocked()
+        todo.promote()
+        assert Todo.get_by_id(todo.id).status == 0
+
+        for _ in Todo.CHOICES:
+            blocker.promote()
+        assert not todo.is_blocked()
+        todo.promote()
+        assert Todo.get_by_id(todo.id).status == 1
+
+    def test_graph(self):
+        first, second, third = (
+            Todo.create(title=f"Task {number}", status=status)
+            for number, status in ((1, 0), (2, DONE), (3, 0))
+        )
+        TodoDependency.link(first, second)
+        TodoDependency.link(third, first)
+
+        graph = TodoDependency.graph()
+        assert graph.blocked == {third.id}
+        with pytest.raises(DependencyCycleError):
+            TodoDependency.link(first, third)
+        assert TodoDependency.select().count() == 2
+
+        # Linking again changes nothing
+        TodoDependency.link(third, first, graph)
+        assert TodoDependency.unlink(third, first, graph)
+        assert not TodoDependency.unlink(third, first, graph)
+        assert graph.blocked == set()
+
+    def test_links_of_deleted_todos_are_removed(self):
+        first, second, third = (
+            Todo.create(title=f"Task {number}") for number in range(3)
+        )
+        TodoDependency.link(first, second)
+        TodoDependency.link(second, third)
+
+        second.delete_instance()
+
+        assert TodoDependency.select().count() == 0
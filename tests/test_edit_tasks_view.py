@@ -1,7 +1,9 @@
+from datetime import date
+
 import pytest
 
 from python_kanban.views.edit_tasks_view import EditTaskView
-from python_kanban.models import Todo
+from python_kanban.models import Attachment, ChecklistItem, Todo
 
 
 @pytest.fixture
@@ -38,3 +40,50 @@ def test_todo_with_new_category_is_edited(todo):
 
     updated_todo = Todo.select()[0]
     assert updated_todo.category.name == new_category_name
+
+
+def test_due_date_and_priority_are_edited(todo):
+    view = EditTaskView(todo=todo)
+    assert view.due_buffer.text == ""
+    assert view.priority_list.current_value == todo.priority
+
+    view.due_buffer.text = "2021-05-01"
+    view.priority_list.current_value = Todo.PRIORITIES[0][0]
+    view._update()
+
+    updated_todo = Todo.get()
+    assert updated_todo.due == date(2021, 5, 1)
+    assert updated_todo.priority == Todo.PRIORITIES[0][0]
+    assert EditTaskView(todo=updated_todo).due_buffer.text == "2021-05-01"
+
+
+def test_tags_are_edited(todo):
+    todo.set_tags(["bug", "ui"])
+    view = EditTaskView(todo=todo)
+    assert view.tags_buffer.text == "bug, ui"
+
+    view.tags_buffer.text = "ux"
+    view._update()
+
+    assert Todo.get().tag_names() == ["ux"]
+
+
+def test_checklist_is_edited(todo):
+    ChecklistItem.replace_items(todo, [("Write tests", True)])
+    view = EditTaskView(todo=todo)
+    assert view.checklist_buffer.text == "[x] Write tests"
+
+    view.checklist_buffer.text = "[x] Write tests\n[ ] Update docs"
+    view._update()
+
+    assert ChecklistItem.progress() == {todo.id: (1, 2)}
+
+
+def test_attachments_are_listed(todo):
+    assert EditTaskView(todo=todo).attachments_label.text == "No attachments"
+
+    Attachment.create(todo=todo, name="error.log", digest="1" * 64, size=2048)
+
+    assert EditTaskView(todo=todo).attachments_label.text == (
+        "error.log (2.0 KB)"
+    )
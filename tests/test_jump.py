@@ -0,0 +1,54 @@
+import random
+from types import SimpleNamespace
+
+from python_kanban.jump import TitleIndex
+
+
+def entries(*titles):
+    return [SimpleNamespace(title=title) for title in titles]
+
+
+def test_find():
+    index = TitleIndex(entries("Write docs", "fix bug", "Fix tests", "Deploy"))
+
+    assert index.find("dep") == 3
+    assert index.find("FIX") == 1
+    assert index.find("fix t") == 2
+    assert index.find("nothing") is None
+    assert index.find("") == 0
+
+
+def test_find_from_a_line():
+    index = TitleIndex(entries("Fix a", "Write", "Fix b", "Fix c"))
+
+    assert index.find("fix", start=1) == 2
+    assert index.find("fix", start=3) == 3
+    # Back to the top when nothing matches below
+    assert index.find("write", start=2) == 1
+
+
+def test_find_the_first_line_among_different_titles():
+    index = TitleIndex(entries("Write", "Fix b", "Fix a", "Fix c"))
+
+    assert index.find("fix", start=1) == 1
+    assert index.find("fix", start=2) == 2
+
+
+def test_find_matches_a_scan_of_the_column():
+    generator = random.Random(4)
+    titles = [
+        "".join(generator.choice("abc") for _ in range(3)) for _ in range(200)
+    ]
+    index = TitleIndex(entries(*titles))
+
+    for prefix in ("", "a", "b", "ab", "cab", "abcd"):
+        lines = [
+            line for line, title in enumerate(titles)
+            if title.startswith(prefix)
+        ]
+        for start in (0, 57, 199, 200):
+            expected = next(
+                (line for line in lines if line >= start),
+                lines[0] if lines else None,
+            )
+            assert index.find(prefix, start) == expected
@@ -0,0 +1,63 @@
+import pytest
+from mock import patch
+from prompt_toolkit.key_binding import KeyBindings
+from prompt_toolkit.key_binding.key_processor import KeyPress, KeyProcessor
+from prompt_toolkit.keys import Keys
+
+from python_kanban.keymap import (
+    KeymapError, add_action, add_count_keys, build_keymap, get_keymap,
+    parse_keys,
+)
+
+
+def test_parse_keys():
+    assert parse_keys("g g") == [("g", "g")]
+    assert parse_keys(["q", "c-x c-c"]) == [("q",), ("c-x", "c-c")]
+    with pytest.raises(KeymapError):
+        parse_keys(["q", " "])
+
+
+def test_build_keymap():
+    vim = build_keymap()
+    assert vim["down"] == [("j",), ("down",)]
+    assert vim["first"] == [("g", "g"), ("home",)]
+
+    emacs = build_keymap("emacs", {"PROMOTE": "P"})
+    assert emacs["down"] == [("c-n",), ("down",)]
+    assert emacs["promote"] == [("P",)]
+    assert emacs["regress"] == vim["regress"]
+
+    assert build_keymap("unknown") == vim
+    with pytest.raises(KeymapError):
+        build_keymap("vim", {"fly": "f"})
+
+
+def test_build_keymap_refuses_unknown_keys():
+    assert build_keymap("vim", {"quit": ["c-q", "f5 space"]})["quit"] == [
+        ("c-q",), ("f5", "space")
+    ]
+    with pytest.raises(KeymapError, match="promote.*ctrl-p"):
+        build_keymap("vim", {"promote": ["P", "ctrl-p"]})
+
+
+def test_keymap_is_read_once_from_the_settings():
+    settings = {"KEYMAP": "emacs", "KEYS": {"quit": "Q"}}
+    with patch("python_kanban.keymap.settings") as mocked_settings:
+        mocked_settings.get.side_effect = settings.get
+        assert get_keymap()["quit"] == [("Q",)]
+        assert get_keymap()["up"] == [("c-p",), ("up",)]
+    assert mocked_settings.get.call_count == 2
+
+
+def test_count_keys():
+    kb = KeyBindings()
+    counts = []
+    add_count_keys(kb)
+    add_action(kb, "down", lambda event: counts.append(event.arg))
+
+    processor = KeyProcessor(kb)
+    for key in ("1", "2", "j", "0", Keys.Down):
+        processor.feed(KeyPress(key))
+    processor.process_keys()
+
+    assert counts == [12, 1]
@@ -4,7 +4,7 @@ from prompt_toolkit.key_binding.key_processor import KeyPress, KeyProcessor
 from prompt_toolkit.keys import Keys
 
 from python_kanban.views.list_tasks_view import ListTasksView
-from python_kanban.models import Todo
+from python_kanban.models import Todo, TodoDependency
 
 
 @pytest.fixture
@@ -207,3 +207,221 @@ def test_check_focus_if_initial_container_is_provided(todo_entries):
 
     assert view.focused_element == 2
     assert view.layout.has_focus(view.status_containers[2])
+
+
+def test_c_should_load_category_manager_view(todo_entries):
+    mocked_app = Mock()
+    view = ListTasksView(app=mocked_app)
+
+    processor = KeyProcessor(view.load_key_bindings())
+    processor.feed(KeyPress("c"))
+    processor.process_keys()
+
+    mocked_app.load_category_manager_view.assert_called_once()
+
+
+def test_s_toggles_statistics_panel(todo_entries):
+    view = ListTasksView()
+    assert not view.show_stats
+
+    processor = KeyProcessor(view.load_key_bindings())
+    processor.feed(KeyPress("s"))
+    processor.process_keys()
+
+    assert view.show_stats
+    text = view._get_stats_text()
+    assert "To do: 2" in text
+    assert "In progress: 1" in text
+    assert "Done: 3" in text
+    assert "(none): 6" in text
+
+
+def test_f_should_load_cumulative_flow_view(todo_entries):
+    mocked_app = Mock()
+    view = ListTasksView(app=mocked_app)
+
+    processor = KeyProcessor(view.load_key_bindings())
+    processor.feed(KeyPress("f"))
+    processor.process_keys()
+
+    mocked_app.load_cumulative_flow_view.assert_called_once()
+
+
+def test_o_changes_sort_mode(todo_entries):
+    mocked_app = Mock()
+    view = ListTasksView(app=mocked_app, sort_mode="rank")
+
+    processor = KeyProcessor(view.load_key_bindings())
+    processor.feed(KeyPress("o"))
+    processor.process_keys()
+
+    assert view.sort_mode == "category"
+    assert mocked_app.sort_mode == "category"
+    mocked_app.load_list_tasks_view.assert_called_once_with(
+        initial_container_focus=0
+    )
+
+
+def test_unknown_sort_mode_falls_back_to_default(todo_entries):
+    assert ListTasksView(sort_mode="nope").sort_mode == "rank"
+
+
+def test_promoted_todo_moves_between_columns_in_place(todo_entries):
+    mocked_app = Mock()
+    view = ListTasksView(app=mocked_app, sort_mode="title")
+    column = view.columns[0]
+    assert [todo.title for todo in column.entries] == [
+        "Title 1 to do", "Title 2 to do"
+    ]
+
+    processor = KeyProcessor(column.container.get_key_bindings())
+    processor.feed(KeyPress("p"))
+    processor.process_keys()
+
+    assert [todo.title for todo in column.entries] == ["Title 2 to do"]
+    assert [todo.title for todo in view.columns[1].entries] == [
+        "Title 1 to do", "Title 3 doing"
+    ]
+    assert view.columns[1].selected_line == 0
+    assert view.focused_element == 1
+    mocked_app.load_list_tasks_view.assert_not_called()
+
+
+def test_tag_filter(todo_entries):
+    todo_entries[0].set_tags(["bug", "ui"])
+    todo_entries[3].set_tags(["bug"])
+    todo_entries[4].set_tags(["ux"])
+
+    view = ListTasksView(tag_filter="bug ui|ux")
+    assert [
+        todo.title for column in view.columns.values()
+        for todo in column.entries
+    ] == ["Title 1 to do"]
+
+    view = ListTasksView(tag_filter="bug")
+    assert [len(column.entries) for column in view.columns.values()] == [
+        1, 0, 1
+    ]
+
+
+def test_t_edits_tag_filter(todo_entries):
+    todo_entries[2].set_tags(["bug"])
+    view = ListTasksView()
+    bindings = view.load_key_bindings()
+
+    processor = KeyProcessor(bindings)
+    processor.feed(KeyPress("t"))
+    processor.process_keys()
+    assert view.editing_filter
+    assert view.layout.has_focus(view.filter_buffer)
+    # Other keys do not trigger their actions while typing the filter
+    assert not bindings.get_bindings_for_keys(("s",))[0].filter()
+
+    view.filter_buffer.text = "bug"
+    view.filter_buffer.validate_and_handle()
+
+    assert not view.editing_filter
+    assert view.tag_filter == "bug"
+    assert view.focused_element == 1
+    assert [len(column.entries) for column in view.columns.values()] == [
+        0, 1, 0
+    ]
+
+
+def test_v_toggles_description_preview(todo_entries):
+    Todo.update(body="**Important**").where(
+        Todo.id == todo_entries[0].id
+    ).execute()
+    view = ListTasksView()
+    assert not view.show_preview
+
+    processor = KeyProcessor(view.load_key_bindings())
+    processor.feed(KeyPress("v"))
+    processor.process_keys()
+
+    assert view.show_preview
+    # Newest todos come first
+    assert view._get_preview_text() == []
+    view.columns[0].selected_line = 1
+    assert view._get_preview_text() == [("bold", "Important"), ("", "\n")]
+
+
+def test_preview_follows_edited_descriptions(todo_entries):
+    view = ListTasksView()
+    view.show_preview = True
+    todo = view.columns[0].entries[0]
+    assert view._get_preview_text() == []
+
+    # Editing keeps the "updated" time
+    Todo.update_todo_with_category(todo, title=todo.title, body="Details")
+    view.show()
+
+    assert view._get_preview_text() == [("", "Details"), ("", "\n")]
+
+
+def test_jump_bar(todo_entries):
+    view = ListTasksView()
+    bindings = view.load_key_bindings()
+    column = view.columns[0]
+    # Newest first
+    assert [todo.title for todo in column.entries] == [
+        "Title 2 to do", "Title 1 to do"
+    ]
+
+    processor = KeyProcessor(bindings)
+    processor.feed(KeyPress("/"))
+    processor.process_keys()
+    assert view.jump_mode == "title"
+    assert view.layout.has_focus(view.jump_buffer)
+    assert not bindings.get_bindings_for_keys(("a",))[0].filter()
+
+    view.jump_buffer.text = "title 1"
+    assert column.selected_line == 1
+    view.jump_buffer.validate_and_handle()
+    assert view.jump_mode is None
+    assert column.selected_line == 1
+
+    processor.feed(KeyPress(":"))
+    processor.process_keys()
+    assert view.jump_mode == "line"
+    view.jump_buffer.text = "1"
+    assert column.selected_line == 0
+    view.jump_buffer.text = "2"
+    assert column.selected_line == 1
+
+
+def test_column_weights_and_compact_mode(todo_entries):
+    view = ListTasksView(column_weights=[1, 2, 1])
+    assert [
+        frame.container.width().weight for frame in view.status_containers
+    ] == [1, 2, 1]
+    assert not view.columns[0].compact
+
+    processor = KeyProcessor(view.load_key_bindings())
+    processor.feed(KeyPress("z"))
+    processor.process_keys()
+    assert all(column.compact for column in view.columns.values())
+
+    view.show(column_weights=[3, 1, 1])
+    assert view.status_containers[0].container.width().weight == 3
+    assert not view.columns[0].compact
+
+
+def test_blocked_todos_follow_their_blockers(todo_entries):
+    TodoDependency.link(todo_entries[0], todo_entries[2])
+    view = ListTasksView(app=Mock(), sort_mode="title")
+    todo_column, doing_column = view.columns[0], view.columns[1]
+    assert todo_column.blocked == {todo_entries[0].id}
+
+    # Blocked, so it stays where it is
+    processor = KeyProcessor(todo_column.container.get_key_bindings())
+    processor.feed(KeyPress("p"))
+    processor.process_keys()
+    assert todo_column.entries[0].id == todo_entries[0].id
+
+    doing_column.selected_line = 0
+    processor = KeyProcessor(doing_column.container.get_key_bindings())
+    processor.feed(KeyPress("p"))
+    processor.process_keys()
+    assert view.columns[2].entries[0].id == todo_entries[2].id
+    assert todo_column.blocked == set()
@@ -1,8 +1,16 @@
-from datetime import date
+import os
+from datetime import date, datetime, timedelta
 
+import peewee as pw
 import pytest
+from mock import patch
 
-from python_kanban.models import Category, Todo
+from python_kanban.models import (
+    MODELS, SCHEMA_VERSION, Attachment, BoardRevision, Category, ChecklistItem,
+    LazySqliteDatabase, Tag, Todo, TodoStats, TodoTag, TodoTransition,
+    Tombstone, create_tables, database_file,
+)
+from python_kanban.settings import Settings
 
 
 @pytest.fixture
@@ -296,3 +304,445 @@ def test_update_todo_with_empty_category():
     assert new_todo.title == new_title
     assert new_todo.body == new_body
     assert not new_todo.category
+
+
+@pytest.fixture
+def categories_with_todos():
+    """Three categories: two used by todos and an orphaned one"""
+    work = Category.create(name="Work")
+    home = Category.create(name="Home")
+    orphan = Category.create(name="Orphan")
+    Todo.create(title="Task 1", category=work)
+    Todo.create(title="Task 2", category=work)
+    Todo.create(title="Task 3", category=home)
+    Todo.create(title="Task 4")
+    return work, home, orphan
+
+
+class TestCategoryManagement:
+    def test_with_todo_counts(self, categories_with_todos):
+        categories = Category.with_todo_counts()
+
+        assert [
+            (category.name, category.todo_count) for category in categories
+        ] == [("Home", 1), ("Orphan", 0), ("Work", 2)]
+
+    def test_merge_moves_todos_and_deletes_sources(
+        self, categories_with_todos
+    ):
+        work, home, orphan = categories_with_todos
+
+        moved = Category.merge([home, orphan, work], target=work)
+
+        assert moved == 1
+        assert list(Category.select()) == [work]
+        assert Todo.select().where(Todo.category == work).count() == 3
+
+    def test_rename(self, categories_with_todos):
+        work, _, _ = categories_with_todos
+
+        renamed = work.rename("Office")
+
+        assert renamed.id == work.id
+        assert Category.get_by_id(work.id).name == "Office"
+
+    def test_rename_to_existing_name_merges(self, categories_with_todos):
+        work, home, _ = categories_with_todos
+
+        renamed = work.rename("Home")
+
+        assert renamed == home
+        assert not Category.select().where(Category.id == work.id).exists()
+        assert Todo.select().where(Todo.category == home).count() == 3
+
+    def test_delete_unused(self, categories_with_todos):
+        work, home, orphan = categories_with_todos
+
+        deleted = Category.delete_unused()
+
+        assert deleted == 1
+        assert set(Category.select()) == {work, home}
+
+    def test_delete_unused_only_among_given(self, categories_with_todos):
+        work, home, orphan = categories_with_todos
+        other_orphan = Category.create(name="Other orphan")
+
+        deleted = Category.delete_unused([work, orphan])
+
+        assert deleted == 1
+        assert set(Category.select()) == {work, home, other_orphan}
+
+
+class TestTodoStats:
+    def test_stats_follow_creation_and_deletion(self, categories_with_todos):
+        assert TodoStats.total() == 4
+        assert TodoStats.count_per_status() == {0: 4, 1: 0, 2: 0}
+        assert TodoStats.count_per_category() == {
+            "": 1, "Home": 1, "Work": 2
+        }
+
+        Todo.get(Todo.title == "Task 3").delete_instance()
+
+        assert TodoStats.total() == 3
+        assert TodoStats.count_per_category() == {"": 1, "Work": 2}
+
+    def test_stats_follow_status_changes(self, todos):
+        todos[0].promote()
+        todos[5].regress()
+
+        assert TodoStats.count_per_status() == {0: 1, 1: 4, 2: 1}
+
+    def test_stats_follow_category_changes(self, categories_with_todos):
+        work, home, _ = categories_with_todos
+
+        Category.merge([work], target=home)
+
+        assert TodoStats.count_per_category() == {"": 1, "Home": 3}
+
+    def test_average_age_per_status(self):
+        now = datetime(2021, 1, 11)
+        Todo.create(title="Task 1", created=datetime(2021, 1, 1))
+        Todo.create(title="Task 2", created=datetime(2021, 1, 5))
+        Todo.create(title="Task 3", created=datetime(2021, 1, 10), status=2)
+
+        ages = TodoStats.average_age_per_status(now=now)
+
+        assert ages[0].total_seconds() == pytest.approx(
+            timedelta(days=8).total_seconds()
+        )
+        assert ages[2].total_seconds() == pytest.approx(
+            timedelta(days=1).total_seconds()
+        )
+        assert 1 not in ages
+
+    def test_stats_are_filled_from_existing_todos(self, todos):
+        TodoStats.drop_table()
+
+        TodoStats.create_table()
+
+        assert TodoStats.count_per_status() == {0: 2, 1: 2, 2: 2}
+
+
+class TestTodoTransition:
+    def test_creation_is_recorded(self):
+        todo = Todo.create(title="Thing to do", created=datetime(2021, 1, 1))
+
+        transitions = list(todo.transitions)
+
+        assert len(transitions) == 1
+        assert transitions[0].from_status is None
+        assert transitions[0].to_status == Todo.CHOICES[0][0]
+        assert transitions[0].timestamp == datetime(2021, 1, 1)
+
+    def test_promote_and_regress_are_recorded(self):
+        todo = Todo.create(title="Thing to do")
+
+        todo.promote()
+        todo.promote()
+        todo.regress()
+        todo.regress()
+        todo.regress()  # no status change, nothing recorded
+
+        transitions = todo.transitions.order_by(TodoTransition.id)
+        assert [(t.from_status, t.to_status) for t in transitions] == [
+            (None, 0), (0, 1), (1, 2), (2, 1), (1, 0)
+        ]
+        assert transitions[-1].timestamp == todo.updated
+
+    def test_history_of_deleted_todos_is_removed(self):
+        todo = Todo.create(title="Thing to do")
+        todo.promote()
+        todo.promote()
+
+        todo.delete_instance()
+        new_todo = Todo.create(title="New thing")
+
+        # SQLite may give the new todo the id of the deleted one
+        assert [
+            (t.from_status, t.to_status)
+            for t in TodoTransition.select().order_by(TodoTransition.id)
+        ] == [(None, 0)]
+        assert TodoTransition.get().todo_id == new_todo.id
+
+    def test_history_is_filled_from_existing_todos(self, todos):
+        TodoTransition.drop_table()
+
+        TodoTransition.create_table()
+
+        transitions = todos[3].transitions.order_by(TodoTransition.id)
+        assert [
+            (t.from_status, t.to_status, t.timestamp) for t in transitions
+        ] == [
+            (None, 0, todos[3].created),
+            (0, 1, datetime(2021, 2, 2)),
+        ]
+        assert TodoTransition.select().count() == 10
+
+
+class TestRevisions:
+    def test_changed_rows_get_board_revision(self):
+        todo = Todo.create(title="Task")
+        assert Todo.get().revision == BoardRevision.current()
+
+        todo.promote()
+        assert Todo.get().revision == BoardRevision.current()
+
+    def test_deletion_leaves_tombstone(self):
+        todo = Todo.create(title="Task")
+        todo.delete_instance()
+
+        tombstone = Tombstone.get()
+        assert tombstone.uuid == todo.uuid
+        assert tombstone.table_name == "todo"
+        assert tombstone.revision == BoardRevision.current()
+
+    def test_uuids_are_unique(self):
+        first, second = Todo.create(title="1"), Todo.create(title="2")
+        assert first.uuid != second.uuid
+
+
+def test_create_tables_migrates_version_1(tmp_path):
+    database = pw.SqliteDatabase(str(tmp_path / "old.db"))
+    database.execute_sql(
+        "CREATE TABLE category (id INTEGER PRIMARY KEY, name VARCHAR(30))"
+    )
+    database.execute_sql(
+        "CREATE TABLE todo (id INTEGER PRIMARY KEY, title VARCHAR(100), "
+        "body TEXT, status INTEGER, category_id INTEGER, created DATETIME, "
+        "updated DATETIME)"
+    )
+    database.execute_sql(
+        "INSERT INTO todo (title, status, created, updated) "
+        "VALUES ('Old task', 0, '2021-01-01', '2021-01-01')"
+    )
+    database.pragma("user_version", 1)
+
+    with database.bind_ctx(MODELS):
+        create_tables()
+
+        assert database.pragma("user_version") == SCHEMA_VERSION
+        todo = Todo.get()
+        assert len(todo.uuid) == 32
+        todo.promote()
+        assert Todo.get().revision == BoardRevision.current() == 1
+    database.close()
+
+
+def test_migration_keeps_most_recently_updated_first(tmp_path):
+    database = pw.SqliteDatabase(str(tmp_path / "old.db"))
+    database.execute_sql(
+        "CREATE TABLE todo (id INTEGER PRIMARY KEY, title VARCHAR(100), "
+        "body TEXT, status INTEGER, category_id INTEGER, created DATETIME, "
+        "updated DATETIME, uuid VARCHAR(32), "
+        "revision INTEGER NOT NULL DEFAULT 0)"
+    )
+    for title, updated in (("Old", "2021-01-01"), ("Recent", "2021-02-01")):
+        database.execute_sql(
+            "INSERT INTO todo (title, status, created, updated, uuid) "
+            "VALUES (?, 0, '2021-01-01', ?, lower(hex(randomblob(16))))",
+            (title, updated),
+        )
+    database.pragma("user_version", 2)
+
+    with database.bind_ctx(MODELS):
+        create_tables()
+
+        todos = Todo.group_todos_per_status()[0]
+        assert [todo.title for todo in todos] == ["Recent", "Old"]
+    database.close()
+
+
+class TestRank:
+    def test_new_and_moved_todos_go_on_top(self):
+        first = Todo.create(title="Task 1")
+        second = Todo.create(title="Task 2")
+        assert second.rank < first.rank
+
+        first.promote()
+        second.promote()
+
+        assert Todo.group_todos_per_status()[1] == [second, first]
+
+    def test_move_between(self):
+        first, second, third = (
+            Todo.create(title=f"Task {number}") for number in range(3)
+        )
+
+        first.move_between(third, second)
+
+        assert Todo.group_todos_per_status()[0] == [third, first, second]
+
+    def test_columns_are_read_in_index_order(self):
+        query = Todo.select().order_by(Todo.status, Todo.category, Todo.rank)
+        sql, params = query.sql()
+        plan = " ".join(
+            str(row) for row in Todo._meta.database.execute_sql(
+                f"EXPLAIN QUERY PLAN {sql}", params
+            )
+        )
+
+        assert "todo_status_category_id_rank" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+class TestTags:
+    def test_set_tags(self):
+        todo = Todo.create(title="Task")
+
+        todo.set_tags(["ui", "bug"])
+        assert todo.tag_names() == ["bug", "ui"]
+
+        todo.set_tags(["bug"])
+        assert todo.tag_names() == ["bug"]
+        # Unused tags are removed
+        assert [tag.name for tag in Tag.select()] == ["bug"]
+
+    def test_postings(self):
+        first, second = Todo.create(title="1"), Todo.create(title="2")
+        first.set_tags(["bug", "ui"])
+        second.set_tags(["bug"])
+
+        assert Tag.postings() == {
+            "bug": {first.id, second.id}, "ui": {first.id}
+        }
+
+    def test_tags_of_deleted_todos_are_removed(self):
+        todo = Todo.create(title="Task")
+        todo.set_tags(["bug"])
+
+        todo.delete_instance()
+
+        assert TodoTag.select().count() == 0
+
+
+def test_group_todos_per_status_defers_body():
+    Todo.create(title="Task", body="Details")
+    database = Todo._meta.database
+
+    todo = Todo.group_todos_per_status()[0][0]
+    assert "body" not in todo.__data__
+
+    with patch.object(
+        database, "execute_sql", wraps=database.execute_sql
+    ) as execute_sql:
+        assert todo.body == "Details"
+        assert todo.body == "Details"
+    assert execute_sql.call_count == 1
+
+    # Saving the todo does not erase the body it did not read
+    other = Todo.group_todos_per_status()[0][0]
+    other.promote()
+    assert Todo.get().body == "Details"
+
+
+class TestChecklist:
+    def test_replace_items(self):
+        todo = Todo.create(title="Task")
+
+        ChecklistItem.replace_items(todo, [("First", True), ("Second", False)])
+        ChecklistItem.replace_items(todo, [("Second", True), ("Third", False)])
+
+        assert [
+            (item.text, item.done) for item in ChecklistItem.items_of(todo)
+        ] == [("Second", True), ("Third", False)]
+
+    def test_progress(self):
+        first, second, _ = (Todo.create(title=str(i)) for i in range(3))
+        ChecklistItem.replace_items(
+            first, [("a", True), ("b", False), ("c", True)]
+        )
+        ChecklistItem.replace_items(second, [("a", False)])
+
+        assert ChecklistItem.progress() == {
+            first.id: (2, 3), second.id: (0, 1)
+        }
+
+    def test_items_of_deleted_todos_are_removed(self):
+        todo = Todo.create(title="Task")
+        ChecklistItem.replace_items(todo, [("a", False)])
+
+        todo.delete_instance()
+
+        assert ChecklistItem.select().count() == 0
+
+
+class TestAttachments:
+    def test_files_of(self):
+        todo = Todo.create(title="Task")
+        Attachment.create(todo=todo, name="b.png", digest="2" * 64, size=1)
+        Attachment.create(todo=todo, name="a.log", digest="1" * 64, size=2)
+
+        assert [
+            attachment.name for attachment in Attachment.files_of(todo)
+        ] == ["a.log", "b.png"]
+
+    def test_attachments_of_deleted_todos_are_removed(self):
+        first, second = Todo.create(title="1"), Todo.create(title="2")
+        Attachment.create(todo=first, name="a", digest="1" * 64, size=1)
+        Attachment.create(todo=second, name="a", digest="1" * 64, size=1)
+        Attachment.create(todo=second, name="b", digest="2" * 64, size=1)
+
+        second.delete_instance()
+
+        assert Attachment.digests() == {"1" * 64}
+
+
+def test_create_tables_skips_current_schema(tmp_path):
+    database = pw.SqliteDatabase(str(tmp_path / "kanban.db"))
+    with database.bind_ctx(MODELS):
+        create_tables()
+        with patch.object(database, "create_tables") as create:
+            create_tables()
+        create.assert_not_called()
+
+        # Older versions are still upgraded
+        database.pragma("user_version", SCHEMA_VERSION - 1)
+        create_tables()
+        assert database.pragma("user_version") == SCHEMA_VERSION
+    database.close()
+
+
+def test_migration_removes_history_of_deleted_todos(tmp_path):
+    database = pw.SqliteDatabase(str(tmp_path / "kanban.db"))
+    with database.bind_ctx(MODELS):
+        create_tables()
+        todo = Todo.create(title="Task")
+        TodoTransition.create(todo=todo.id + 1, to_status=2)
+        database.pragma("user_version", 9)
+
+        create_tables()
+
+        assert [t.todo_id for t in TodoTransition.select()] == [todo.id]
+    database.close()
+
+
+class TestLazyDatabase:
+    def test_file_is_chosen_on_first_connection(self, tmp_path):
+        path = str(tmp_path / "board.db")
+        database = LazySqliteDatabase()
+        assert database.deferred
+
+        with patch(
+            "python_kanban.models.settings", Settings({"DB_FILE": path})
+        ):
+            database.connect()
+        database.close()
+
+        assert database.database == path
+        assert os.path.exists(path)
+
+    def test_file_given_before_wins(self, tmp_path):
+        path = str(tmp_path / "board.db")
+        database = LazySqliteDatabase()
+        database.init(path)
+
+        with patch("python_kanban.models.settings") as settings:
+            database.connect()
+        database.close()
+
+        settings.get.assert_not_called()
+        assert database.database == path
+
+    def test_database_file(self):
+        # The tests bind the models to an in-memory database
+        assert database_file() == ":memory:"
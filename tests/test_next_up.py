@@ -0,0 +1,50 @@
+from datetime import date
+
+from python_kanban.models import Todo
+from python_kanban.next_up import format_next_up, is_overdue, next_up
+
+
+HIGH, NORMAL, LOW = (priority for priority, _ in Todo.PRIORITIES)
+TODO, DOING, DONE = (status for status, _ in Todo.CHOICES)
+
+
+def test_next_up_orders_by_priority_then_due_date():
+    Todo.create(title="Low", priority=LOW, due=date(2021, 1, 1))
+    Todo.create(title="Normal without due", priority=NORMAL)
+    Todo.create(
+        title="Normal late", priority=NORMAL, due=date(2021, 3, 1),
+        status=DOING,
+    )
+    Todo.create(title="Normal soon", priority=NORMAL, due=date(2021, 2, 1))
+    Todo.create(title="High", priority=HIGH, status=DOING)
+    Todo.create(title="Finished", priority=HIGH, status=DONE)
+
+    assert [todo.title for todo in next_up(limit=10)] == [
+        "High", "Normal soon", "Normal late", "Normal without due", "Low"
+    ]
+    assert [todo.title for todo in next_up(limit=2)] == [
+        "High", "Normal soon"
+    ]
+
+
+def test_is_overdue():
+    today = date(2021, 2, 1)
+    late = Todo.create(title="Late", due=date(2021, 1, 31))
+    done = Todo.create(title="Done", due=date(2021, 1, 31), status=DONE)
+    on_time = Todo.create(title="On time", due=today)
+
+    assert is_overdue(late, today)
+    assert not is_overdue(done, today)
+    assert not is_overdue(on_time, today)
+    assert not is_overdue(Todo.create(title="No due date"), today)
+
+
+def test_format_next_up():
+    Todo.create_todo_with_category(
+        title="Late", due=date(2021, 1, 31), category_name="Work"
+    )
+
+    text = format_next_up(next_up(), today=date(2021, 2, 1))
+
+    assert text == "Normal  2021-01-31  To do        [Work] Late (overdue)"
+    assert format_next_up([]) == "Nothing to do."
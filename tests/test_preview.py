@@ -0,0 +1,49 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+from python_kanban.preview import PreviewCache, render_markdown
+
+
+def test_render_markdown():
+    text = (
+        "# Title\n"
+        "Some **bold**, *italic*, `code` and a [link](http://x).\n"
+        "- item\n"
+        "> quote\n"
+        "```\n"
+        "*not italic*\n"
+        "```"
+    )
+
+    assert render_markdown(text) == [
+        ("bold underline", "Title"), ("", "\n"),
+        ("", "Some "), ("bold", "bold"), ("", ", "), ("italic", "italic"),
+        ("", ", "), ("fg:ansicyan", "code"), ("", " and a "),
+        ("underline", "link"), ("", "."), ("", "\n"),
+        ("", "• "), ("", "item"), ("", "\n"),
+        ("italic fg:ansigray", "quote"), ("", "\n"),
+        ("fg:ansicyan", "  *not italic*\n"),
+    ]
+
+
+def test_render_empty_body():
+    assert render_markdown("") == []
+    assert render_markdown(None) == []
+
+
+def test_preview_cache():
+    cache = PreviewCache(size=1)
+    todo = SimpleNamespace(id=1, updated=datetime(2021, 1, 1), body="old")
+
+    assert cache.get(todo) == [("", "old"), ("", "\n")]
+    # Same id and time: the cached preview is used
+    todo.body = "new"
+    assert cache.get(todo) == [("", "old"), ("", "\n")]
+
+    todo.updated = datetime(2021, 1, 2)
+    assert cache.get(todo) == [("", "new"), ("", "\n")]
+    assert len(cache._previews) == 1
+
+    todo.body = "newer"
+    cache.clear()
+    assert cache.get(todo) == [("", "newer"), ("", "\n")]
@@ -0,0 +1,39 @@
+import random
+
+import pytest
+
+from python_kanban.ranks import (
+    FIRST_RANK, RankError, rank_between, ranks_after
+)
+
+
+def test_first_rank():
+    assert rank_between(None, None) == FIRST_RANK
+
+
+def test_ranks_at_both_ends_stay_short():
+    ranks = [FIRST_RANK]
+    for _ in range(5000):
+        ranks.insert(0, rank_between(None, ranks[0]))
+        ranks.append(rank_between(ranks[-1], None))
+
+    assert ranks == sorted(ranks)
+    assert len(set(ranks)) == len(ranks)
+    assert max(len(rank) for rank in ranks) <= 4
+
+
+def test_ranks_between_neighbours_keep_order():
+    generator = random.Random(0)
+    ranks = ranks_after(None, 10)
+    for _ in range(2000):
+        position = generator.randrange(len(ranks) - 1)
+        rank = rank_between(ranks[position], ranks[position + 1])
+        assert ranks[position] < rank < ranks[position + 1]
+        ranks.insert(position + 1, rank)
+
+
+def test_invalid_bounds():
+    with pytest.raises(RankError):
+        rank_between("a1", "a0")
+    with pytest.raises(RankError):
+        rank_between("a10", None)
@@ -0,0 +1,175 @@
+from datetime import date
+
+import pytest
+from mock import patch
+
+from python_kanban.models import Category, Recurrence, Todo
+from python_kanban.recurrence import (
+    RecurrenceError, Rule, anchor_rule, first_date, format_rule, next_date,
+    next_date_after, parse_rule,
+)
+
+
+# A Monday
+MONDAY = date(2021, 3, 1)
+
+
+@pytest.mark.parametrize(
+    "text,rule",
+    [
+        ("daily", Rule("day")),
+        ("Weekly", Rule("week")),
+        ("monthly", Rule("month")),
+        ("every 3 days", Rule("day", 3)),
+        ("every 1 week", Rule("week")),
+        ("every  2 weeks on fri, mon", Rule("week", 2, weekdays=(0, 4))),
+        ("weekly on Thursday", Rule("week", weekdays=(3,))),
+        ("monthly on 31", Rule("month", monthday=31)),
+    ],
+)
+def test_parse_rule(text, rule):
+    assert parse_rule(text) == rule
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "", "hourly", "every day", "every 0 days", "daily on mon",
+        "weekly on someday", "monthly on 32", "monthly on mon",
+    ],
+)
+def test_parse_invalid_rule(text):
+    with pytest.raises(RecurrenceError):
+        parse_rule(text)
+
+
+@pytest.mark.parametrize(
+    "text,current,expected",
+    [
+        ("daily", MONDAY, date(2021, 3, 2)),
+        ("every 3 days", date(2021, 2, 27), date(2021, 3, 2)),
+        ("weekly", MONDAY, date(2021, 3, 8)),
+        ("weekly on mon,thu", MONDAY, date(2021, 3, 4)),
+        ("weekly on mon,thu", date(2021, 3, 4), date(2021, 3, 8)),
+        ("every 2 weeks on mon,thu", date(2021, 3, 4), date(2021, 3, 15)),
+        ("monthly", date(2021, 1, 15), date(2021, 2, 15)),
+        ("monthly on 31", date(2021, 1, 31), date(2021, 2, 28)),
+        ("monthly on 31", date(2021, 2, 28), date(2021, 3, 31)),
+        ("every 3 months", date(2021, 11, 5), date(2022, 2, 5)),
+    ],
+)
+def test_next_date(text, current, expected):
+    assert next_date(parse_rule(text), current) == expected
+
+
+def test_first_date():
+    assert first_date(parse_rule("daily"), MONDAY) == MONDAY
+    assert first_date(parse_rule("weekly on wed"), MONDAY) == date(2021, 3, 3)
+    assert first_date(parse_rule("monthly on 15"), MONDAY) == date(2021, 3, 15)
+    assert first_date(
+        parse_rule("monthly on 15"), date(2021, 3, 16)
+    ) == date(2021, 4, 15)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "daily", "weekly", "monthly", "every 3 days",
+        "every 2 weeks on mon,fri", "weekly on thu", "every 3 months on 31",
+    ],
+)
+def test_format_rule(text):
+    assert format_rule(parse_rule(text)) == text
+
+
+def test_monthly_rules_keep_their_start_day():
+    rule = anchor_rule(parse_rule("monthly"), date(2021, 1, 31))
+    assert format_rule(rule) == "monthly on 31"
+
+    dates = [date(2021, 1, 31)]
+    for _ in range(3):
+        dates.append(next_date(rule, dates[-1]))
+    assert dates[1:] == [
+        date(2021, 2, 28), date(2021, 3, 31), date(2021, 4, 30)
+    ]
+
+    assert anchor_rule(parse_rule("monthly on 15"), MONDAY).monthday == 15
+    assert anchor_rule(parse_rule("weekly"), MONDAY) == Rule("week")
+
+
+def test_missed_occurrences_are_skipped():
+    assert next_date_after(
+        parse_rule("weekly"), date(2021, 1, 4), MONDAY
+    ) == date(2021, 3, 8)
+
+
+class TestMaterializeDue:
+    def test_due_recurrences_become_todos(self):
+        category = Category.create(name="Home")
+        existing = Todo.create(title="Existing", category=category)
+        Recurrence.create(
+            title="Trash", body="Both bins", category=category, priority=0,
+            rule="weekly on mon", next_run=MONDAY,
+        )
+        Recurrence.create(title="Plants", rule="every 3 days", next_run=MONDAY)
+        Recurrence.create(
+            title="Later", rule="daily", next_run=date(2021, 3, 2)
+        )
+
+        assert Recurrence.materialize_due(MONDAY) == 2
+
+        trash = Todo.get(Todo.title == "Trash")
+        assert trash.body == "Both bins"
+        assert trash.category == category
+        assert trash.priority == 0
+        assert trash.status == 0
+        assert trash.due == MONDAY
+        assert len(trash.uuid) == 32
+        # On top of its category
+        assert trash.rank < existing.rank
+        assert Todo.get(Todo.title == "Plants").category is None
+        assert not Todo.select().where(Todo.title == "Later").exists()
+
+        next_runs = dict(Recurrence.select(
+            Recurrence.title, Recurrence.next_run
+        ).tuples())
+        assert next_runs == {
+            "Trash": date(2021, 3, 8),
+            "Plants": date(2021, 3, 4),
+            "Later": date(2021, 3, 2),
+        }
+        # Nothing is due anymore
+        assert Recurrence.materialize_due(MONDAY) == 0
+
+    def test_todos_are_inserted_in_batches(self):
+        for number in range(3):
+            Recurrence.create(
+                title=f"Chore {number}", rule="daily", next_run=MONDAY
+            )
+
+        with patch.object(
+            Todo, "insert_many", wraps=Todo.insert_many
+        ) as insert_many, patch.object(Todo, "save") as save:
+            assert Recurrence.materialize_due(MONDAY) == 3
+
+        insert_many.assert_called_once()
+        save.assert_not_called()
+        ranks = [todo.rank for todo in Todo.select().order_by(Todo.rank)]
+        assert len(set(ranks)) == 3
+
+    def test_categories_stay_with_recurrences(self):
+        house = Category.create(name="House")
+        Category.create(name="Unused")
+        recurrence = Recurrence.create(
+            title="Trash", category=house, rule="daily", next_run=MONDAY
+        )
+
+        assert Category.delete_unused() == 1
+        assert Category.get_by_id(house.id)
+
+        home = Category.create(name="Home")
+        Category.merge([house], target=home)
+        assert Recurrence.get_by_id(recurrence.id).category == home
+
+        home.delete_instance()
+        assert Recurrence.get_by_id(recurrence.id).category is None
@@ -0,0 +1,125 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from python_kanban.models import Todo
+from python_kanban.reports import (
+    compute_report, daily_flow, format_report, percentiles
+)
+
+
+def move(todo, status, moment):
+    """Change the status of a todo at a given time, as `promote` would do"""
+    todo.status = status
+    todo.updated = moment
+    todo.save()
+
+
+@pytest.fixture
+def history():
+    """Three todos created on Jan 1st 2021 (a Friday):
+    - The first one is started on the 2nd and finished on the 4th;
+    - The second one is started on the 4th and finished on the 8th;
+    - The third one is never started.
+    """
+    created = datetime(2021, 1, 1)
+    first = Todo.create(title="Task 1", created=created)
+    second = Todo.create(title="Task 2", created=created)
+    Todo.create(title="Task 3", created=created)
+
+    move(first, 1, datetime(2021, 1, 2))
+    move(first, 2, datetime(2021, 1, 4))
+    move(second, 1, datetime(2021, 1, 4))
+    move(second, 2, datetime(2021, 1, 8))
+
+
+def test_cumulative_flow(history):
+    report = compute_report(days=5)
+
+    assert report.cumulative_flow == [
+        (date(2021, 1, 4), {0: 1, 1: 1, 2: 1}),
+        (date(2021, 1, 5), {0: 1, 1: 1, 2: 1}),
+        (date(2021, 1, 6), {0: 1, 1: 1, 2: 1}),
+        (date(2021, 1, 7), {0: 1, 1: 1, 2: 1}),
+        (date(2021, 1, 8), {0: 1, 1: 0, 2: 2}),
+    ]
+
+
+def test_cumulative_flow_before_first_activity(history):
+    report = compute_report(days=9)
+
+    assert report.cumulative_flow[0] == (
+        date(2020, 12, 31), {0: 0, 1: 0, 2: 0}
+    )
+    assert report.cumulative_flow[1] == (date(2021, 1, 1), {0: 3, 1: 0, 2: 0})
+
+
+def test_cumulative_flow_after_idle_days():
+    for day in (1, 2, 10):
+        Todo.create(title=f"Task {day}", created=datetime(2021, 1, day))
+
+    report = compute_report(days=3)
+
+    assert report.cumulative_flow == [
+        (date(2021, 1, 8), {0: 2, 1: 0, 2: 0}),
+        (date(2021, 1, 9), {0: 2, 1: 0, 2: 0}),
+        (date(2021, 1, 10), {0: 3, 1: 0, 2: 0}),
+    ]
+
+
+def test_weekly_throughput(history):
+    report = compute_report()
+
+    # The 4th and the 8th are in the first ISO week of 2021
+    assert report.throughput == {(2021, 1): 2}
+
+
+def test_cycle_time(history):
+    report = compute_report()
+
+    assert report.cycle_time == {
+        50: timedelta(days=2), 85: timedelta(days=4), 95: timedelta(days=4)
+    }
+
+
+def test_percentiles():
+    values = [timedelta(days=day) for day in range(1, 11)]
+
+    assert percentiles(values, (10, 50, 90, 100)) == {
+        10: timedelta(days=1),
+        50: timedelta(days=5),
+        90: timedelta(days=9),
+        100: timedelta(days=10),
+    }
+    assert percentiles([], (50,)) == {}
+
+
+def test_format_report(history):
+    text = format_report(compute_report(days=2))
+
+    assert "2021-01-08      1            0      2" in text
+    assert "2021-W01  2" in text
+    assert "50th percentile: 2 days, 0:00:00" in text
+
+
+def test_format_empty_report():
+    text = format_report(compute_report())
+
+    assert "No finished tasks yet." in text
+
+
+def test_daily_flow(history):
+    flow = daily_flow()
+
+    assert [day for day, _ in flow] == [
+        date(2021, 1, day) for day in range(1, 9)
+    ]
+    assert flow[0][1] == {0: 3, 1: 0, 2: 0}
+    assert flow[1][1] == {0: 2, 1: 1, 2: 0}
+    assert flow[2][1] == flow[1][1]  # no activity on the 3rd
+    assert flow[3][1] == {0: 1, 1: 1, 2: 1}
+    assert flow[-1][1] == {0: 1, 1: 0, 2: 2}
+
+
+def test_daily_flow_without_history():
+    assert daily_flow() == []
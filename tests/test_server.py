@@ -0,0 +1,280 @@
+import asyncio
+import json
+from datetime import date
+
+import pytest
+
+from python_kanban.models import BoardRevision, Category, Todo, TodoDependency
+from python_kanban.server import KanbanServer, Request, read_request
+
+
+def run(coroutine):
+    """Like `asyncio.run`, but leaving the current event loop untouched, as
+    other tests need it
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def call(method, path, query=None, headers=None, body=None):
+    request = Request(
+        method,
+        path,
+        query or {},
+        headers or {},
+        json.dumps(body).encode() if body is not None else b"",
+    )
+    return run(KanbanServer().dispatch(request))
+
+
+@pytest.fixture
+def todos():
+    category = Category.create(name="Work")
+    return [
+        Todo.create(title=f"Task {i}", status=i % 3, category=category)
+        for i in range(1, 6)
+    ]
+
+
+def test_list_statuses():
+    response = call("GET", "/statuses")
+
+    assert response.status == 200
+    assert response.body[0] == {"id": 0, "name": "To do"}
+
+
+def test_list_categories(todos):
+    response = call("GET", "/categories")
+
+    assert response.body == [{"id": 1, "name": "Work", "todo_count": 5}]
+
+
+def test_todos_are_paginated_by_id(todos):
+    first_page = call("GET", "/todos", {"limit": "2"})
+
+    assert [todo["id"] for todo in first_page.body["items"]] == [1, 2]
+    assert first_page.body["next"] == 2
+
+    last_page = call("GET", "/todos", {"limit": "3", "after": "2"})
+
+    assert [todo["id"] for todo in last_page.body["items"]] == [3, 4, 5]
+    assert last_page.body["next"] is None
+
+
+def test_todos_filters(todos):
+    by_status = call("GET", "/todos", {"status": "1"})
+    by_category = call("GET", "/todos", {"category": "Home"})
+
+    assert [todo["title"] for todo in by_status.body["items"]] == [
+        "Task 1", "Task 4"
+    ]
+    assert by_category.body["items"] == []
+
+
+def test_etag_follows_board_revision(todos):
+    response = call("GET", "/todos")
+    etag = response.headers["ETag"]
+
+    assert call(
+        "GET", "/todos", headers={"if-none-match": etag}
+    ).status == 304
+
+    todos[0].promote()
+
+    assert call(
+        "GET", "/todos", headers={"if-none-match": etag}
+    ).status == 200
+
+
+def test_create_todo():
+    response = call(
+        "POST", "/todos", body={"title": "New", "category": "Home"}
+    )
+
+    assert response.status == 201
+    assert response.body["title"] == "New"
+    assert response.body["category"] == "Home"
+    assert Todo.select().count() == 1
+
+
+def test_create_todo_validation():
+    response = call("POST", "/todos", body={"title": ""})
+
+    assert response.status == 400
+    assert Todo.select().count() == 0
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"title": 1},
+        {"title": "New", "body": ["Details"]},
+        {"title": "New", "status": 3},
+        {"title": "New", "status": "1"},
+        {"title": "New", "status": True},
+        {"title": "New", "due": "tomorrow"},
+        {"title": "New", "due": 20210501},
+        {"title": "New", "priority": 3},
+        {"title": "New", "priority": "High"},
+    ],
+)
+def test_create_todo_refuses_bad_types(body):
+    response = call("POST", "/todos", body=body)
+
+    assert response.status == 400
+    assert Todo.select().count() == 0
+
+
+def test_create_todo_with_due_date_and_priority():
+    response = call(
+        "POST", "/todos",
+        body={"title": "New", "due": "2021-05-01", "priority": 0},
+    )
+
+    assert response.status == 201
+    assert response.body["due"] == "2021-05-01"
+    assert response.body["priority"] == 0
+    todo = Todo.get()
+    assert todo.due == date(2021, 5, 1)
+    assert todo.priority == 0
+
+
+def test_create_todo_with_status():
+    response = call("POST", "/todos", body={"title": "New", "status": 1})
+
+    assert response.status == 201
+    assert Todo.get().status == 1
+
+
+def test_update_todo(todos):
+    response = call("PATCH", "/todos/1", body={"body": "Details"})
+
+    assert response.status == 200
+    assert response.body["title"] == "Task 1"
+    assert response.body["body"] == "Details"
+    assert response.body["category"] == "Work"
+
+
+@pytest.mark.parametrize(
+    "body", [{"title": None}, {"body": 5}, {"status": -1}, {"status": None}]
+)
+def test_update_todo_refuses_bad_types(todos, body):
+    assert call("PATCH", "/todos/1", body=body).status == 400
+    assert Todo.get_by_id(1).title == "Task 1"
+
+
+def test_update_todo_status(todos):
+    response = call("PATCH", "/todos/1", body={"status": 0})
+
+    assert response.status == 200
+    assert response.body["status"] == 0
+    assert response.body["title"] == "Task 1"
+    assert Todo.get_by_id(1).status == 0
+
+
+def test_update_todo_due_date_and_priority(todos):
+    Todo.update(due=date(2021, 5, 1)).execute()
+
+    response = call("PATCH", "/todos/1", body={"priority": 2})
+    assert response.body["due"] == "2021-05-01"
+    assert response.body["priority"] == 2
+
+    response = call("PATCH", "/todos/1", body={"due": None})
+    assert response.body["due"] is None
+    assert response.body["priority"] == 2
+    assert Todo.get_by_id(1).due is None
+
+
+def test_promote_regress_and_delete(todos):
+    assert call("POST", "/todos/1/promote").body["status"] == 2
+    assert call("POST", "/todos/1/regress").body["status"] == 1
+    assert call("DELETE", "/todos/1").status == 204
+    assert call("GET", "/todos/1").status == 404
+
+
+def test_errors():
+    assert call("GET", "/nope").status == 404
+    assert call("PUT", "/todos").status == 405
+    assert call("GET", "/todos", {"limit": "many"}).status == 400
+    assert call("POST", "/todos", body=[1]).status == 400
+
+
+def test_long_poll_answers_at_once_when_already_changed(todos):
+    revision = BoardRevision.current()
+
+    response = call("GET", "/changes", {"since": str(revision - 1)})
+
+    assert response.body == {"revision": revision, "changed": True}
+
+
+def test_long_poll_times_out():
+    revision = BoardRevision.current()
+
+    response = call(
+        "GET", "/changes", {"since": str(revision), "timeout": "0"}
+    )
+
+    assert response.body == {"revision": revision, "changed": False}
+
+
+def test_long_poll_wakes_up_on_change():
+    server = KanbanServer()
+    revision = BoardRevision.current()
+
+    async def change_later():
+        await asyncio.sleep(0.1)
+        Todo.create(title="New")
+
+    async def poll():
+        request = Request(
+            "GET", "/changes", {"since": str(revision), "timeout": "5"}, {}
+        )
+        response, _ = await asyncio.gather(
+            server.dispatch(request), change_later()
+        )
+        return response
+
+    response = run(poll())
+
+    assert response.body["changed"]
+
+
+def test_read_request_and_encode_response(todos):
+    async def roundtrip():
+        reader = asyncio.StreamReader()
+        reader.feed_data(
+            b"POST /todos/1/promote?x=1 HTTP/1.1\r\n"
+            b"Host: localhost\r\nContent-Length: 2\r\n\r\n{}"
+        )
+        reader.feed_eof()
+        return await read_request(reader)
+
+    request = run(roundtrip())
+
+    assert request.method == "POST"
+    assert request.path == "/todos/1/promote"
+    assert request.query == {"x": "1"}
+    assert request.body == b"{}"
+
+    encoded = run(KanbanServer().dispatch(request)).encode()
+
+    assert encoded.startswith(b"HTTP/1.1 200 OK\r\n")
+    assert json.loads(encoded.split(b"\r\n\r\n", 1)[1])["status"] == 2
+
+
+def test_blocked_todos_cannot_be_promoted(todos):
+    TodoDependency.link(todos[2], todos[0])
+
+    response = call("POST", f"/todos/{todos[2].id}/promote")
+
+    assert response.status == 409
+    assert response.encode().startswith(b"HTTP/1.1 409 Conflict\r\n")
+    assert Todo.get_by_id(todos[2].id).status == todos[2].status
+    response = call(
+        "PATCH", f"/todos/{todos[2].id}", body={"status": 2}
+    )
+    assert response.status == 409
+    assert Todo.get_by_id(todos[2].id).status == todos[2].status
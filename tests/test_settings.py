@@ -0,0 +1,89 @@
+import os
+
+import pytest
+from mock import patch
+
+from python_kanban.settings import (
+    LOADER_VARIABLE, Settings, create_settings, load_settings
+)
+
+
+@pytest.fixture
+def settings_files(tmp_path):
+    settings_file = tmp_path / "settings.toml"
+    settings_file.write_text(
+        'db_file = "board.db"\n'
+        "COLUMN_WEIGHTS = [1, 2, 1]\n"
+        'KEYS = {promote = "P"}\n'
+    )
+    secrets_file = tmp_path / ".secrets.toml"
+    secrets_file.write_text('DB_FILE = "secret.db"\n')
+    return [str(settings_file), str(secrets_file)]
+
+
+def test_load_settings(settings_files):
+    values = load_settings(settings_files, environment={})
+
+    assert values == {
+        "DB_FILE": "secret.db",
+        "COLUMN_WEIGHTS": [1, 2, 1],
+        "KEYS": {"promote": "P"},
+    }
+
+
+def test_environment_wins(settings_files):
+    values = load_settings(
+        settings_files,
+        environment={
+            "DYNACONF_DB_FILE": "other.db",
+            "DYNACONF_compact": "true",
+            "DYNACONF_AUTO_BACKUP_MINUTES": "15",
+            "DYNACONF_COLUMN_WEIGHTS": "[2, 1, 1]",
+            "HOME": "/root",
+        },
+    )
+
+    assert values["DB_FILE"] == "other.db"
+    assert values["COMPACT"] is True
+    assert values["AUTO_BACKUP_MINUTES"] == 15
+    assert values["COLUMN_WEIGHTS"] == [2, 1, 1]
+    assert "HOME" not in values
+
+
+def test_missing_files_are_skipped(tmp_path):
+    assert load_settings([str(tmp_path / "missing.toml")], {}) == {}
+
+
+def test_settings_access():
+    settings = Settings({"DB_FILE": "board.db"})
+
+    assert settings.get("db_file") == "board.db"
+    assert settings.get("KEYMAP", "vim") == "vim"
+    assert "DB_FILE" in settings
+    assert "KEYMAP" not in settings
+    assert settings.DB_FILE == "board.db"
+    with pytest.raises(AttributeError):
+        settings.KEYMAP
+
+
+def test_settings_are_loaded_on_first_use(settings_files):
+    settings = Settings()
+
+    with patch(
+        "python_kanban.settings.load_settings",
+        return_value={"DB_FILE": "board.db"},
+    ) as load:
+        assert settings.get("DB_FILE") == "board.db"
+        assert settings.get("KEYMAP") is None
+        settings.reload()
+        assert "DB_FILE" in settings
+    assert load.call_count == 2
+
+
+def test_dynaconf_loader():
+    with patch.dict(os.environ, {LOADER_VARIABLE: "dynaconf"}):
+        settings = create_settings()
+    assert not isinstance(settings, Settings)
+
+    with patch.dict(os.environ, {"DYNACONF_SORT_MODE": "title"}):
+        assert settings.get("SORT_MODE") == "title"
@@ -0,0 +1,141 @@
+import os
+from datetime import date
+
+import pytest
+from mock import patch
+
+from python_kanban.cli import main
+from python_kanban.models import Todo
+from python_kanban.snapshot import (
+    HEADER, Snapshot, SnapshotCard, SnapshotError, SnapshotWriter,
+    encode_record, pack_snapshot,
+)
+from python_kanban.storage import create_repository
+from python_kanban.storage.sqlite import SqliteRepository
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "kanban.snapshot")
+
+
+def test_counts_and_top_cards(path):
+    repository = SqliteRepository()
+    repository.create_todo(title="Low", priority=2)
+    repository.create_todo(
+        category_name="Work", title="Überweisung", due=date(2021, 3, 1)
+    )
+    repository.create_todo(title="Doing", status=1)
+
+    SnapshotWriter(path).update(repository)
+
+    with Snapshot(path) as snapshot:
+        assert snapshot.counts() == {0: 2, 1: 1, 2: 0}
+        assert snapshot.count(2) == 0
+        assert snapshot.revision == repository.revision()
+        todo_cards = snapshot.top(0, 10)
+        assert [card.title for card in todo_cards] == ["Low", "Überweisung"]
+        assert todo_cards[0] == SnapshotCard(1, "Low", "", 2, None)
+        assert todo_cards[1].category == "Work"
+        assert todo_cards[1].due == date(2021, 3, 1)
+        assert snapshot.top(0, 1) == todo_cards[:1]
+        assert snapshot.top(1, 10)[0].title == "Doing"
+        assert snapshot.top(2, 10) == []
+
+
+def test_top_reads_only_the_requested_records(path):
+    repository = SqliteRepository()
+    for title in ("Third", "Second", "First"):
+        repository.create_todo(title=title)
+    SnapshotWriter(path).update(repository)
+    # Break the title of the last record
+    with open(path, "r+b") as snapshot:
+        snapshot.seek(-1, os.SEEK_END)
+        snapshot.write(b"\xff")
+
+    with Snapshot(path) as snapshot:
+        assert [card.title for card in snapshot.top(0, 2)] == [
+            "First", "Second"
+        ]
+        with pytest.raises(UnicodeDecodeError):
+            snapshot.top(0, 3)
+
+
+def test_writer_skips_unchanged_boards(path):
+    repository = SqliteRepository()
+    todo = repository.create_todo(title="Task")
+    writer = SnapshotWriter(path)
+
+    assert writer.update(repository)
+    with patch.object(
+        repository, "group_todos_per_status"
+    ) as group_todos_per_status:
+        assert not writer.update(repository)
+    group_todos_per_status.assert_not_called()
+
+    repository.promote(todo)
+    assert writer.update(repository)
+    with Snapshot(path) as snapshot:
+        assert snapshot.counts() == {0: 0, 1: 1, 2: 0}
+
+
+def test_writer_only_encodes_changed_todos(path):
+    repository = SqliteRepository()
+    first = repository.create_todo(title="First")
+    repository.create_todo(title="Second")
+    writer = SnapshotWriter(path)
+    writer.update(repository)
+
+    repository.update_todo(first, title="First, renamed")
+    with patch(
+        "python_kanban.snapshot.encode_record",
+        wraps=encode_record,
+    ) as encode:
+        writer.update(repository)
+    assert encode.call_count == 1
+
+    with Snapshot(path) as snapshot:
+        assert {card.title for card in snapshot.top(0, 10)} == {
+            "First, renamed", "Second"
+        }
+
+
+def test_writer_without_revision_compares_the_content(path, tmp_path):
+    repository = create_repository("memory")
+    repository.create_todo(title="Task")
+    writer = SnapshotWriter(path)
+
+    assert writer.update(repository)
+    assert not writer.update(repository)
+    repository.create_todo(title="Another")
+    assert writer.update(repository)
+    # Nothing is left besides the snapshot
+    assert os.listdir(tmp_path) == ["kanban.snapshot"]
+
+
+def test_invalid_files(path):
+    with open(path, "wb") as snapshot:
+        snapshot.write(b"short")
+    with pytest.raises(SnapshotError):
+        Snapshot(path)
+
+    with open(path, "wb") as snapshot:
+        snapshot.write(b"NOPE" + pack_snapshot([])[4:])
+    with pytest.raises(SnapshotError, match="Not a board snapshot"):
+        Snapshot(path)
+
+    with open(path, "wb") as snapshot:
+        # Two statuses announced, none written
+        snapshot.write(HEADER.pack(b"PKBS", 1, 2, 0, 0.0))
+    with pytest.raises(SnapshotError):
+        Snapshot(path)
+
+
+def test_snapshot_command(path, capsys):
+    Todo.create(title="Task 1")
+
+    main(["snapshot", "--output", path])
+
+    assert capsys.readouterr().out.strip() == path
+    with Snapshot(path) as snapshot:
+        assert snapshot.count(0) == 1
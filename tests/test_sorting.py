@@ -0,0 +1,74 @@
+from datetime import datetime
+
+from mock import patch
+
+from python_kanban.models import Todo
+from python_kanban.sorting import (
+    DEFAULT_SORT_MODE, SORT_KEYS, SORT_MODES, insert_sorted, next_sort_mode,
+    validate_sort_mode,
+)
+
+
+def titles(todos):
+    return [todo.title for todo in todos]
+
+
+def test_every_mode_matches_database_order():
+    Todo.create_todo_with_category(
+        title="b", category_name="Z", created=datetime(2021, 1, 3)
+    )
+    Todo.create_todo_with_category(
+        title="c", category_name="A", created=datetime(2021, 1, 1)
+    )
+    Todo.create_todo_with_category(title="a", created=datetime(2021, 1, 2))
+    Todo.create_todo_with_category(
+        title="d", category_name="Z", created=datetime(2021, 1, 2)
+    )
+
+    for mode in SORT_MODES:
+        todos = Todo.group_todos_per_status(mode)[0]
+        assert todos == sorted(todos, key=SORT_KEYS[mode]), mode
+
+    assert titles(Todo.group_todos_per_status("title")[0]) == [
+        "a", "b", "c", "d"
+    ]
+    assert titles(Todo.group_todos_per_status("created")[0]) == [
+        "b", "d", "a", "c"
+    ]
+    assert titles(Todo.group_todos_per_status("category")[0]) == [
+        "a", "c", "d", "b"
+    ]
+
+
+def test_insert_sorted():
+    todos = [Todo.create(title=title) for title in ("a", "c", "e")]
+    new_todo = Todo.create(title="d")
+
+    position = insert_sorted(todos, new_todo, "title")
+
+    assert position == 2
+    assert titles(todos) == ["a", "c", "d", "e"]
+
+
+def test_sort_mode_helpers():
+    assert validate_sort_mode(None) == DEFAULT_SORT_MODE
+    assert validate_sort_mode("title") == "title"
+    modes = list(SORT_MODES)
+    assert next_sort_mode(modes[-1]) == modes[0]
+
+
+def test_every_mode_reads_an_index():
+    database = Todo._meta.database
+    for mode in SORT_MODES:
+        with patch.object(
+            database, "execute_sql", wraps=database.execute_sql
+        ) as execute_sql:
+            Todo.group_todos_per_status(mode)
+        sql, params = execute_sql.call_args[0][:2]
+
+        plan = " ".join(
+            str(row) for row in database.execute_sql(
+                f"EXPLAIN QUERY PLAN {sql}", params
+            )
+        )
+        assert "TEMP B-TREE" not in plan, mode
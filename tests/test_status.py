@@ -0,0 +1,133 @@
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+
+import peewee as pw
+import pytest
+from mock import patch
+
+from python_kanban.cli import main
+from python_kanban.models import MODELS, Todo, create_tables
+from python_kanban.settings import Settings
+from python_kanban.snapshot import SnapshotWriter
+from python_kanban.status import (
+    FORMATS, STATUS_KEYS, StatusError, count_from_database, count_todos,
+    format_status,
+)
+from python_kanban.storage import create_repository
+
+
+# Most of it is the start of the interpreter itself
+STARTUP_BUDGET = 0.5
+
+
+@pytest.fixture
+def database_path(tmp_path):
+    path = str(tmp_path / "kanban.db")
+    database = pw.SqliteDatabase(path)
+    with database.bind_ctx(MODELS):
+        create_tables()
+        for title, status in (("A", 0), ("B", 0), ("C", 1), ("D", 2)):
+            Todo.create(title=title, status=status)
+    database.close()
+    return path
+
+
+def test_status_keys_follow_the_statuses():
+    assert len(STATUS_KEYS) == len(Todo.CHOICES)
+
+
+def test_count_from_database(database_path):
+    assert count_from_database(database_path) == {0: 2, 1: 1, 2: 1}
+
+
+def test_count_from_database_without_summary_table(database_path):
+    with sqlite3.connect(database_path) as connection:
+        connection.execute("DROP TABLE todostats")
+
+    assert count_from_database(database_path) == {0: 2, 1: 1, 2: 1}
+
+
+def test_missing_database_is_not_created(tmp_path):
+    path = str(tmp_path / "missing.db")
+
+    with pytest.raises(StatusError):
+        count_from_database(path)
+    assert not os.path.exists(path)
+
+
+def test_count_from_snapshot(tmp_path, database_path):
+    path = str(tmp_path / "kanban.snapshot")
+    repository = create_repository("memory")
+    repository.create_todo(title="Task", status=1)
+    SnapshotWriter(path).update(repository)
+
+    assert count_todos(snapshot=path) == {0: 0, 1: 1, 2: 0}
+    with patch(
+        "python_kanban.status.settings", Settings({"SNAPSHOT_FILE": path})
+    ):
+        assert count_todos() == {0: 0, 1: 1, 2: 0}
+        # An explicit database wins over the settings
+        assert count_todos(database=database_path)[0] == 2
+
+    with pytest.raises(StatusError):
+        count_todos(snapshot=str(tmp_path / "missing.snapshot"))
+
+
+def test_format_status():
+    counts = {0: 3, 1: 1, 2: 5}
+
+    assert format_status(counts, "plain") == (
+        "To do: 3  In progress: 1  Done: 5"
+    )
+    assert format_status(counts, "short") == "3/1/5"
+    assert format_status(counts, "tmux").startswith("#[fg=yellow]3 ")
+    assert format_status(counts, "polybar").startswith("%{F#e5c07b}3%{F-} ")
+    assert format_status(counts, "{in_progress} of {total}") == "1 of 9"
+    assert set(FORMATS) == {"plain", "short", "tmux", "polybar"}
+
+    with pytest.raises(StatusError):
+        format_status(counts, "{unknown}")
+
+
+def test_status_command(database_path, capsys):
+    main(["status", "--db", database_path, "--format", "short"])
+
+    assert capsys.readouterr().out == "2/1/1\n"
+
+
+def test_status_command_with_missing_database(tmp_path, capsys):
+    with pytest.raises(SystemExit):
+        main(["status", "--db", str(tmp_path / "missing.db")])
+
+    assert "No database at" in capsys.readouterr().err
+
+
+def test_status_command_startup(tmp_path, database_path):
+    """The whole process stays within its budget, without importing the
+    libraries of the board, even to read the settings file
+    """
+    code = (
+        "import sys; from python_kanban.cli import main; "
+        "main(['status', '--format', 'short']); "
+        "print(sorted({'peewee', 'prompt_toolkit', 'dynaconf'} "
+        "& set(sys.modules)))"
+    )
+    (tmp_path / "settings.toml").write_text(f'DB_FILE = "{database_path}"')
+    environment = dict(
+        os.environ,
+        PYTHONPATH=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    environment.pop("DYNACONF_DB_FILE", None)
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=str(tmp_path), env=environment,
+        stdout=subprocess.PIPE, universal_newlines=True, check=True,
+    )
+    elapsed = time.perf_counter() - start
+
+    assert result.stdout == "2/1/1\n[]\n"
+    assert elapsed < STARTUP_BUDGET
@@ -1,10 +1,16 @@
+from datetime import date
+
 import pytest
-from mock import Mock
+from mock import Mock, patch
 from prompt_toolkit.key_binding.key_processor import KeyPress, KeyProcessor
 from prompt_toolkit.keys import Keys
 
-from python_kanban.models import Todo
-from python_kanban.views.status_container_view import StatusContainer
+from python_kanban.keymap import build_keymap, set_keymap
+from python_kanban.columns import truncate
+from python_kanban.models import Category, Todo
+from python_kanban.views.status_container_view import (
+    BLOCKED_BADGE, StatusContainer
+)
 
 
 @pytest.fixture
@@ -110,3 +116,213 @@ def test_e_should_load_add_task_view(todo_entries):
     processor.process_keys()
 
     mocked_app.load_edit_task_view.assert_called_once()
+
+
+def press(container, *keys):
+    processor = KeyProcessor(container.container.get_key_bindings())
+    for key in keys:
+        processor.feed(KeyPress(key))
+    processor.process_keys()
+
+
+def test_status_container_reorders_todos():
+    Todo.create(title="Task 1")
+    Todo.create(title="Task 2")
+    Todo.create(title="Task 3")
+    container = StatusContainer(Todo.group_todos_per_status()[0])
+    assert [todo.title for todo in container.entries] == [
+        "Task 3", "Task 2", "Task 1"
+    ]
+
+    press(container, "J")
+    assert container.selected_line == 1
+    press(container, "B")
+    assert container.selected_line == 2
+    press(container, "k", "T")
+
+    expected = ["Task 1", "Task 2", "Task 3"]
+    assert [todo.title for todo in container.entries] == expected
+    assert [
+        todo.title for todo in Todo.group_todos_per_status()[0]
+    ] == expected
+
+
+def test_status_container_reorders_only_inside_category():
+    Todo.create_todo_with_category(title="Task 1", category_name="A")
+    Todo.create_todo_with_category(title="Task 2", category_name="B")
+    container = StatusContainer(Todo.group_todos_per_status()[0])
+
+    press(container, "J", "B")
+
+    assert container.selected_line == 0
+    assert [todo.title for todo in container.entries] == ["Task 1", "Task 2"]
+
+
+def test_status_container_shows_category_headers():
+    Todo.create_todo_with_category(title="Task 1", category_name="Work")
+    Todo.create_todo_with_category(title="Task 2", category_name="Work")
+    Todo.create_todo_with_category(title="Task 3")
+
+    grouped = StatusContainer(Todo.group_todos_per_status()[0])
+    flat = StatusContainer(
+        Todo.group_todos_per_status("title")[0], sort_mode="title"
+    )
+
+    def text(container):
+        return "".join(
+            fragment[1] for fragment in container.container.content.text()()
+        )
+
+    assert text(grouped) == "Task 3\nWork\n  Task 2\n  Task 1\n"
+    assert text(flat) == "[Work] Task 1\n[Work] Task 2\nTask 3\n"
+
+
+def test_status_container_highlights_overdue_todos():
+    Todo.create(title="Late", due=date(2000, 1, 1))
+    container = StatusContainer(Todo.group_todos_per_status()[0])
+
+    assert ("fg:ansired", "Late") in container.container.content.text()()
+
+
+def test_status_container_shows_checklist_progress(todo_entries):
+    container = StatusContainer(
+        todo_entries,
+        checklist_progress={
+            todo_entries[0].id: (1, 2), todo_entries[1].id: (2, 2)
+        },
+    )
+    text = container.container.content.text()()
+
+    assert ("fg:ansiblue", " 1/2") in text
+    assert ("fg:ansigreen", " 2/2") in text
+
+
+def test_status_container_counts_and_jumps():
+    container = StatusContainer(
+        [Todo.create(title=f"Task {i}") for i in range(10)]
+    )
+
+    press(container, "5", "j")
+    assert container.selected_line == 5
+    press(container, "G")
+    assert container.selected_line == 9
+    press(container, "g", "g")
+    assert container.selected_line == 0
+    press(container, "3", "G")
+    assert container.selected_line == 2
+    press(container, "2", "0", "j")
+    assert container.selected_line == 9
+    press(container, "4", "k")
+    assert container.selected_line == 5
+
+
+def test_status_container_uses_the_keymap(todo_entries):
+    set_keymap(build_keymap("emacs"))
+    container = StatusContainer(todo_entries)
+
+    press(container, Keys.ControlN, Keys.ControlN)
+    assert container.selected_line == 2
+    press(container, "j")
+    assert container.selected_line == 2
+
+
+def test_status_container_pages():
+    container = StatusContainer(
+        [Todo.create(title=f"Task {i}") for i in range(25)]
+    )
+
+    press(container, Keys.PageDown)
+    assert container.selected_line == 10
+    press(container, "2", Keys.PageDown)
+    assert container.selected_line == 24
+    press(container, Keys.PageUp)
+    assert container.selected_line == 14
+
+
+def test_status_container_jumps_to_title():
+    container = StatusContainer(
+        [Todo.create(title=title) for title in ("Beta", "alpha", "Alpine")]
+    )
+
+    assert container.jump_to_title("ALP")
+    assert container.selected_line == 1
+    assert container.jump_to_title("alpi")
+    assert container.selected_line == 2
+    assert not container.jump_to_title("gamma")
+    assert container.selected_line == 2
+
+    # The index follows the changes of the column
+    container.insert(Todo.create(title="Gamma"))
+    assert container.jump_to_title("gam")
+    assert container.entries[container.selected_line].title == "Gamma"
+
+
+def rendered_lines(container, width):
+    container._set_width(width)
+    return "".join(
+        text for _, text, *_ in container._get_formatted_text()()
+    ).split("\n")
+
+
+def test_status_container_truncates_titles_to_its_width():
+    category = Category.create(name="Work")
+    Todo.create(title="A rather long title", category=category)
+    Todo.create(title="Short")
+    container = StatusContainer(Todo.group_todos_per_status()[0])
+
+    # The width is given by the control when rendering
+    content = container.container.content.create_content(12, 10)
+    assert container.width == 12
+    assert content.line_count == 4
+    assert rendered_lines(container, 12)[:3] == [
+        "Short", "Work", "  A rather …"
+    ]
+
+    with patch(
+        "python_kanban.views.status_container_view.truncate",
+        wraps=truncate,
+    ) as mocked_truncate:
+        rendered_lines(container, 12)
+        # Only the category header, titles are memoized for this width
+        assert mocked_truncate.call_count == 1
+        assert rendered_lines(container, 8)[2] == "  A rat…"
+        assert mocked_truncate.call_count == 4
+
+    # Edited titles are cut again
+    container.entries[1].title = "Renamed title"
+    assert rendered_lines(container, 8)[2] == "  Renam…"
+
+
+def test_status_container_compact_mode():
+    category = Category.create(name="Work")
+    Todo.create(title="Task 1", category=category)
+    Todo.create(title="Task 2", category=category)
+    container = StatusContainer(
+        Todo.group_todos_per_status()[0], compact=True
+    )
+
+    assert rendered_lines(container, 20)[:2] == [
+        "[Work] Task 2", "[Work] Task 1"
+    ]
+
+
+def test_status_container_shows_blocked_todos(todo_entries):
+    blocked = {todo_entries[1].id}
+    container = StatusContainer(todo_entries, blocked=blocked)
+    container._set_width(20)
+
+    def line(number):
+        return "".join(
+            fragment[1] for fragment in container.container.content.text()()
+        ).split("\n")[number]
+
+    text = container.container.content.text()()
+    assert ("fg:ansibrightblack", "Task 2") in text
+    assert ("fg:ansibrightblack", BLOCKED_BADGE) in text
+    assert line(0) == "Task 1"
+
+    # The set is read on each render
+    blocked.clear()
+    assert line(1) == "Task 2"
+    container.set_entries(todo_entries, blocked={todo_entries[2].id})
+    assert line(2) == "Task 3" + BLOCKED_BADGE
@@ -0,0 +1,334 @@
+from datetime import date
+
+import pytest
+
+from python_kanban.models import Todo, TodoDependency
+from python_kanban.storage import (
+    create_repository, get_repository, set_repository
+)
+from python_kanban.storage.benchmark import run_benchmark
+from python_kanban.storage.jsonl import JsonlRepository
+from python_kanban.storage.memory import MemoryRepository
+from python_kanban.storage.sqlite import SqliteRepository
+
+
+@pytest.fixture(params=["sqlite", "memory", "jsonl"])
+def repository(request, tmp_path):
+    repository = create_repository(
+        request.param, path=str(tmp_path / "kanban.jsonl")
+    )
+    repository.setup()
+    yield repository
+    if isinstance(repository, JsonlRepository):
+        repository.close()
+
+
+def test_create_and_list(repository):
+    repository.create_todo(title="Task 1", body="Body", category_name="Work")
+    repository.create_todo(title="Task 2", body="")
+
+    todos = repository.group_todos_per_status()
+
+    assert repository.count_todos() == 2
+    assert set(todos) == {status for status, _ in Todo.CHOICES}
+    # Todos without category come first
+    assert [todo.title for todo in todos[0]] == ["Task 2", "Task 1"]
+    assert todos[0][1].category.name == "Work"
+    assert repository.category_names() == ["Work"]
+
+
+def test_update(repository):
+    todo = repository.create_todo(title="Task 1", body="", category_name="A")
+
+    repository.update_todo(
+        todo, title="Task 2", body="Body", category_name="B"
+    )
+
+    updated = repository.group_todos_per_status()[0][0]
+    assert updated.title == "Task 2"
+    assert updated.body == "Body"
+    assert updated.category.name == "B"
+
+
+def test_promote_and_regress(repository):
+    todo = repository.create_todo(title="Task 1", body="")
+
+    repository.promote(todo)
+    repository.promote(todo)
+    repository.promote(todo)  # cannot go further
+
+    assert todo.status == Todo.CHOICES[-1][0]
+    assert repository.group_todos_per_status()[2][0].id == todo.id
+
+    repository.regress(todo)
+
+    assert todo.status == Todo.CHOICES[1][0]
+    assert repository.group_todos_per_status()[1][0].id == todo.id
+
+
+def test_delete(repository):
+    todo = repository.create_todo(title="Task 1", body="")
+
+    repository.delete_todo(todo)
+
+    assert repository.count_todos() == 0
+
+
+def test_jsonl_log_is_replayed(tmp_path):
+    path = str(tmp_path / "kanban.jsonl")
+    repository = JsonlRepository(path)
+    first = repository.create_todo(title="Task 1", body="", category_name="A")
+    second = repository.create_todo(title="Task 2", body="")
+    repository.promote(first)
+    repository.update_todo(second, title="Task 2!", body="", category_name="")
+    deleted = repository.create_todo(title="Task 3", body="")
+    repository.delete_todo(deleted)
+    repository.close()
+
+    replayed = JsonlRepository(path)
+
+    todos = replayed.group_todos_per_status()
+    assert [todo.title for todo in todos[0]] == ["Task 2!"]
+    assert [todo.title for todo in todos[1]] == ["Task 1"]
+    assert todos[1][0].category.name == "A"
+    assert todos[1][0].updated == first.updated
+    # New ids do not clash with the replayed ones
+    assert replayed.create_todo(title="Task 4", body="").id == 4
+
+
+def test_jsonl_compact(tmp_path):
+    path = tmp_path / "kanban.jsonl"
+    repository = JsonlRepository(str(path))
+    todo = repository.create_todo(title="Task 1", body="")
+    repository.promote(todo)
+    repository.delete_todo(repository.create_todo(title="Task 2", body=""))
+
+    repository.compact()
+
+    assert len(path.read_text().splitlines()) == 1
+    replayed = JsonlRepository(str(path))
+    assert replayed.group_todos_per_status()[1][0].title == "Task 1"
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        create_repository("nope")
+
+
+def test_default_repository_is_sqlite():
+    set_repository(None)
+
+    assert isinstance(get_repository(), SqliteRepository)
+    assert get_repository() is get_repository()
+
+
+def test_benchmark_runs_every_backend():
+    results = run_benchmark(cards=5)
+
+    assert set(results) == {"sqlite", "memory", "jsonl"}
+    assert set(results["memory"]) == {
+        "create", "list", "promote", "update", "delete"
+    }
+
+
+def test_move(repository):
+    first = repository.create_todo(title="Task 1", body="")
+    second = repository.create_todo(title="Task 2", body="")
+    third = repository.create_todo(title="Task 3", body="")
+
+    repository.move_todo(third, above=second, below=first)
+    repository.move_todo(second, above=None, below=third)
+
+    todos = repository.group_todos_per_status()[0]
+    assert [todo.title for todo in todos] == ["Task 2", "Task 3", "Task 1"]
+
+
+def test_jsonl_order_is_replayed(tmp_path):
+    path = str(tmp_path / "kanban.jsonl")
+    repository = JsonlRepository(path)
+    first = repository.create_todo(title="Task 1", body="")
+    second = repository.create_todo(title="Task 2", body="")
+    repository.move_todo(second, above=first, below=None)
+    repository.close()
+
+    todos = JsonlRepository(path).group_todos_per_status()[0]
+
+    assert [todo.title for todo in todos] == ["Task 1", "Task 2"]
+
+
+def test_jsonl_due_date_is_replayed(tmp_path):
+    path = str(tmp_path / "kanban.jsonl")
+    repository = JsonlRepository(path)
+    todo = repository.create_todo(title="Task 1", body="", priority=0)
+    repository.update_todo(todo, title="Task 1", due=date(2021, 5, 1))
+    repository.close()
+
+    replayed = JsonlRepository(path).group_todos_per_status()[0][0]
+
+    assert replayed.due == date(2021, 5, 1)
+    assert replayed.priority == 0
+
+
+def test_tags(repository):
+    first = repository.create_todo(title="Task 1", body="")
+    second = repository.create_todo(title="Task 2", body="")
+
+    repository.set_tags(first, ["bug", "ui"])
+    repository.set_tags(second, ["bug"])
+    assert repository.tag_postings() == {
+        "bug": {first.id, second.id}, "ui": {first.id}
+    }
+
+    repository.set_tags(first, ["ux"])
+    repository.delete_todo(second)
+
+    assert repository.tag_postings() == {"ux": {first.id}}
+    assert repository.tag_names() == ["ux"]
+    assert repository.todo_tag_names(first) == ["ux"]
+
+
+def test_jsonl_tags_are_replayed(tmp_path):
+    path = str(tmp_path / "kanban.jsonl")
+    repository = JsonlRepository(path)
+    todo = repository.create_todo(title="Task 1", body="")
+    repository.set_tags(todo, ["bug"])
+    repository.close()
+
+    assert JsonlRepository(path).tag_postings() == {"bug": {todo.id}}
+
+
+def test_jsonl_tags_of_deleted_todos_are_not_replayed(tmp_path):
+    path = str(tmp_path / "kanban.jsonl")
+    repository = JsonlRepository(path)
+    todo = repository.create_todo(title="Task 1", body="")
+    other = repository.create_todo(title="Task 2", body="")
+    repository.set_tags(todo, ["bug"])
+    repository.set_tags(other, ["bug", "ui"])
+    repository.delete_todo(other)
+    repository.close()
+
+    replayed = JsonlRepository(path)
+    assert replayed.tag_postings() == {"bug": {todo.id}}
+    assert replayed.tag_names() == ["bug"]
+
+
+def test_checklist(repository):
+    first = repository.create_todo(title="Task 1", body="")
+    second = repository.create_todo(title="Task 2", body="")
+    repository.create_todo(title="Task 3", body="")
+
+    repository.set_checklist(first, [("a", True), ("b", False)])
+    repository.set_checklist(second, [("a", True)])
+    repository.set_checklist(second, [])
+
+    assert repository.checklist(first) == [("a", True), ("b", False)]
+    assert repository.checklist(second) == []
+    assert repository.checklist_progress() == {first.id: (1, 2)}
+
+
+def test_jsonl_checklist_is_replayed(tmp_path):
+    path = str(tmp_path / "kanban.jsonl")
+    repository = JsonlRepository(path)
+    todo = repository.create_todo(title="Task 1", body="")
+    repository.set_checklist(todo, [("a", True), ("b", False)])
+    repository.close()
+
+    replayed = JsonlRepository(path)
+    assert replayed.checklist(todo) == [("a", True), ("b", False)]
+    replayed.compact()
+    assert JsonlRepository(path).checklist_progress() == {todo.id: (1, 2)}
+
+
+def test_attachments(repository):
+    first = repository.create_todo(title="Task 1", body="")
+    second = repository.create_todo(title="Task 2", body="")
+
+    repository.add_attachment(first, "b.png", "2" * 64, 20)
+    repository.add_attachment(first, "a.log", "1" * 64, 10)
+    repository.add_attachment(second, "a.log", "1" * 64, 10)
+
+    assert [
+        (attachment.name, attachment.size)
+        for attachment in repository.attachments(first)
+    ] == [("a.log", 10), ("b.png", 20)]
+    assert repository.attachment_digests() == {"1" * 64, "2" * 64}
+
+
+def test_jsonl_attachments_are_replayed(tmp_path):
+    path = str(tmp_path / "kanban.jsonl")
+    repository = JsonlRepository(path)
+    todo = repository.create_todo(title="Task 1", body="")
+    attachment = repository.add_attachment(todo, "a.log", "1" * 64, 10)
+    repository.close()
+
+    replayed = JsonlRepository(path)
+    assert replayed.attachments(todo) == [attachment]
+    replayed.compact()
+    assert JsonlRepository(path).attachments(todo) == [attachment]
+
+
+def test_revision(repository):
+    before = repository.revision()
+    repository.create_todo(title="Task 1")
+
+    if type(repository) is MemoryRepository:
+        assert before is None and repository.revision() is None
+    else:
+        assert repository.revision() != before
+
+
+def test_dependency_graph(repository):
+    blocker = repository.create_todo(title="Blocker")
+    todo = repository.create_todo(title="Task")
+    if type(repository) is not SqliteRepository:
+        assert repository.dependency_graph() is None
+        return
+
+    TodoDependency.link(todo, blocker)
+    graph = repository.dependency_graph()
+    assert graph.blocked == {todo.id}
+
+    repository.promote(todo)
+    assert todo.status == 0
+    repository.promote(blocker)
+    repository.promote(blocker)
+    assert graph.blocked == set()
+    repository.regress(blocker)
+    assert graph.blocked == {todo.id}
+
+    repository.delete_todo(blocker)
+    assert graph.blocked == set()
+    # Updated in place rather than read again
+    assert repository.dependency_graph() is graph
+
+
+def test_dependency_graph_follows_changes_from_elsewhere():
+    repository = SqliteRepository()
+    blocker = repository.create_todo(title="Blocker")
+    todo = repository.create_todo(title="Task")
+    graph = repository.dependency_graph()
+    assert graph.blocked == set()
+
+    # As another process would
+    TodoDependency.link(todo, blocker)
+    assert repository.dependency_graph().blocked == {todo.id}
+
+    for _ in Todo.CHOICES:
+        Todo.get_by_id(blocker.id).promote()
+    graph = repository.dependency_graph()
+    assert graph.blocked == set()
+    repository.regress(blocker)
+    assert repository.dependency_graph() is graph
+    assert graph.blocked == {todo.id}
+
+
+def test_tag_postings_follow_changes_from_elsewhere():
+    repository = SqliteRepository()
+    todo = repository.create_todo(title="Task")
+    repository.set_tags(todo, ["bug"])
+    assert repository.tag_postings() == {"bug": {todo.id}}
+
+    # As another process would
+    Todo.get_by_id(todo.id).set_tags(["ui"])
+
+    assert repository.tag_postings() == {"ui": {todo.id}}
@@ -0,0 +1,169 @@
+from datetime import datetime, timedelta
+
+import peewee as pw
+import pytest
+
+from python_kanban.models import (
+    MODELS, BoardRevision, Category, SyncState, Todo, Tombstone,
+    create_tables,
+)
+from python_kanban.sync import sync
+
+
+@pytest.fixture
+def peer(tmp_path):
+    """Another copy of the board, in a file"""
+    database = pw.SqliteDatabase(str(tmp_path / "peer.db"))
+    with database.bind_ctx(MODELS):
+        create_tables()
+    database.close()
+    yield database
+    database.close()
+
+
+def sync_with(peer):
+    return sync(peer.database)
+
+
+def titles():
+    return sorted(todo.title for todo in Todo.select())
+
+
+def test_first_sync_copies_both_ways(peer):
+    Todo.create_todo_with_category(title="Local", category_name="Work")
+    with peer.bind_ctx(MODELS):
+        Todo.create_todo_with_category(title="Remote", category_name="Home")
+
+    result = sync_with(peer)
+
+    assert result.sent == 2 and result.received == 2
+    assert titles() == ["Local", "Remote"]
+    with peer.bind_ctx(MODELS):
+        assert titles() == ["Local", "Remote"]
+        assert Todo.get(Todo.title == "Local").category.name == "Work"
+    assert Todo.get(Todo.title == "Remote").category.name == "Home"
+
+
+def test_only_changes_since_last_sync_are_transferred(peer):
+    for number in range(5):
+        Todo.create(title=f"Task {number}")
+    sync_with(peer)
+
+    Todo.update(title="Renamed").where(Todo.title == "Task 3").execute()
+    result = sync_with(peer)
+
+    assert result.sent == 1 and result.received == 0
+    with peer.bind_ctx(MODELS):
+        assert "Renamed" in titles()
+
+    assert sync_with(peer) == (0, 0)
+
+
+def test_sync_state_is_kept_on_both_sides(peer):
+    sync_with(peer)
+
+    with peer.bind_ctx(MODELS):
+        peer_uuid = BoardRevision.board_uuid()
+        peer_state = SyncState.get()
+    state = SyncState.get(SyncState.peer_uuid == peer_uuid)
+    assert state.local_revision == BoardRevision.current()
+    assert peer_state.peer_uuid == BoardRevision.board_uuid()
+    assert peer_state.peer_revision == state.local_revision
+
+
+def test_last_writer_wins(peer):
+    todo = Todo.create(title="Task")
+    sync_with(peer)
+
+    later = datetime.now() + timedelta(minutes=1)
+    with peer.bind_ctx(MODELS):
+        Todo.update(status=1, updated=later).execute()
+    todo.promote()
+    todo.promote()
+
+    sync_with(peer)
+
+    assert Todo.get().status == 1
+    with peer.bind_ctx(MODELS):
+        assert Todo.get().status == 1
+
+
+def test_local_copy_wins_ties(peer):
+    Todo.create(title="Task")
+    sync_with(peer)
+
+    Todo.update(title="Local title").execute()
+    with peer.bind_ctx(MODELS):
+        Todo.update(title="Remote title").execute()
+
+    sync_with(peer)
+
+    assert titles() == ["Local title"]
+    with peer.bind_ctx(MODELS):
+        assert titles() == ["Local title"]
+
+
+def test_deletions_are_synchronized(peer):
+    Todo.create(title="Task 1")
+    Todo.create(title="Task 2")
+    sync_with(peer)
+
+    Todo.delete().where(Todo.title == "Task 1").execute()
+    sync_with(peer)
+
+    with peer.bind_ctx(MODELS):
+        assert titles() == ["Task 2"]
+        assert Tombstone.select().count() == 1
+
+
+def test_later_change_wins_over_deletion(peer):
+    Todo.create(title="Task")
+    sync_with(peer)
+
+    Todo.delete().execute()
+    with peer.bind_ctx(MODELS):
+        Todo.update(
+            title="Still needed", updated=datetime.now() + timedelta(minutes=1)
+        ).execute()
+
+    sync_with(peer)
+
+    assert titles() == ["Still needed"]
+    assert Tombstone.select().count() == 0
+    with peer.bind_ctx(MODELS):
+        assert titles() == ["Still needed"]
+
+
+def test_categories_created_on_both_sides_are_merged(peer):
+    Todo.create_todo_with_category(title="Local", category_name="Work")
+    with peer.bind_ctx(MODELS):
+        Todo.create_todo_with_category(title="Remote", category_name="Work")
+
+    sync_with(peer)
+    sync_with(peer)
+
+    local_uuids = [category.uuid for category in Category.select()]
+    assert len(local_uuids) == 1
+    assert Category.get().todos.count() == 2
+    with peer.bind_ctx(MODELS):
+        assert [category.uuid for category in Category.select()] == (
+            local_uuids
+        )
+        assert Category.get().todos.count() == 2
+
+
+def test_cannot_sync_with_itself(peer):
+    with peer.bind_ctx(MODELS):
+        board_uuid = BoardRevision.board_uuid()
+    BoardRevision.update(uuid=board_uuid).execute()
+
+    with pytest.raises(ValueError):
+        sync_with(peer)
+
+
+def test_missing_board_is_not_created(tmp_path):
+    path = tmp_path / "typo.db"
+
+    with pytest.raises(ValueError):
+        sync(str(path))
+    assert not path.exists()
@@ -0,0 +1,33 @@
+from python_kanban.tags import (
+    filter_todo_ids, format_tags, parse_filter, parse_tags, tags_are_valid
+)
+
+
+POSTINGS = {"bug": {1, 2, 3}, "ui": {2}, "ux": {3, 4}}
+
+
+def test_parse_tags():
+    assert parse_tags(" bug, ui ux,,bug ") == ["bug", "ui", "ux"]
+    assert parse_tags("") == []
+    assert format_tags(["bug", "ui"]) == "bug, ui"
+
+
+def test_tags_are_valid():
+    assert tags_are_valid("bug, ui")
+    assert not tags_are_valid("bug|ui")
+    assert not tags_are_valid("x" * 31)
+
+
+def test_parse_filter():
+    assert parse_filter("bug ui | ux") == [["bug"], ["ui", "ux"]]
+    assert parse_filter(" | ") == []
+
+
+def test_filter_todo_ids():
+    assert filter_todo_ids(POSTINGS, "") is None
+    assert filter_todo_ids(POSTINGS, "bug") == {1, 2, 3}
+    assert filter_todo_ids(POSTINGS, "bug ux") == {3}
+    assert filter_todo_ids(POSTINGS, "bug ui|ux") == {2, 3}
+    assert filter_todo_ids(POSTINGS, "bug nope") == set()
+    # Posting lists are left untouched
+    assert POSTINGS["bug"] == {1, 2, 3}